@@ -2,31 +2,29 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from database_mongo import users_collection
-from bson import ObjectId
+from database import users_collection
 import os
 
+from password_hashing import check_password, hash_password, run_in_password_pool
+from auth_cache import claims_cache, user_cache, token_key, claims_ttl
+
 # JWT Configuration
 SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "your-secret-key-change-in-production-2024")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # HTTP Bearer for token authentication
 security = HTTPBearer()
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password"""
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against a hashed password (in the password worker pool)"""
+    return await run_in_password_pool(check_password, plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """Hash a password (in the password worker pool)"""
+    return await run_in_password_pool(hash_password, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
@@ -40,6 +38,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def decode_access_token(token: str) -> dict:
+    """Decode a JWT, reusing the cached claims of tokens seen recently"""
+    key = token_key(token)
+    payload = claims_cache.get(key)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        claims_cache.set(key, payload, ttl=claims_ttl(payload))
+    return payload
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
@@ -51,21 +58,27 @@ async def get_current_user(
     )
     
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(credentials.credentials)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    # Get user from database
-    try:
-        user = await users_collection.find_one({"_id": ObjectId(user_id)})
-    except:
-        raise credentials_exception
-    
+    # Get user from cache, falling back to the database
+    user = user_cache.get(user_id)
     if user is None:
-        raise credentials_exception
+        # Imported here: bson ships with PyMongo, loaded with the client, not with the app
+        from bson import ObjectId
+        try:
+            user = await users_collection.find_one({"_id": ObjectId(user_id)})
+        except:
+            raise credentials_exception
+        
+        if user is None:
+            raise credentials_exception
+        
+        user_cache.set(user_id, user)
     
-    return user
+    # Handlers get their own copy so they can't alter the cached record
+    return dict(user)
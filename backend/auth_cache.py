@@ -0,0 +1,73 @@
+# In-process caches for the authentication fast path (decoded JWT claims and user records)
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import hashlib
+import os
+import time
+
+# Cache configuration
+AUTH_CACHE_TTL_SECONDS = float(os.environ.get("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.environ.get("AUTH_CACHE_MAX_ENTRIES", "4096"))
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire after a time-to-live"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def pop(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+# Decoded token payloads, keyed by token hash (never by the raw token)
+claims_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+# User records, keyed by the token subject (str user id)
+user_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+def token_key(token: str) -> str:
+    """Cache key for a bearer token"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def claims_ttl(payload: dict) -> float:
+    """Seconds until the token expires, so cached claims never outlive the token"""
+    return payload.get("exp", 0) - time.time()
+
+def invalidate_user(user_id) -> None:
+    """Drop a cached user record; call whenever a user is changed or deleted"""
+    user_cache.pop(str(user_id))
+
+def auth_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters of both caches"""
+    return {"claims": claims_cache.stats(), "users": user_cache.stats()}
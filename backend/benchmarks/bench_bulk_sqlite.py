@@ -0,0 +1,142 @@
+# Benchmark: ORM-loop vs set-based bulk update / bulk delete on the SQLite backend
+#
+# "orm-loop" is the previous implementation (load every row, mutate or
+# db.delete() each one); "set-based" calls the current endpoint handlers.
+# Both must leave the materialized counters equal to a fresh GROUP BY.
+#
+# Usage (from backend/): python benchmarks/bench_bulk_sqlite.py --videos 10000
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SQLITE_DATABASE_PATH", str(Path(tempfile.mkdtemp()) / "bench.db"))
+
+from sqlalchemy import select, insert, and_
+
+import server_sqlite
+from corpus import generate_videos
+from counters import counter_deltas, status_change_deltas
+from counters_sqlite import apply_counter_deltas, get_user_counters, reconcile_user_counters
+from database_sqlite import AsyncSessionLocal, engine
+from models_sqlite import User, Video
+from schemas import BulkUpdateRequest, BulkDeleteRequest
+
+async def orm_loop_bulk_update(bulk_data: BulkUpdateRequest, current_user: User, db):
+    """Previous bulk_update_videos body"""
+    result = await db.execute(
+        select(Video).where(and_(Video.id.in_(bulk_data.video_ids), Video.user_id == current_user.id))
+    )
+    videos = result.scalars().all()
+    
+    if bulk_data.status:
+        old_statuses = Counter(video.status for video in videos if video.status != bulk_data.status)
+        await apply_counter_deltas(db, current_user.id, status_change_deltas(old_statuses, bulk_data.status))
+    
+    for video in videos:
+        if bulk_data.status:
+            video.status = bulk_data.status
+            if bulk_data.status == "concluido" and not video.data_conclusao:
+                video.data_conclusao = datetime.now(timezone.utc)
+        if bulk_data.data_conclusao:
+            video.data_conclusao = bulk_data.data_conclusao
+    
+    await db.commit()
+    return {"success": True, "updated_count": len(videos)}
+
+async def orm_loop_bulk_delete(bulk_data: BulkDeleteRequest, current_user: User, db):
+    """Previous bulk_delete_videos body"""
+    result = await db.execute(
+        select(Video).where(and_(Video.id.in_(bulk_data.video_ids), Video.user_id == current_user.id))
+    )
+    videos = result.scalars().all()
+    
+    for video in videos:
+        await db.delete(video)
+    
+    await apply_counter_deltas(db, current_user.id, counter_deltas(removed=Counter(video.status for video in videos)))
+    await db.commit()
+    return {"success": True, "deleted_count": len(videos)}
+
+MODES = {
+    "orm-loop": (orm_loop_bulk_update, orm_loop_bulk_delete),
+    "set-based": (server_sqlite.bulk_update_videos, server_sqlite.bulk_delete_videos),
+}
+
+async def seed_videos(user_id: int, count: int, seed: int):
+    """Insert `count` videos for the user; returns their ids"""
+    now = datetime.now(timezone.utc)
+    rows = [{**video, "user_id": user_id, "data_criacao": now} for video in generate_videos(count, seed=seed, roteiro_paragraphs=2)]
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Video), rows)
+        await apply_counter_deltas(db, user_id, counter_deltas(added=Counter(row["status"] for row in rows)))
+        await db.commit()
+        result = await db.execute(select(Video.id).where(Video.user_id == user_id))
+        return [video_id for (video_id,) in result.all()]
+
+async def timed(handler, request, user: User):
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        response = await handler(request, current_user=user, db=db)
+        return (time.perf_counter() - start) * 1000, response
+
+async def counters_consistent(user_id: int) -> bool:
+    async with AsyncSessionLocal() as db:
+        maintained = await get_user_counters(db, user_id)
+    async with AsyncSessionLocal() as db:
+        rebuilt = await reconcile_user_counters(db, user_id)
+        await db.rollback()
+    return maintained == rebuilt
+
+async def main(videos: int, repeat: int):
+    await server_sqlite.startup()
+    async with AsyncSessionLocal() as db:
+        user = User(email="bulk@example.com", username="bulk", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        await reconcile_user_counters(db, user.id)
+        await db.commit()
+        db.expunge(user)
+    
+    print(f"{videos} selected videos, median of {repeat} runs\n")
+    print(f"{'mode':<12}{'update ms':>11}{'update again ms':>17}{'delete ms':>11}{'counters':>10}")
+    for mode, (bulk_update, bulk_delete) in MODES.items():
+        timings = {"update": [], "update again": [], "delete": []}
+        consistent = True
+        for run in range(repeat):
+            ids = await seed_videos(user.id, videos, seed=run)
+            
+            ms, response = await timed(bulk_update, BulkUpdateRequest(video_ids=ids, status="concluido"), user)
+            assert response["updated_count"] == videos
+            timings["update"].append(ms)
+            
+            ms, response = await timed(bulk_update, BulkUpdateRequest(video_ids=ids, status="em-edicao"), user)
+            timings["update again"].append(ms)
+            
+            ms, response = await timed(bulk_delete, BulkDeleteRequest(video_ids=ids), user)
+            assert response["deleted_count"] == videos
+            timings["delete"].append(ms)
+            
+            consistent = consistent and await counters_consistent(user.id)
+        
+        print(
+            f"{mode:<12}{statistics.median(timings['update']):>11.0f}"
+            f"{statistics.median(timings['update again']):>17.0f}"
+            f"{statistics.median(timings['delete']):>11.0f}{'ok' if consistent else 'DRIFT':>10}"
+        )
+    
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk update/delete benchmark (SQLite)")
+    parser.add_argument("--videos", type=int, default=10_000, help="Videos selected by each bulk request")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode (median reported)")
+    args = parser.parse_args()
+    asyncio.run(main(args.videos, args.repeat))
@@ -0,0 +1,135 @@
+# Benchmark: cold start, server module import, startup and first-request latency
+#
+# Every run is a fresh interpreter (as on a serverless cold start) that times
+# importing the server module, running its startup hook (schema/index checks)
+# and the first two authenticated requests. "fresh" runs start from an empty
+# database; "current" runs reuse one whose schema is already up to date
+# (SQLite, or Mongo with --mongo-url: mongomock keeps nothing between runs).
+# Without --mongo-url, Mongo's import_ms also counts loading mongomock-motor
+# (and through it Motor), which the server itself would not import.
+#
+# Usage (from backend/): python benchmarks/bench_cold_start.py --backend sqlite --runs 10
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PHASES = ("import_ms", "startup_ms", "first_request_ms", "second_request_ms")
+
+# ==================== CHILD (one cold start) ====================
+
+async def child(args):
+    sys.path.insert(0, str(BACKEND_DIR))
+    # The client library is the benchmark's, not the server's: loaded before timing
+    import httpx
+    import loadtest.apps as apps
+    
+    started = time.perf_counter()
+    if args.backend == "sqlite":
+        import server_sqlite as server
+    elif args.mongo_url:
+        os.environ["MONGO_URL"] = args.mongo_url
+        import server
+    else:
+        server = apps.load_backend("mongo")
+    timings = {"import_ms": (time.perf_counter() - started) * 1000}
+    
+    started = time.perf_counter()
+    await server.startup()
+    timings["startup_ms"] = (time.perf_counter() - started) * 1000
+    
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://coldstart") as client:
+        if args.user_id is None:
+            # Empty database: create the user now, untimed
+            response = await client.post(
+                "/api/auth/register", json={"email": "cold@example.com", "username": "cold", "password": "senha-123"}
+            )
+            user_id = response.json()["user"]["id"]
+        else:
+            user_id = args.user_id
+        headers = {"Authorization": f"Bearer {server.create_access_token(data={'sub': str(user_id)})}"}
+        
+        if args.prepare:
+            print(json.dumps({"user_id": user_id}))
+        else:
+            for phase in ("first_request_ms", "second_request_ms"):
+                started = time.perf_counter()
+                response = await client.get("/api/videos/stats", headers=headers)
+                timings[phase] = (time.perf_counter() - started) * 1000
+                assert response.status_code == 200, response.text[:200]
+            print(json.dumps(timings))
+    
+    if args.drop and args.backend == "sqlite":
+        await server.shutdown()
+        os.remove(os.environ["SQLITE_DATABASE_PATH"])
+    elif args.drop:
+        await apps.stop_backend(server)
+    elif hasattr(server, "shutdown"):
+        await server.shutdown()
+
+# ==================== PARENT ====================
+
+def spawn(args, database: str, *extra) -> dict:
+    """One cold start in a new interpreter; `database` is the SQLite file or Mongo database name"""
+    env = {**os.environ, "SQLITE_DATABASE_PATH": database, "DB_NAME": database}
+    command = [sys.executable, __file__, "--child", "--backend", args.backend, *extra]
+    if args.mongo_url:
+        command += ["--mongo-url", args.mongo_url]
+    started = time.perf_counter()
+    result = subprocess.run(command, env=env, capture_output=True, text=True, cwd=BACKEND_DIR)
+    if result.returncode:
+        raise SystemExit(result.stderr[-2000:])
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["process_ms"] = (time.perf_counter() - started) * 1000
+    return timings
+
+def run(args):
+    workdir = Path(tempfile.mkdtemp())
+    prefix = f"videoflow_coldstart_{int(time.time())}"
+    database = (lambda name: str(workdir / f"{name}.db")) if args.backend == "sqlite" else (lambda name: f"{prefix}_{name}")
+    scenarios = []
+    
+    # mongomock keeps nothing between processes, so only real databases have a "current" schema
+    if args.backend == "sqlite" or args.mongo_url:
+        user_id = spawn(args, database("current"), "--prepare")["user_id"]
+        scenarios.append(("current", [
+            spawn(args, database("current"), "--user-id", str(user_id)) for _ in range(args.runs)
+        ]))
+    
+    # Empty database every run: the schema is created at startup
+    scenarios.append(("fresh", [spawn(args, database(f"fresh{run}"), "--drop") for run in range(args.runs)]))
+    if args.backend == "mongo" and args.mongo_url:
+        spawn(args, database("current"), "--drop")
+    
+    columns = PHASES + ("process_ms",)
+    print(f"backend={args.backend} runs={args.runs} (medians, ms)\n")
+    print(f"{'schema':<10}" + "".join(f"{phase[:-3]:>18}" for phase in columns))
+    for name, runs in scenarios:
+        print(f"{name:<10}" + "".join(f"{statistics.median(r[phase] for r in runs):>18.1f}" for phase in columns))
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--backend", choices=("sqlite", "mongo"), default="sqlite")
+    parser.add_argument("--mongo-url", default=None, help="Real MongoDB (default: mongomock, fresh every run)")
+    parser.add_argument("--runs", type=int, default=10, help="Cold starts per scenario (median reported)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--prepare", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--user-id", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--drop", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        asyncio.run(child(args))
+    else:
+        run(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Benchmark: export formats (text, NDJSON, CSV, Parquet), body size, latency and read-back
+#
+# Seeds one user, downloads GET /videos/export in every format and checks the
+# row formats round-trip: NDJSON/CSV/Parquet must hold as many rows as were
+# seeded, and the Parquet file must load with pandas.read_parquet.
+#
+# Usage (from backend/): python benchmarks/bench_export_formats.py --backend sqlite --videos 2000
+import argparse
+import asyncio
+import csv
+import io
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loadtest.apps import load_backend, open_client, stop_backend
+from loadtest.seed import seed_users
+from video_export import EXPORT_FORMATS
+
+def count_rows(export_format: str, content: bytes):
+    """Rows read back from an export (None for the text format, which has no row framing)"""
+    if export_format == "ndjson":
+        return len(content.splitlines())
+    if export_format == "csv":
+        return len(list(csv.reader(io.StringIO(content.decode())))) - 1
+    if export_format == "parquet":
+        import pandas as pd
+        return len(pd.read_parquet(io.BytesIO(content)))
+    return None
+
+async def run(args):
+    server = load_backend(args.backend)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    
+    await server.startup()
+    try:
+        async with open_client(server.app, "asgi", 1) as client:
+            [user] = await seed_users(client, 1, args.videos, roteiro_paragraphs=args.roteiro_paragraphs)
+            
+            print(f"backend={args.backend} videos={args.videos} roteiro_paragraphs={args.roteiro_paragraphs}\n")
+            print(f"{'format':<9}{'bytes':>12}{'vs text':>9}{'median ms':>11}{'rows':>7}")
+            text_size = None
+            for export_format in EXPORT_FORMATS:
+                latencies = []
+                for _ in range(args.requests):
+                    start = time.perf_counter()
+                    response = await client.get(
+                        "/api/videos/export", params={"format": export_format}, headers=user["headers"]
+                    )
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    assert response.status_code == 200, response.text[:200]
+                
+                size = len(response.content)
+                text_size = text_size or size
+                rows = count_rows(export_format, response.content)
+                assert rows is None or rows == args.videos, f"{export_format}: {rows} rows"
+                print(
+                    f"{export_format:<9}{size:>12}{size / text_size:>8.2f}x{statistics.median(latencies):>11.1f}"
+                    f"{'-' if rows is None else rows:>7}"
+                )
+    finally:
+        await stop_backend(server)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export formats benchmark")
+    parser.add_argument("--backend", choices=("sqlite", "mongo"), default="sqlite")
+    parser.add_argument("--videos", type=int, default=2000, help="Seeded videos")
+    parser.add_argument("--roteiro-paragraphs", type=int, default=4, help="Paragraphs per script")
+    parser.add_argument("--requests", type=int, default=5, help="Timed downloads per format (median reported)")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
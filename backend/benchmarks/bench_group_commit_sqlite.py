@@ -0,0 +1,123 @@
+# Benchmark: per-request commits vs group commit for concurrent video writes (SQLite)
+#
+# 200 writers loop over POST /api/videos (plus a PUT on every other video).
+# "per-request" sets GROUP_COMMIT_MAX_BATCH=1 so every write commits on its
+# own, as create/update/delete used to; "group" uses the default window.
+# Each run is repeated with synchronous=FULL, where every commit fsyncs.
+#
+# Usage (from backend/): python benchmarks/bench_group_commit_sqlite.py --writers 200
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+RUNS = (
+    ("per-request", "normal", {"GROUP_COMMIT_MAX_BATCH": "1"}),
+    ("group", "normal", {}),
+    ("per-request", "full", {"GROUP_COMMIT_MAX_BATCH": "1"}),
+    ("group", "full", {}),
+)
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def run_writers(writers: int, seconds: float) -> dict:
+    import httpx
+    import server_sqlite
+    from corpus import generate_videos
+    from group_commit_sqlite import group_committer
+    
+    await server_sqlite.startup()
+    transport = httpx.ASGITransport(app=server_sqlite.app, raise_app_exceptions=False)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        response = await client.post(
+            "/api/auth/register",
+            json={"email": "gc@example.com", "username": "gc", "password": "senha-123"}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        
+        # Warm the auth cache and connection pools so the first wave of 200
+        # requests does not dominate the tail latencies
+        await asyncio.gather(*(client.get("/api/videos/stats", headers=headers) for _ in range(writers)))
+        
+        deadline = time.perf_counter() + seconds
+        latencies = []
+        errors = 0
+        
+        async def writer(index: int):
+            nonlocal errors
+            videos = generate_videos(100_000, seed=index, roteiro_paragraphs=1)
+            count = 0
+            last_id = None
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                if count % 2 and last_id is not None:
+                    response = await client.put(f"/api/videos/{last_id}", json={"status": "concluido"}, headers=headers)
+                else:
+                    response = await client.post("/api/videos", json=next(videos), headers=headers)
+                    last_id = response.json()["id"] if response.status_code == 201 else None
+                if response.status_code >= 400:
+                    errors += 1
+                else:
+                    latencies.append((time.perf_counter() - start) * 1000)
+                count += 1
+        
+        await asyncio.gather(*(writer(index) for index in range(writers)))
+    
+    stats = group_committer.stats()
+    await server_sqlite.shutdown()
+    return {
+        "writes_per_s": len(latencies) / seconds,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "errors": errors,
+        "avg_batch": stats["avg_batch_size"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Group commit benchmark (SQLite)")
+    parser.add_argument("--writers", type=int, default=200, help="Concurrent writer loops")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each run")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(asyncio.run(run_writers(args.writers, args.seconds))))
+        return
+    
+    print(f"{args.writers} concurrent writers, {args.seconds:.0f}s per run\n")
+    print(f"{'mode':<13}{'synchronous':<13}{'writes/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}{'avg batch':>11}")
+    for mode, synchronous, extra_env in RUNS:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ, **extra_env,
+                "SQLITE_DATABASE_PATH": str(Path(tmp) / "bench.db"),
+                "SQLITE_SYNCHRONOUS": synchronous,
+            }
+            child = subprocess.run(
+                [sys.executable, __file__, "--child", "--writers", str(args.writers), "--seconds", str(args.seconds)],
+                env=env, cwd=BACKEND_DIR, capture_output=True, text=True
+            )
+        if child.returncode != 0:
+            print(f"{mode:<13}{synchronous:<13}failed:\n{child.stderr[-2000:]}")
+            continue
+        r = json.loads(child.stdout.strip().splitlines()[-1])
+        print(
+            f"{mode:<13}{synchronous:<13}{r['writes_per_s']:>9.1f}{r['p50']:>9.0f}{r['p99']:>9.0f}"
+            f"{r['errors']:>8}{r['avg_batch']:>11.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
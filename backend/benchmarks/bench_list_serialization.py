@@ -0,0 +1,199 @@
+# Benchmark: list endpoints, pydantic validation + response_model vs pre-serialized orjson bytes
+#
+# Mounts verbatim copies of the previous GET /videos and /videos/page handlers
+# under /legacy on the same app, seeds one user with long scripts, checks both
+# versions return byte-identical bodies and times them.
+#
+# Usage (from backend/): python benchmarks/bench_list_serialization.py --backend sqlite --limit 100
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Literal, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import Depends, Response
+from sqlalchemy import func, select
+
+from filters import VideoFilters
+from loadtest.apps import load_backend, open_client, stop_backend
+from loadtest.seed import seed_users
+from pagination import NEXT_CURSOR_HEADER, encode_cursor
+from schemas import VideoPageResponse, VideoResponse, VideoSearchResponse
+
+# ==================== LEGACY HANDLERS (SQLite) ====================
+
+def mount_legacy_sqlite(server):
+    from models_sqlite import Video
+    
+    def video_search_helper(row) -> VideoSearchResponse:
+        # Rows carry a snippet column only when highlighting a full-text search
+        video = VideoSearchResponse.model_validate(row[0])
+        snippet = row._mapping.get("snippet")
+        if snippet is not None:
+            video.snippet = snippet
+        return video
+    
+    async def get_videos(
+        response: Response,
+        filters: VideoFilters = Depends(),
+        skip: int = 0,
+        limit: int = 12,
+        cursor: Optional[str] = None,
+        rank: bool = False,
+        highlight: bool = False,
+        current_user=Depends(server.get_current_user),
+        db=Depends(server.get_read_db)
+    ):
+        query = server.apply_video_filters(select(Video), current_user.id, filters, rank=rank, highlight=highlight)
+        query = server.apply_video_page(query, skip, limit, cursor)
+        
+        result = await db.execute(query)
+        rows = result.all()
+        
+        if len(rows) == limit and not rank:
+            last_video = rows[-1][0]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_video.data_criacao, last_video.id)
+        
+        return [video_search_helper(row) for row in rows]
+    
+    async def get_videos_page(
+        filters: VideoFilters = Depends(),
+        skip: int = 0,
+        limit: int = 12,
+        rank: bool = False,
+        highlight: bool = False,
+        current_user=Depends(server.get_current_user),
+        db=Depends(server.get_read_db)
+    ):
+        query = select(Video, func.count().over().label("total"))
+        query = server.apply_video_filters(query, current_user.id, filters, rank=rank, highlight=highlight)
+        query = server.apply_video_page(query, skip, limit)
+        
+        result = await db.execute(query)
+        rows = result.all()
+        total = rows[0].total if rows else 0
+        return VideoPageResponse(items=[video_search_helper(row) for row in rows], total=total)
+    
+    server.app.add_api_route(
+        "/legacy/videos", get_videos, response_model=List[VideoSearchResponse], response_model_exclude_unset=True,
+        dependencies=[Depends(server.check_data_version)]
+    )
+    server.app.add_api_route(
+        "/legacy/videos/page", get_videos_page, response_model=VideoPageResponse, response_model_exclude_unset=True,
+        dependencies=[Depends(server.check_data_version)]
+    )
+
+# ==================== LEGACY HANDLERS (Mongo) ====================
+
+def mount_legacy_mongo(server):
+    async def get_videos(
+        response: Response,
+        filters: VideoFilters = Depends(),
+        skip: int = 0,
+        limit: int = 12,
+        search_mode: Literal["text", "substring"] = "substring",
+        current_user: dict = Depends(server.get_current_user)
+    ):
+        user_id = str(current_user["_id"])
+        query, _ = server.build_video_query(user_id, filters, search_mode)
+        videos_cursor = server.videos_collection.find(query, None).sort(server.video_sort(False)).skip(skip)
+        videos = await videos_cursor.limit(limit).to_list(length=limit)
+        
+        if len(videos) == limit:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(videos[-1]["data_criacao"], str(videos[-1]["_id"]))
+        
+        return [VideoResponse(**server.video_helper(video)) for video in videos]
+    
+    async def get_videos_page(
+        filters: VideoFilters = Depends(),
+        skip: int = 0,
+        limit: int = 12,
+        search_mode: Literal["text", "substring"] = "substring",
+        current_user: dict = Depends(server.get_current_user)
+    ):
+        user_id = str(current_user["_id"])
+        query, _ = server.build_video_query(user_id, filters, search_mode)
+        pipeline = [
+            {"$match": query},
+            {"$facet": {
+                "items": [{"$sort": dict(server.video_sort(False))}, {"$skip": skip}, {"$limit": limit}],
+                "total": [{"$count": "count"}]
+            }}
+        ]
+        page = (await server.videos_collection.aggregate(pipeline).to_list(length=1))[0]
+        return VideoPageResponse(
+            items=[VideoResponse(**server.video_helper(video)) for video in page["items"]],
+            total=page["total"][0]["count"] if page["total"] else 0
+        )
+    
+    server.app.add_api_route(
+        "/legacy/videos", get_videos, response_model=List[VideoResponse],
+        dependencies=[Depends(server.check_data_version)]
+    )
+    server.app.add_api_route(
+        "/legacy/videos/page", get_videos_page, response_model=VideoPageResponse, response_model_exclude_unset=True,
+        dependencies=[Depends(server.check_data_version)]
+    )
+
+# ==================== BENCHMARK ====================
+
+async def timed(client, path: str, params: dict, headers: dict, requests: int):
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(path, params=params, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text[:200]
+    return statistics.median(latencies), response
+
+async def run(args):
+    server = load_backend(args.backend)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    (mount_legacy_sqlite if args.backend == "sqlite" else mount_legacy_mongo)(server)
+    
+    await server.startup()
+    try:
+        async with open_client(server.app, "asgi", 1) as client:
+            [user] = await seed_users(client, 1, args.videos, roteiro_paragraphs=args.roteiro_paragraphs)
+            headers = user["headers"]
+            
+            print(f"backend={args.backend} videos={args.videos} limit={args.limit} roteiro_paragraphs={args.roteiro_paragraphs}\n")
+            print(f"{'endpoint':<22}{'bytes':>9}{'legacy ms':>11}{'orjson ms':>11}{'speedup':>9}  identical")
+            for name, path, params in (
+                ("GET /videos", "/videos", {"limit": args.limit}),
+                ("GET /videos (status)", "/videos", {"limit": args.limit, "status_filter": "planejado"}),
+                ("GET /videos (search)", "/videos", {
+                    "limit": args.limit, "search": "vídeo", "search_mode": "substring", "highlight": True
+                }),
+                ("GET /videos/page", "/videos/page", {"limit": args.limit, "skip": args.limit}),
+            ):
+                legacy_ms, legacy = await timed(client, f"/legacy{path}", params, headers, args.requests)
+                fast_ms, fast = await timed(client, f"/api{path}", params, headers, args.requests)
+                identical = (
+                    legacy.content == fast.content
+                    and legacy.headers.get(NEXT_CURSOR_HEADER) == fast.headers.get(NEXT_CURSOR_HEADER)
+                    and legacy.headers.get("etag") == fast.headers.get("etag")
+                )
+                print(
+                    f"{name:<22}{len(fast.content):>9}{legacy_ms:>11.2f}{fast_ms:>11.2f}"
+                    f"{legacy_ms / fast_ms:>8.1f}x  {identical}"
+                )
+    finally:
+        await stop_backend(server)
+
+def main():
+    parser = argparse.ArgumentParser(description="List serialization benchmark")
+    parser.add_argument("--backend", choices=("sqlite", "mongo"), default="sqlite")
+    parser.add_argument("--videos", type=int, default=500, help="Seeded videos")
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    parser.add_argument("--roteiro-paragraphs", type=int, default=12, help="Paragraphs per script")
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests per endpoint (median reported)")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Benchmark: latency of unrelated GET /api/videos requests during a login storm
+#
+# Runs the SQLite app in-process and fires N concurrent logins while another
+# client keeps listing videos. "inline" reproduces the old behaviour (bcrypt
+# on the event loop); "pool" is the password worker pool.
+#
+# Usage (from backend/): python benchmarks/bench_login_storm.py --logins 50
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SQLITE_DATABASE_PATH", str(Path(tempfile.mkdtemp()) / "bench.db"))
+
+import httpx
+
+import auth_sqlite
+import server_sqlite
+from corpus import generate_videos
+from password_hashing import check_password
+
+PASSWORD = "senha-segura-123"
+
+async def inline_verify_password(plain_password: str, hashed_password: str) -> bool:
+    return check_password(plain_password, hashed_password)
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def register(client, name):
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": f"{name}@example.com", "username": name, "password": PASSWORD}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def list_videos_until(client, headers, done: asyncio.Event):
+    latencies = []
+    while not done.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/videos", params={"limit": 12}, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return latencies
+
+async def storm(client, reader_headers, logins: int):
+    done = asyncio.Event()
+    reader = asyncio.create_task(list_videos_until(client, reader_headers, done))
+    
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(
+        client.post("/api/auth/login", json={"email": "storm@example.com", "password": PASSWORD})
+        for _ in range(logins)
+    ))
+    elapsed = time.perf_counter() - start
+    done.set()
+    
+    assert all(response.status_code == 200 for response in responses)
+    return elapsed, await reader
+
+async def main(logins: int):
+    await server_sqlite.startup()
+    transport = httpx.ASGITransport(app=server_sqlite.app)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await register(client, "storm")
+        reader_headers = await register(client, "reader")
+        for video in generate_videos(50):
+            await client.post("/api/videos", json=video, headers=reader_headers)
+        
+        print(f"{'mode':<8}{'logins s':>10}{'requests':>10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for mode in ("inline", "pool"):
+            server_sqlite.verify_password = (
+                inline_verify_password if mode == "inline" else auth_sqlite.verify_password
+            )
+            elapsed, latencies = await storm(client, reader_headers, logins)
+            print(
+                f"{mode:<8}{elapsed:>10.2f}{len(latencies):>10}"
+                f"{statistics.median(latencies):>9.1f}{percentile(latencies, 99):>9.1f}{max(latencies):>9.1f}"
+            )
+    
+    await server_sqlite.engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login storm benchmark")
+    parser.add_argument("--logins", type=int, default=50, help="Concurrent logins in the storm")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.logins))
@@ -0,0 +1,130 @@
+# Benchmark: per-request cost of the /metrics middleware and query hooks (SQLite)
+#
+# First times the middleware alone around a no-op ASGI app (the end-to-end
+# difference is within run-to-run noise), then runs the same sequential
+# request loop with METRICS_ENABLED=0 and =1, each mode in its own process
+# against a fresh database.
+#
+# Usage (from backend/): python benchmarks/bench_metrics_overhead.py --requests 3000
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+ROUTES = ("GET /api/videos/{id}", "GET /api/videos", "GET /api/videos/stats")
+
+class FakeRoute:
+    path = "/api/videos/{video_id}"
+
+async def noop_app(scope, receive, send):
+    """Stands in for the routed app: three queries and a small JSON body"""
+    from metrics import record_query
+    
+    scope["route"] = FakeRoute
+    for _ in range(3):
+        record_query(0.0002)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"x" * 600})
+
+async def time_middleware(calls: int) -> dict:
+    """Microseconds per call, bare app vs wrapped in MetricsMiddleware"""
+    from metrics import MetricsMiddleware
+    
+    async def send(message):
+        pass
+    
+    results = {}
+    for name, app in (("bare", noop_app), ("middleware", MetricsMiddleware(noop_app))):
+        start = time.perf_counter()
+        for _ in range(calls):
+            scope = {"type": "http", "method": "GET", "path": "/api/videos/1"}
+            await app(scope, None, send)
+        results[name] = (time.perf_counter() - start) / calls * 1_000_000
+    return results
+
+async def run_requests(requests: int) -> dict:
+    import httpx
+    import server_sqlite
+    from corpus import generate_videos
+    
+    await server_sqlite.startup()
+    transport = httpx.ASGITransport(app=server_sqlite.app)
+    results = {}
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/auth/register",
+            json={"email": "metrics@example.com", "username": "metrics", "password": "senha-123"}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        video_ids = []
+        for video in generate_videos(50, roteiro_paragraphs=2):
+            response = await client.post("/api/videos", json=video, headers=headers)
+            video_ids.append(response.json()["id"])
+        
+        calls = {
+            "GET /api/videos/{id}": lambda i: client.get(f"/api/videos/{video_ids[i % 50]}", headers=headers),
+            "GET /api/videos": lambda i: client.get("/api/videos", params={"limit": 12}, headers=headers),
+            "GET /api/videos/stats": lambda i: client.get("/api/videos/stats", headers=headers),
+        }
+        for route, call in calls.items():
+            for i in range(50):
+                await call(i)
+            latencies = []
+            for i in range(requests):
+                start = time.perf_counter()
+                response = await call(i)
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200
+            results[route] = {"mean": statistics.fmean(latencies), "p50": statistics.median(latencies)}
+    
+    await server_sqlite.shutdown()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrics overhead benchmark (SQLite)")
+    parser.add_argument("--requests", type=int, default=3000, help="Timed requests per route")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(asyncio.run(run_requests(args.requests))))
+        return
+    
+    micro = asyncio.run(time_middleware(100_000))
+    print(
+        f"middleware alone: {micro['middleware']:.1f} us/request "
+        f"(bare app {micro['bare']:.1f} us, overhead {micro['middleware'] - micro['bare']:.1f} us)\n"
+    )
+    
+    modes = {}
+    for enabled in ("0", "1"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {**os.environ, "METRICS_ENABLED": enabled, "SQLITE_DATABASE_PATH": str(Path(tmp) / "bench.db")}
+            child = subprocess.run(
+                [sys.executable, __file__, "--child", "--requests", str(args.requests)],
+                env=env, cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+            )
+        modes[enabled] = json.loads(child.stdout.strip().splitlines()[-1])
+    
+    print(f"{args.requests} sequential requests per route\n")
+    print(f"{'route':<24}{'off mean ms':>12}{'on mean ms':>12}{'off p50':>9}{'on p50':>9}{'overhead':>10}")
+    for route in ROUTES:
+        off, on = modes["0"][route], modes["1"][route]
+        overhead_us = (on["p50"] - off["p50"]) * 1000
+        print(
+            f"{route:<24}{off['mean']:>12.3f}{on['mean']:>12.3f}{off['p50']:>9.3f}{on['p50']:>9.3f}"
+            f"{overhead_us:>8.0f}us"
+        )
+
+if __name__ == "__main__":
+    main()
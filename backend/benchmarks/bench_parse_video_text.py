@@ -0,0 +1,45 @@
+# Benchmark: single-pass parse_video_text vs the previous split + per-field regex parser
+#
+# Timing only: tests/test_video_text.py keeps the legacy parser as the reference
+# and checks that both return the same videos.
+#
+# Usage (from backend/): python benchmarks/bench_parse_video_text.py --blocks 100000
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BACKEND_DIR.parent))
+
+from tests.test_video_text import build_corpus, legacy_parse_video_text
+from video_text import parse_video_text
+
+def timed(parse, content: str, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        videos = parse(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), videos
+
+def main():
+    parser = argparse.ArgumentParser(description="parse_video_text benchmark")
+    parser.add_argument("--blocks", type=int, default=100_000, help="Video blocks in the benchmark corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser (median reported)")
+    args = parser.parse_args()
+    
+    corpus = build_corpus(args.blocks)
+    print(f"Corpus: {args.blocks} blocks, {len(corpus.encode('utf-8')) / 1e6:.1f} MB\n")
+    
+    legacy_ms, legacy_videos = timed(legacy_parse_video_text, corpus, args.repeat)
+    single_ms, single_videos = timed(parse_video_text, corpus, args.repeat)
+    print(f"{'parser':<14}{'videos':>9}{'ms':>10}{'blocks/s':>12}")
+    print(f"{'legacy':<14}{len(legacy_videos):>9}{legacy_ms:>10.1f}{args.blocks / legacy_ms * 1000:>12.0f}")
+    print(f"{'single-pass':<14}{len(single_videos):>9}{single_ms:>10.1f}{args.blocks / single_ms * 1000:>12.0f}")
+    print(f"speedup {legacy_ms / single_ms:.1f}x")
+
+if __name__ == "__main__":
+    main()
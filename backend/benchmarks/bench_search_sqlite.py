@@ -0,0 +1,108 @@
+# Benchmark: LIKE scan vs FTS5 index for video search on the SQLite backend
+# (counts, the unranked list page GET /api/videos?search= serves, ranked pages)
+#
+# Usage (from backend/): python benchmarks/bench_search_sqlite.py --videos 100000
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, select, func, or_
+
+from corpus import generate_videos
+from database_sqlite import Base
+from filters import VideoFilters
+from models_sqlite import User, Video
+from search_sqlite import apply_search, create_search_index
+
+SEARCH_TERMS = ("jabuticaba", "paralelepipedo", "maracatu ação", "programação python", "edição")
+
+def seed(engine, videos: int) -> int:
+    """Create one user owning `videos` synthetic videos; returns the user id"""
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        create_search_index(conn)
+        user_id = conn.execute(
+            insert(User).values(email="bench@example.com", username="bench", hashed_password="x")
+        ).inserted_primary_key[0]
+        
+        now = datetime.now(timezone.utc)
+        batch = []
+        for video in generate_videos(videos):
+            batch.append({**video, "user_id": user_id, "data_criacao": now})
+            if len(batch) == 5000:
+                conn.execute(insert(Video), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Video), batch)
+    
+    return user_id
+
+def like_query(user_id: int, term: str):
+    pattern = f"%{term}%"
+    return (
+        select(func.count(Video.id))
+        .where(Video.user_id == user_id)
+        .where(or_(Video.titulo.ilike(pattern), Video.descricao.ilike(pattern), Video.roteiro.ilike(pattern)))
+    )
+
+def fts_query(user_id: int, term: str):
+    return apply_search(select(func.count(Video.id)).where(Video.user_id == user_id), term)
+
+def fts_list_query(user_id: int, term: str):
+    """The statement GET /api/videos?search= runs: unranked, newest first, one page"""
+    from server_sqlite import VIDEO_COLUMNS, apply_video_filters, apply_video_page
+    query = apply_video_filters(select(*VIDEO_COLUMNS), user_id, VideoFilters(search=term))
+    return apply_video_page(query, skip=0, limit=12)
+
+def fts_page_query(user_id: int, term: str):
+    query = select(Video.id).where(Video.user_id == user_id)
+    return apply_search(query, term, rank=True, highlight=True).limit(12)
+
+def timed(conn, query, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = conn.execute(query).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description="LIKE vs FTS5 search benchmark")
+    parser.add_argument("--videos", type=int, default=100_000, help="Videos seeded for the benchmark user")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (median reported)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # server_sqlite (imported for the list statement) must not open the app's database
+        os.environ.setdefault("SQLITE_DATABASE_PATH", str(Path(tmp) / "app.db"))
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        
+        start = time.perf_counter()
+        user_id = seed(engine, args.videos)
+        print(f"Seeded {args.videos} videos in {time.perf_counter() - start:.1f}s\n")
+        
+        print(f"{'term':<22}{'matches':>9}{'LIKE ms':>11}{'FTS ms':>10}{'list ms':>10}{'ranked page ms':>17}{'speedup':>10}")
+        with engine.connect() as conn:
+            for term in SEARCH_TERMS:
+                like_ms, like_rows = timed(conn, like_query(user_id, term), args.repeat)
+                fts_ms, fts_rows = timed(conn, fts_query(user_id, term), args.repeat)
+                list_ms, _ = timed(conn, fts_list_query(user_id, term), args.repeat)
+                page_ms, _ = timed(conn, fts_page_query(user_id, term), args.repeat)
+                print(
+                    f"{term:<22}{fts_rows[0][0]:>9}{like_ms:>11.1f}{fts_ms:>10.1f}{list_ms:>10.1f}{page_ms:>17.1f}"
+                    f"{like_ms / fts_ms:>9.1f}x"
+                )
+                if like_rows[0][0] != fts_rows[0][0]:
+                    print(f"  note: LIKE matched {like_rows[0][0]} (no accent folding, substring semantics)")
+        
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Benchmark: concurrent readers and writers against the SQLite backend
+#
+# "legacy" swaps in a plain engine (rollback journal, default pool shared by
+# reads and writes), as database_sqlite used to create it; "tuned" is the
+# current setup: WAL + pragmas, a read-only reader pool and a single queued
+# writer connection. Each mode runs in its own process on a fresh database.
+#
+# Usage (from backend/): python benchmarks/bench_sqlite_concurrency.py --writers 20 --readers 20
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+MODES = ("legacy", "tuned")
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def use_legacy_engine():
+    """Point both session factories at one default engine, before the app is imported"""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    import database_sqlite
+    
+    legacy = create_async_engine(database_sqlite.DATABASE_URL, echo=False, future=True)
+    database_sqlite.engine = database_sqlite.read_engine = legacy
+    database_sqlite.AsyncSessionLocal = database_sqlite.ReadSessionLocal = async_sessionmaker(
+        legacy, class_=AsyncSession, expire_on_commit=False
+    )
+
+async def run_mode(mode: str, writers: int, readers: int, seconds: float) -> dict:
+    if mode == "legacy":
+        use_legacy_engine()
+    
+    import httpx
+    import server_sqlite
+    from corpus import generate_videos
+    
+    await server_sqlite.startup()
+    transport = httpx.ASGITransport(app=server_sqlite.app, raise_app_exceptions=False)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        headers = []
+        for index in range(4):
+            response = await client.post(
+                "/api/auth/register",
+                json={"email": f"c{index}@example.com", "username": f"c{index}", "password": "senha-123"}
+            )
+            headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+        for video in generate_videos(200, roteiro_paragraphs=2):
+            await client.post("/api/videos", json=video, headers=headers[0])
+        
+        deadline = time.perf_counter() + seconds
+        write_latencies, read_latencies = [], []
+        errors = {"write": 0, "read": 0}
+        
+        async def writer(index: int):
+            user_headers = headers[index % len(headers)]
+            videos = generate_videos(10_000, seed=index, roteiro_paragraphs=1)
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/api/videos", json=next(videos), headers=user_headers)
+                if response.status_code == 201:
+                    video_id = response.json()["id"]
+                    response = await client.put(f"/api/videos/{video_id}", json={"status": "concluido"}, headers=user_headers)
+                if response.status_code >= 400:
+                    errors["write"] += 1
+                else:
+                    write_latencies.append((time.perf_counter() - start) * 1000)
+        
+        async def reader(index: int):
+            user_headers = headers[index % len(headers)]
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get("/api/videos/page", params={"limit": 12}, headers=user_headers)
+                if response.status_code != 200:
+                    errors["read"] += 1
+                else:
+                    read_latencies.append((time.perf_counter() - start) * 1000)
+        
+        await asyncio.gather(
+            *(writer(index) for index in range(writers)),
+            *(reader(index) for index in range(readers))
+        )
+    
+    await server_sqlite.dispose_engines()
+    return {
+        "writes_per_s": len(write_latencies) / seconds,
+        "write_p50": percentile(write_latencies, 50),
+        "write_p99": percentile(write_latencies, 99),
+        "write_errors": errors["write"],
+        "reads_per_s": len(read_latencies) / seconds,
+        "read_p50": percentile(read_latencies, 50),
+        "read_p99": percentile(read_latencies, 99),
+        "read_errors": errors["read"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite concurrency benchmark (legacy engine vs WAL + reader pool + writer queue)")
+    parser.add_argument("--writers", type=int, default=20, help="Concurrent writer loops (create + update)")
+    parser.add_argument("--readers", type=int, default=20, help="Concurrent reader loops (GET /videos/page)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each run")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.mode:
+        # Child process: one mode, fresh database, JSON result on the last line
+        result = asyncio.run(run_mode(args.mode, args.writers, args.readers, args.seconds))
+        print(json.dumps(result))
+        return
+    
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:.0f}s per mode\n")
+    print(f"{'mode':<8}{'writes/s':>9}{'w p50':>8}{'w p99':>9}{'w err':>7}{'reads/s':>9}{'r p50':>8}{'r p99':>9}{'r err':>7}")
+    for mode in MODES:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {**os.environ, "SQLITE_DATABASE_PATH": str(Path(tmp) / "bench.db")}
+            child = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--writers", str(args.writers),
+                 "--readers", str(args.readers), "--seconds", str(args.seconds)],
+                env=env, cwd=BACKEND_DIR, capture_output=True, text=True
+            )
+        if child.returncode != 0:
+            print(f"{mode:<8}failed:\n{child.stderr[-2000:]}")
+            continue
+        r = json.loads(child.stdout.strip().splitlines()[-1])
+        print(
+            f"{mode:<8}{r['writes_per_s']:>9.1f}{r['write_p50']:>8.0f}{r['write_p99']:>9.0f}{r['write_errors']:>7}"
+            f"{r['reads_per_s']:>9.1f}{r['read_p50']:>8.0f}{r['read_p99']:>9.0f}{r['read_errors']:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
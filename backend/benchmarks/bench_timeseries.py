@@ -0,0 +1,144 @@
+# Benchmark: GET /videos/timeseries, rollup of closed buckets vs counting the whole history
+#
+# Seeds one user with videos spread over several years (written straight to
+# the database, since the API stamps data_criacao with the current time), then
+# times the full GROUP BY the endpoint would need without rollups, the first
+# request (builds the rollup), steady-state requests, the request after a day
+# passes (extends the rollup by one bucket) and after a delete (rebuilds it).
+# Every response is checked against the full count.
+#
+# Usage (from backend/): python benchmarks/bench_timeseries.py --backend sqlite --videos 50000 --years 5
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loadtest.apps import load_backend, open_client, stop_backend
+from loadtest.seed import register_user
+from timeseries import INTERVALS, timeseries_response, utc_now
+import timeseries
+
+STATUSES = ("planejado", "em-producao", "em-edicao", "concluido")
+
+def generate_history(count: int, years: int, seed: int):
+    """(data_criacao, status, data_conclusao) spread uniformly over the last `years` years"""
+    rng = random.Random(seed)
+    now = utc_now()
+    span = timedelta(days=365 * years).total_seconds()
+    for _ in range(count):
+        created = now - timedelta(seconds=rng.uniform(0, span))
+        video_status = rng.choice(STATUSES)
+        completed = None
+        if video_status == "concluido":
+            completed = min(created + timedelta(days=rng.uniform(0, 30)), now)
+        yield created, video_status, completed
+
+async def seed_sqlite(server, user_id: int, history) -> None:
+    from sqlalchemy import insert
+    from database_sqlite import AsyncSessionLocal
+    from models_sqlite import Video
+    
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Video), [
+            {"titulo": f"Vídeo {index}", "status": video_status, "data_criacao": created, "data_conclusao": completed, "user_id": user_id}
+            for index, (created, video_status, completed) in enumerate(history)
+        ])
+        await db.commit()
+
+async def seed_mongo(server, user_id: str, history) -> None:
+    await server.videos_collection.insert_many([
+        {"titulo": f"Vídeo {index}", "status": video_status, "data_criacao": created, "data_conclusao": completed, "user_id": user_id}
+        for index, (created, video_status, completed) in enumerate(history)
+    ])
+
+async def full_count(backend: str, server, user_id, interval: str):
+    """What every request would cost without rollups: one GROUP BY over the whole history"""
+    if backend == "sqlite":
+        import timeseries_sqlite
+        from database_sqlite import ReadSessionLocal
+        async with ReadSessionLocal() as db:
+            return await timeseries_sqlite.count_buckets(db, user_id, interval)
+    import timeseries_mongo
+    return await timeseries_mongo.count_buckets(user_id, interval)
+
+async def timed_get(client, headers: dict, interval: str):
+    start = time.perf_counter()
+    response = await client.get("/api/videos/timeseries", params={"interval": interval}, headers=headers)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert response.status_code == 200, response.text[:200]
+    return elapsed, response.json()
+
+async def run(args):
+    server = load_backend(args.backend)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    
+    await server.startup()
+    try:
+        async with open_client(server.app, "asgi", 1) as client:
+            headers = await register_user(client, 0)
+            user_id = (await client.get("/api/auth/me", headers=headers)).json()["id"]
+            history = generate_history(args.videos, args.years, args.seed)
+            await (seed_sqlite if args.backend == "sqlite" else seed_mongo)(server, user_id, history)
+            video_id = (await client.get("/api/videos", params={"limit": 1}, headers=headers)).json()[0]["id"]
+            
+            print(f"backend={args.backend} videos={args.videos} years={args.years}\n")
+            print(f"{'interval':<9}{'buckets':>8}{'full ms':>9}{'first ms':>10}{'steady ms':>11}{'+1 day ms':>11}{'rebuild ms':>12}  correct")
+            for interval in INTERVALS:
+                async def expected():
+                    counts = await full_count(args.backend, server, user_id, interval)
+                    return timeseries_response(interval, counts).model_dump(mode="json")
+                
+                full_ms = []
+                for _ in range(args.requests):
+                    start = time.perf_counter()
+                    reference = await expected()
+                    full_ms.append((time.perf_counter() - start) * 1000)
+                
+                first_ms, body = await timed_get(client, headers, interval)
+                correct = body == reference
+                steady_ms = []
+                for _ in range(args.requests):
+                    elapsed, body = await timed_get(client, headers, interval)
+                    steady_ms.append(elapsed)
+                    correct = correct and body == reference
+                
+                # A day later: the rollup grows by the buckets closed since
+                real_now = timeseries.utc_now
+                timeseries.utc_now = lambda: real_now() + timedelta(days=1)
+                try:
+                    extend_ms, body = await timed_get(client, headers, interval)
+                    correct = correct and body == reference
+                finally:
+                    timeseries.utc_now = real_now
+                
+                # Deleting a video may change a closed bucket: the rollup is rebuilt
+                await client.delete(f"/api/videos/{video_id}", headers=headers)
+                video_id = (await client.get("/api/videos", params={"limit": 1}, headers=headers)).json()[0]["id"]
+                rebuild_ms, body = await timed_get(client, headers, interval)
+                correct = correct and body == await expected()
+                
+                print(
+                    f"{interval:<9}{len(reference['buckets']):>8}{statistics.median(full_ms):>9.1f}{first_ms:>10.1f}"
+                    f"{statistics.median(steady_ms):>11.1f}{extend_ms:>11.1f}{rebuild_ms:>12.1f}  {correct}"
+                )
+    finally:
+        await stop_backend(server)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-series rollup benchmark")
+    parser.add_argument("--backend", choices=("sqlite", "mongo"), default="sqlite")
+    parser.add_argument("--videos", type=int, default=50000, help="Seeded videos")
+    parser.add_argument("--years", type=int, default=5, help="History spread over this many years")
+    parser.add_argument("--requests", type=int, default=20, help="Timed requests (median reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
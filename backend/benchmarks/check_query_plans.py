@@ -0,0 +1,254 @@
+# Check: every endpoint's queries are served by an index (query plans)
+#
+# Calls every endpoint once while capturing the statements/commands it sends,
+# then asks the database how it runs each one: EXPLAIN QUERY PLAN on SQLite,
+# explain() (queryPlanner) on MongoDB. Exits non-zero when a plan scans a whole
+# table/collection or sorts in memory, unless ALLOWED_PLANS lists that step
+# for that endpoint with a reason.
+#
+# Usage (from backend/):
+#   python benchmarks/check_query_plans.py [--backend sqlite] [--verbose]
+#   python benchmarks/check_query_plans.py --backend mongo --mongo-url mongodb://localhost:27017
+import argparse
+import asyncio
+import copy
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+from endpoints import call_endpoints, prepare_user
+
+# (endpoint, start of the flagged plan step) -> why it is accepted
+ALLOWED_PLANS = {
+    ("GET /api/videos?search", "SORT"): "search matches come from the n-gram (or text) index, not in date order",
+    ("GET /api/videos/timeseries", "USE TEMP B-TREE FOR GROUP BY"): "buckets are computed from the dates (rollups keep it to open buckets)",
+}
+
+# Users and videos per user seeded before the check, so the planners (MongoDB's
+# trial runs in particular) see tables shaped like production's, not a few rows
+SEED_USERS = 5
+SEED_VIDEOS = 2000
+
+async def seed_users(client: httpx.AsyncClient) -> dict:
+    """Seed SEED_USERS users with SEED_VIDEOS videos each; returns the checked user's headers"""
+    for index in range(1, SEED_USERS):
+        await prepare_user(client, f"plans{index}", videos=SEED_VIDEOS)
+    return await prepare_user(client, "plans", videos=SEED_VIDEOS)
+
+# ==================== SQLITE ====================
+
+# EXPLAIN QUERY PLAN steps that read a whole table (directly or through a full
+# index scan) or sort rows in memory
+SQLITE_SCAN_PATTERN = re.compile(r"SCAN (\w+)(?: USING (?:COVERING )?INDEX \w+)?$")
+SQLITE_SORT_PATTERN = re.compile(r"USE TEMP B-TREE FOR .*")
+
+# Virtual table (FTS5) steps: idxStr "M..." is a MATCH lookup; no MATCH is a full
+# scan, and a rowid "=" constraint means one probe per row of an outer loop
+SQLITE_VIRTUAL_PATTERN = re.compile(r"SCAN (\w+) VIRTUAL TABLE INDEX \d+:(\S*)$")
+SQLITE_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+def sqlite_problems(plan: List[str], tables: set) -> List[str]:
+    problems = []
+    for detail in plan:
+        scan = SQLITE_SCAN_PATTERN.match(detail)
+        virtual = SQLITE_VIRTUAL_PATTERN.match(detail)
+        if scan and scan.group(1) in tables:
+            problems.append(detail)
+        elif virtual and virtual.group(1) in tables:
+            if "M" not in virtual.group(2) or "=" in virtual.group(2):
+                problems.append(detail)
+        elif SQLITE_SORT_PATTERN.match(detail):
+            problems.append(detail)
+    return problems
+
+async def check_sqlite() -> List[Tuple[str, str, List[str], List[str]]]:
+    """(endpoint, statement, plan, problems) of every statement the endpoints issue"""
+    os.environ.setdefault("SQLITE_DATABASE_PATH", str(Path(tempfile.mkdtemp()) / "plans.db"))
+    from sqlalchemy import event
+    
+    import server_sqlite
+    from database_sqlite import Base, engine, read_engine
+    from search_sqlite import videos_fts
+    
+    captured = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(SQLITE_EXPLAINABLE):
+            captured.append((statement, parameters[0] if executemany else parameters))
+    
+    for async_engine in (engine, read_engine):
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    
+    await server_sqlite.startup()
+    tables = set(Base.metadata.tables) | {videos_fts.name}
+    results = []
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server_sqlite.app), base_url="http://check") as client:
+        # No ANALYZE: the app never runs it, so production plans come without sqlite_stat1
+        headers = await seed_users(client)
+        for name, call, expected_status in await call_endpoints(client, headers):
+            captured.clear()
+            response = await call()
+            if response.status_code != expected_status:
+                raise SystemExit(f"{name} returned {response.status_code}: {response.text[:200]}")
+            
+            statements = list(captured)
+            async with read_engine.connect() as conn:
+                for statement, parameters in statements:
+                    rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                    plan = [row[3] for row in rows]
+                    results.append((name, statement, plan, sqlite_problems(plan, tables)))
+    
+    await server_sqlite.shutdown()
+    return results
+
+# ==================== MONGODB ====================
+
+# Commands explain() accepts; getMore and the writes' inserts have no plan
+MONGO_EXPLAINABLE = ("find", "aggregate", "count", "distinct", "update", "delete", "findAndModify")
+
+# Session/driver fields explain() rejects inside the explained command
+MONGO_DRIVER_FIELDS = ("lsid", "txnNumber", "writeConcern", "readConcern", "$db", "$clusterTime", "$readPreference")
+
+def mongo_problems(explain) -> List[str]:
+    """COLLSCAN and SORT stages of the winning plan, plus $sort stages that
+    run on the documents a pipeline fetched (not on grouped results),
+    including those inside a $facet, which never use an index"""
+    problems = []
+    
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get("stage") in ("COLLSCAN", "SORT"):
+                problems.append(node["stage"])
+            for key, value in node.items():
+                if key != "rejectedPlans":
+                    walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+    
+    walk(explain.get("queryPlanner", {}))
+    grouped = False
+    for stage in explain.get("stages", []):
+        if "$cursor" in stage:
+            walk(stage["$cursor"].get("queryPlanner", {}))
+        grouped = grouped or "$group" in stage
+        if "$sort" in stage and not grouped:
+            problems.append("$sort")
+        if "$facet" in stage and not grouped:
+            for facet in stage["$facet"].values():
+                if any("$sort" in facet_stage for facet_stage in facet):
+                    problems.append("$facet $sort")
+    return problems
+
+def explain_command(command: dict) -> dict:
+    """The command as explain() wants it: no driver fields, one statement per write"""
+    command = {key: value for key, value in command.items() if key not in MONGO_DRIVER_FIELDS}
+    for statements in ("updates", "deletes"):
+        if statements in command:
+            command[statements] = command[statements][:1]
+    return command
+
+async def check_mongo(mongo_url: Optional[str]) -> List[Tuple[str, str, List[str], List[str]]]:
+    """(endpoint, command, winning plan stages, problems) of every command the endpoints issue"""
+    if not mongo_url:
+        raise SystemExit("The Mongo check needs a real server (mongomock has no explain): pass --mongo-url")
+    os.environ["MONGO_URL"] = mongo_url
+    os.environ["DB_NAME"] = f"videoflow_plans_{int(time.time())}"
+    from pymongo import monitoring
+    
+    captured = []
+    
+    class CaptureCommands(monitoring.CommandListener):
+        def started(self, event):
+            if event.command_name in MONGO_EXPLAINABLE and event.database_name == os.environ["DB_NAME"]:
+                captured.append(copy.deepcopy(dict(event.command)))
+        
+        def succeeded(self, event):
+            pass
+        
+        def failed(self, event):
+            pass
+    
+    # Registered before the client exists, so it sees every command
+    monitoring.register(CaptureCommands())
+    import database
+    import server
+    
+    await server.startup()
+    results = []
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://check") as client:
+        headers = await seed_users(client)
+        for name, call, expected_status in await call_endpoints(client, headers):
+            captured.clear()
+            response = await call()
+            if response.status_code != expected_status:
+                raise SystemExit(f"{name} returned {response.status_code}: {response.text[:200]}")
+            
+            for command in list(captured):
+                explain = await database.get_database().command(
+                    {"explain": explain_command(command), "verbosity": "queryPlanner"}
+                )
+                command_name = next(iter(command))
+                shape = command.get("filter", command.get("pipeline", command.get("query", "")))
+                for statements, field in (("updates", "q"), ("deletes", "q")):
+                    if statements in command:
+                        shape = command[statements][0][field]
+                statement = f"{command_name} {command[command_name]} {shape}"
+                stages = re.findall(r"'stage': '(\w+)'", repr(explain.get("queryPlanner", explain.get("stages"))))
+                results.append((name, statement, stages, mongo_problems(explain)))
+    
+    await database.get_client().drop_database(database.DB_NAME)
+    await server.shutdown()
+    return results
+
+# ==================== REPORT ====================
+
+def allowed(name: str, problem: str) -> bool:
+    return any(name == endpoint and problem.startswith(step) for endpoint, step in ALLOWED_PLANS)
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-endpoint query plan check (full scans, in-memory sorts)")
+    parser.add_argument("--backend", choices=("sqlite", "mongo"), default="sqlite")
+    parser.add_argument("--mongo-url", help="MongoDB server to explain against (required for --backend mongo)")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement and its plan")
+    args = parser.parse_args()
+    
+    if args.backend == "sqlite":
+        results = asyncio.run(check_sqlite())
+    else:
+        results = asyncio.run(check_mongo(args.mongo_url))
+    
+    failures = 0
+    print(f"{'endpoint':<40}{'statements':>11}  problems")
+    for name in dict.fromkeys(name for name, *_ in results):
+        endpoint_results = [result for result in results if result[0] == name]
+        problems = [problem for *_, found in endpoint_results for problem in found]
+        rejected = [problem for problem in problems if not allowed(name, problem)]
+        failures += bool(rejected)
+        summary = "; ".join(dict.fromkeys(
+            problem if problem in rejected else f"{problem} (allowed)" for problem in problems
+        )) or "-"
+        print(f"{name:<40}{len(endpoint_results):>11}  {summary}{'  <-- not indexed' if rejected else ''}")
+        
+        if args.verbose or rejected:
+            for _, statement, plan, found in endpoint_results:
+                if args.verbose or any(not allowed(name, problem) for problem in found):
+                    print(f"    {' '.join(statement.split())[:150]}")
+                    for step in plan:
+                        print(f"        {step}")
+    
+    if failures:
+        raise SystemExit(f"\n{failures} endpoint(s) run a query without a suitable index")
+
+if __name__ == "__main__":
+    main()
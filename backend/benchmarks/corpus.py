@@ -0,0 +1,44 @@
+# Synthetic Portuguese video corpus shared by the benchmark scripts
+import random
+from typing import Dict, Iterator
+
+WORDS = (
+    "vídeo roteiro edição produção câmera iluminação áudio cenário gravação tomada "
+    "público canal inscrição tutorial receita viagem análise notícia entrevista "
+    "ação emoção atenção coração informação solução opinião lição missão versão "
+    "começo câmbio música família história experiência ciência técnica prática "
+    "rápido fácil incrível última próxima melhor semana mês ano hoje amanhã "
+    "como fazer dicas segredos erros guia completo passo iniciantes avançado "
+    "cozinha jardim tecnologia programação python finanças saúde treino corrida "
+    "são paulo rio brasil portugal lisboa praia montanha cidade interior estrada"
+).split()
+
+# Rare words sprinkled into ~1% of titles so searches have selective terms too
+RARE_WORDS = ("ornitorrinco", "paralelepípedo", "jabuticaba", "quilombo", "maracatu")
+
+STATUSES = ("planejado", "em-producao", "em-edicao", "concluido")
+
+def sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    """Random Portuguese-looking sentence"""
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize()
+
+def generate_video(rng: random.Random, roteiro_paragraphs: int = 6) -> Dict[str, str]:
+    """One synthetic video with a short title/description and a long script"""
+    titulo = sentence(rng, 3, 8)
+    if rng.random() < 0.01:
+        titulo += " " + rng.choice(RARE_WORDS)
+    
+    return {
+        "titulo": titulo,
+        "descricao": sentence(rng, 10, 25) + ".",
+        "roteiro": "\n".join(sentence(rng, 20, 40) + "." for _ in range(roteiro_paragraphs)),
+        "url": f"https://youtube.com/watch?v={rng.getrandbits(48):012x}",
+        "status": rng.choice(STATUSES),
+    }
+
+def generate_videos(count: int, seed: int = 42, roteiro_paragraphs: int = 6) -> Iterator[Dict[str, str]]:
+    """Deterministic stream of synthetic videos"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_video(rng, roteiro_paragraphs)
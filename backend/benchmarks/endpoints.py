@@ -0,0 +1,85 @@
+# Endpoint calls shared by the per-endpoint checks (query counts, query plans)
+from typing import Awaitable, Callable, List, Tuple
+
+import httpx
+
+from corpus import generate_videos
+from pagination import NEXT_CURSOR_HEADER
+from video_text import format_video_block
+
+EndpointCall = Tuple[str, Callable[[], Awaitable[httpx.Response]], int]
+
+async def prepare_user(client: httpx.AsyncClient, username: str, videos: int = 0) -> dict:
+    """Register a user, create `videos` videos and warm the caches; returns the auth headers"""
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": f"{username}@example.com", "username": username, "password": "senha-123"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    if videos:
+        # One import request, so thousands of videos seed in seconds
+        content = "\n".join(format_video_block(video) for video in generate_videos(videos))
+        await client.post("/api/videos/import", json={"content": content}, headers=headers)
+    
+    # Warm the auth cache, create the counters row and roll up the day series,
+    # so what a call issues doesn't depend on call order
+    await client.get("/api/videos/stats", headers=headers)
+    await client.get("/api/videos/timeseries", headers=headers)
+    return headers
+
+async def call_endpoints(client: httpx.AsyncClient, headers: dict) -> List[EndpointCall]:
+    """(name, coroutine factory, expected status) for every endpoint, in call order"""
+    video = {}
+    page = {}
+    
+    async def create():
+        response = await client.post("/api/videos", json=next(generate_videos(1)), headers=headers)
+        video.update(response.json())
+        return response
+    
+    async def first_page():
+        response = await client.get("/api/videos", params={"limit": 1}, headers=headers)
+        page["cursor"] = response.headers.get(NEXT_CURSOR_HEADER, "")
+        return response
+    
+    return [
+        ("POST /api/videos", create, 201),
+        ("GET /api/videos", lambda: client.get("/api/videos", headers=headers), 200),
+        ("GET /api/videos?search", lambda: client.get("/api/videos", params={"search": "vídeo"}, headers=headers), 200),
+        ("GET /api/videos?status_filter", lambda: client.get(
+            "/api/videos", params={"status_filter": "planejado"}, headers=headers
+        ), 200),
+        ("GET /api/videos?time_filter", lambda: client.get("/api/videos", params={"time_filter": "1s"}, headers=headers), 200),
+        ("GET /api/videos?limit", first_page, 200),
+        ("GET /api/videos?cursor", lambda: client.get(
+            "/api/videos", params={"limit": 1, "cursor": page["cursor"]}, headers=headers
+        ), 200),
+        ("GET /api/videos/page", lambda: client.get("/api/videos/page", headers=headers), 200),
+        ("GET /api/videos/count", lambda: client.get("/api/videos/count", headers=headers), 200),
+        ("GET /api/videos/stats", lambda: client.get("/api/videos/stats", headers=headers), 200),
+        ("GET /api/videos/timeseries", lambda: client.get("/api/videos/timeseries", headers=headers), 200),
+        ("GET /api/videos/{id}", lambda: client.get(f"/api/videos/{video['id']}", headers=headers), 200),
+        ("PUT /api/videos/{id}", lambda: client.put(f"/api/videos/{video['id']}", json={"status": "concluido"}, headers=headers), 200),
+        ("POST /api/videos/bulk-update", lambda: client.post(
+            "/api/videos/bulk-update", json={"video_ids": [video["id"]], "status": "em-edicao"}, headers=headers
+        ), 200),
+        ("POST /api/videos/bulk-update/by-filter?dry_run", lambda: client.post(
+            "/api/videos/bulk-update/by-filter", params={"status_filter": "em-edicao", "dry_run": True},
+            json={"status": "planejado"}, headers=headers
+        ), 200),
+        ("POST /api/videos/bulk-update/by-filter", lambda: client.post(
+            "/api/videos/bulk-update/by-filter", params={"status_filter": "em-edicao"}, json={"status": "planejado"}, headers=headers
+        ), 200),
+        ("POST /api/videos/import", lambda: client.post(
+            "/api/videos/import", json={"content": "[TÍTULO] Importado\n[STATUS] planejado\n"}, headers=headers
+        ), 200),
+        ("GET /api/videos/export", lambda: client.get("/api/videos/export", headers=headers), 200),
+        ("DELETE /api/videos/{id}", lambda: client.delete(f"/api/videos/{video['id']}", headers=headers), 204),
+        ("POST /api/videos/bulk-delete/by-filter?dry_run", lambda: client.post(
+            "/api/videos/bulk-delete/by-filter", params={"search": "Importado", "dry_run": True}, headers=headers
+        ), 200),
+        ("POST /api/videos/bulk-delete/by-filter", lambda: client.post(
+            "/api/videos/bulk-delete/by-filter", params={"search": "Importado"}, headers=headers
+        ), 200),
+        ("GET /api/auth/me", lambda: client.get("/api/auth/me", headers=headers), 200),
+    ]
@@ -0,0 +1,18 @@
+# Chunking of large id lists for the bulk endpoints (both backends)
+import os
+from typing import Hashable, Iterable, Iterator, List, Sequence, TypeVar
+
+# Ids per statement: under SQLite's historical 999 bound-parameter limit
+# (with room for user_id and the SET values) and keeps Mongo $in arrays small
+BULK_CHUNK_SIZE = int(os.environ.get("BULK_CHUNK_SIZE", "900"))
+
+T = TypeVar("T", bound=Hashable)
+
+def unique_ids(ids: Iterable[T]) -> List[T]:
+    """Drop repeated ids (keeping order) so no row is counted in two chunks"""
+    return list(dict.fromkeys(ids))
+
+def chunked(ids: Sequence[T], size: int = BULK_CHUNK_SIZE) -> Iterator[List[T]]:
+    """Split an id list into consecutive chunks of at most `size` ids"""
+    for start in range(0, len(ids), size):
+        yield list(ids[start:start + size])
@@ -0,0 +1,34 @@
+# Conditional GET for the read endpoints: ETags from the per-user data version
+from typing import Optional, Union
+
+from fastapi import HTTPException, Request, Response, status
+
+# Browsers may keep the response but must revalidate it (If-None-Match) every time
+CACHE_CONTROL = "private, no-cache"
+
+def data_etag(user_id: Union[int, str], data_version: int) -> str:
+    """Weak ETag for everything a user can read at a given data version"""
+    return f'W/"{user_id}-{data_version}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def check_etag(request: Request, response: Response, user_id: Union[int, str], data_version: int) -> None:
+    """Raise 304 when the client's copy is current, otherwise tag the response"""
+    # Time-filtered results also change as the clock moves, not only on writes
+    if request.query_params.get("time_filter"):
+        return
+    
+    etag = data_etag(user_id, data_version)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
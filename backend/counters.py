@@ -0,0 +1,59 @@
+# Materialized per-user video counters (shared by both backends)
+import time
+from collections import Counter
+from typing import Dict, Mapping, Optional
+
+from schemas import StatsResponse
+
+# Video status -> counter field name (used as SQLite column and Mongo field)
+STATUS_FIELDS = {
+    "planejado": "planejado",
+    "em-producao": "em_producao",
+    "em-edicao": "em_edicao",
+    "concluido": "concluido",
+}
+
+COUNTER_FIELDS = ("total_videos",) + tuple(STATUS_FIELDS.values())
+
+def counter_deltas(
+    added: Optional[Mapping[str, int]] = None,
+    removed: Optional[Mapping[str, int]] = None
+) -> Dict[str, int]:
+    """Build counter increments from videos added/removed, keyed by status"""
+    deltas = Counter()
+    for statuses, sign in ((added or {}, 1), (removed or {}, -1)):
+        for video_status, amount in statuses.items():
+            deltas["total_videos"] += sign * amount
+            field = STATUS_FIELDS.get(video_status)
+            if field:
+                deltas[field] += sign * amount
+    return {field: value for field, value in deltas.items() if value}
+
+def status_change_deltas(old_statuses: Mapping[str, int], new_status: str) -> Dict[str, int]:
+    """Counter increments for moving videos ({old status: count}) to new_status"""
+    return counter_deltas(added={new_status: sum(old_statuses.values())}, removed=old_statuses)
+
+def initial_data_version() -> int:
+    """Starting data version for a (re)built counters record.
+    
+    Milliseconds since the epoch, so a rebuilt record never reuses a version
+    (and so an ETag) handed out before it was rebuilt.
+    """
+    return time.time_ns() // 1_000_000
+
+def counters_from_status_counts(status_counts: Mapping[str, int]) -> Dict[str, int]:
+    """Build a full counters record from a {status: count} mapping"""
+    return {field: 0 for field in COUNTER_FIELDS} | counter_deltas(added=status_counts)
+
+def stats_from_counters(counters: Mapping[str, int]) -> StatsResponse:
+    """Build the stats response from a counters record"""
+    videos_concluidos = counters.get("concluido", 0)
+    
+    return StatsResponse(
+        total_videos=counters.get("total_videos", 0),
+        videos_concluidos=videos_concluidos,
+        videos_planejado=counters.get("planejado", 0),
+        videos_em_producao=counters.get("em_producao", 0),
+        videos_em_edicao=counters.get("em_edicao", 0),
+        nivel=min(videos_concluidos // 5 + 1, 99)  # Level up every 5 completed videos, max 99
+    )
@@ -0,0 +1,89 @@
+# Materialized per-user video counters for the MongoDB backend
+import argparse
+import asyncio
+from typing import Dict, Mapping, Optional
+
+from counters import COUNTER_FIELDS, counters_from_status_counts, initial_data_version
+from database import db, users_collection, videos_collection
+
+# One document per user: {_id: user_id, total_videos, planejado, em_producao, ..., data_version, history_version}
+counters_collection = db.video_counters
+
+async def apply_counter_deltas(user_id: str, deltas: Mapping[str, int], history_changed: bool = False) -> None:
+    """Atomically increment the user's counters and data version.
+    
+    Every video write calls this, even with no deltas, so cached reads go stale.
+    Writes that may change past time-series buckets pass history_changed.
+    """
+    versions = {"data_version": 1, "history_version": 1} if history_changed else {"data_version": 1}
+    # A missing document is rebuilt from the videos collection on the next read
+    await counters_collection.update_one({"_id": user_id}, {"$inc": {**deltas, **versions}})
+
+async def count_statuses(query: dict) -> Dict[str, int]:
+    """Count videos matching query, grouped by status"""
+    pipeline = [
+        {"$match": query},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]
+    return {
+        group["_id"]: group["count"]
+        async for group in videos_collection.aggregate(pipeline)
+    }
+
+async def reconcile_user_counters(user_id: str) -> Dict[str, int]:
+    """Rebuild one user's counters from the videos collection"""
+    counters = counters_from_status_counts(await count_statuses({"user_id": user_id}))
+    version = initial_data_version()
+    await counters_collection.update_one(
+        {"_id": user_id},
+        {"$set": counters, "$max": {"data_version": version, "history_version": version}},
+        upsert=True
+    )
+    return counters
+
+async def get_user_counters(user_id: str) -> Dict[str, int]:
+    """Read the user's counters with a single _id lookup"""
+    counters = await counters_collection.find_one({"_id": user_id})
+    if counters is None:
+        return await reconcile_user_counters(user_id)
+    
+    return {field: counters.get(field, 0) for field in COUNTER_FIELDS}
+
+async def get_data_version(user_id: str) -> int:
+    """Read the user's data version with a single _id lookup"""
+    counters = await counters_collection.find_one({"_id": user_id}, {"data_version": 1})
+    if counters is None:
+        await reconcile_user_counters(user_id)
+        counters = await counters_collection.find_one({"_id": user_id}, {"data_version": 1})
+    
+    return counters.get("data_version", 0)
+
+async def get_history_version(user_id: str) -> int:
+    """Read the user's history version with a single _id lookup"""
+    counters = await counters_collection.find_one({"_id": user_id}, {"history_version": 1})
+    if counters is None:
+        await reconcile_user_counters(user_id)
+        counters = await counters_collection.find_one({"_id": user_id}, {"history_version": 1})
+    
+    return counters.get("history_version", 0)
+
+async def reconcile_all_counters(user_id: Optional[str] = None) -> int:
+    """Rebuild counters for every user (or a single one); returns users processed"""
+    if user_id is not None:
+        user_ids = [user_id]
+    else:
+        user_ids = [str(user["_id"]) async for user in users_collection.find({}, {"_id": 1})]
+        await counters_collection.delete_many({})
+    
+    for uid in user_ids:
+        await reconcile_user_counters(uid)
+    
+    return len(user_ids)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-user video counters from the videos collection")
+    parser.add_argument("--user-id", default=None, help="Only reconcile this user")
+    args = parser.parse_args()
+    
+    count = asyncio.run(reconcile_all_counters(args.user_id))
+    print(f"Reconciled video counters for {count} user(s)")
@@ -0,0 +1,133 @@
+# Materialized per-user video counters for the SQLite backend
+import argparse
+import asyncio
+from typing import Dict, Mapping, Optional
+
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from counters import COUNTER_FIELDS, counters_from_status_counts, initial_data_version
+from database_sqlite import AsyncSessionLocal, dispose_engines, migrate_database
+from models_sqlite import User, Video, UserVideoStats
+
+async def apply_counter_deltas(
+    db: AsyncSession,
+    user_id: int,
+    deltas: Mapping[str, int],
+    history_changed: bool = False
+) -> None:
+    """Increment the user's counters and data version inside the caller's transaction.
+    
+    Every video write calls this, even with no deltas, so cached reads go stale.
+    Writes that may change past time-series buckets pass history_changed.
+    """
+    versions = {"data_version": UserVideoStats.data_version + 1}
+    if history_changed:
+        versions["history_version"] = UserVideoStats.history_version + 1
+    
+    # A missing row is rebuilt from the videos table on the next read
+    await db.execute(
+        update(UserVideoStats)
+        .where(UserVideoStats.user_id == user_id)
+        .values({
+            **versions,
+            **{
+                field: getattr(UserVideoStats, field) + amount
+                for field, amount in deltas.items()
+            }
+        })
+    )
+
+async def reconcile_user_counters(db: AsyncSession, user_id: int) -> Dict[str, int]:
+    """Rebuild one user's counters from the videos table"""
+    result = await db.execute(
+        select(Video.status, func.count(Video.id))
+        .where(Video.user_id == user_id)
+        .group_by(Video.status)
+    )
+    counters = counters_from_status_counts(dict(result.all()))
+    
+    version = initial_data_version()
+    stmt = sqlite_insert(UserVideoStats).values(
+        user_id=user_id, data_version=version, history_version=version, **counters
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserVideoStats.user_id],
+            set_={
+                **{field: getattr(stmt.excluded, field) for field in COUNTER_FIELDS},
+                "data_version": func.max(UserVideoStats.data_version + 1, stmt.excluded.data_version),
+                "history_version": func.max(UserVideoStats.history_version + 1, stmt.excluded.history_version)
+            }
+        )
+    )
+    return counters
+
+async def rebuild_user_counters(user_id: int) -> UserVideoStats:
+    """Reconcile a missing row in a short writer session (reads use read-only sessions)"""
+    async with AsyncSessionLocal() as writer:
+        await reconcile_user_counters(writer, user_id)
+        await writer.commit()
+        return await writer.get(UserVideoStats, user_id)
+
+async def load_user_stats(db: AsyncSession, user_id: int) -> UserVideoStats:
+    """The user's counters row, with a single primary-key lookup per session"""
+    stats = await db.get(UserVideoStats, user_id)
+    if stats is None:
+        stats = await rebuild_user_counters(user_id)
+    
+    # The identity map only holds weak references: keeping the row referenced
+    # lets the next lookup in this session (ETag check, then the handler) skip the query
+    db.info.setdefault("user_stats", {})[user_id] = stats
+    return stats
+
+async def get_user_counters(db: AsyncSession, user_id: int) -> Dict[str, int]:
+    """Read the user's counters with a single primary-key lookup"""
+    stats = await load_user_stats(db, user_id)
+    return {field: getattr(stats, field) for field in COUNTER_FIELDS}
+
+async def get_data_version(db: AsyncSession, user_id: int) -> int:
+    """Read the user's data version with a single primary-key lookup"""
+    stats = await load_user_stats(db, user_id)
+    return stats.data_version
+
+async def get_history_version(db: AsyncSession, user_id: int) -> int:
+    """Read the user's history version (same row as the data version)"""
+    stats = await load_user_stats(db, user_id)
+    return stats.history_version
+
+async def reconcile_all_counters(user_id: Optional[int] = None) -> int:
+    """Rebuild counters for every user (or a single one); returns users processed"""
+    # Same migration as the server's startup, so an older file is upgraded the same way
+    await migrate_database()
+    
+    async with AsyncSessionLocal() as db:
+        if user_id is not None:
+            user_ids = [user_id]
+        else:
+            result = await db.execute(select(User.id))
+            user_ids = result.scalars().all()
+            await db.execute(delete(UserVideoStats))
+        
+        for uid in user_ids:
+            await reconcile_user_counters(db, uid)
+        
+        await db.commit()
+    
+    return len(user_ids)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-user video counters from the videos table")
+    parser.add_argument("--user-id", type=int, default=None, help="Only reconcile this user")
+    args = parser.parse_args()
+    
+    async def main() -> int:
+        try:
+            return await reconcile_all_counters(args.user_id)
+        finally:
+            # Open aiosqlite connections would keep the process alive
+            await dispose_engines()
+    
+    count = asyncio.run(main())
+    print(f"Reconciled video counters for {count} user(s)")
@@ -1,6 +1,9 @@
 # MongoDB Database Configuration
-from motor.motor_asyncio import AsyncIOMotorClient
+from datetime import datetime, timezone
+import hashlib
+import logging
 import os
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -8,33 +11,167 @@ from dotenv import load_dotenv
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+from metrics import METRICS_ENABLED
+
 # MongoDB connection
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 DB_NAME = os.environ.get('DB_NAME', 'videoflow_db')
 
-# Create MongoDB client
-client = AsyncIOMotorClient(MONGO_URL)
-db = client[DB_NAME]
+# Connection pool of the one client the app shares (PyMongo defaults: 100 / 0)
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '0')) or None
+
+# Fail fast instead of PyMongo's 30 s server selection and unbounded pool waits
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '0')) or None
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000')) or None
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+def get_client():
+    """The Motor client shared by the whole app, created on first use.
+    
+    Motor and PyMongo take ~100 ms to import, so importing the app doesn't pay
+    for them; the first database call (the startup ping) does.
+    """
+    global _client
+    if _client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from metrics_mongo import QueryMetricsListener, pool_listener, propagate_request_context
+        
+        listeners = []
+        # Command events feed the per-route query metrics, pool events the pool gauges
+        if METRICS_ENABLED:
+            propagate_request_context()
+            listeners = [QueryMetricsListener(), pool_listener]
+        _client = AsyncIOMotorClient(
+            MONGO_URL,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            appname="videoflow",
+            event_listeners=listeners
+        )
+    return _client
+
+async def connect_client() -> float:
+    """Create the client and ping the server; returns the round trip in ms.
+    
+    Run at startup so a wrong URL fails the deploy instead of the first request,
+    and the first request doesn't pay for server discovery and the handshake.
+    """
+    started = time.perf_counter()
+    await get_client().admin.command("ping")
+    return (time.perf_counter() - started) * 1000
+
+def close_client() -> None:
+    """Close the shared client and its pool (the next use creates a new one)"""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+def get_database():
+    return get_client()[DB_NAME]
+
+class LazyCollection:
+    """Stands in for a Motor collection, resolved on first use"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._database = None
+        self._collection = None
+    
+    def __getattr__(self, attribute):
+        database = get_database()
+        if self._database is not database:
+            self._database, self._collection = database, database[self.name]
+        return getattr(self._collection, attribute)
+
+class LazyDatabase:
+    """Collections by attribute (db.videos), like a Motor database"""
+    
+    def __getattr__(self, name: str) -> LazyCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        collection = LazyCollection(name)
+        setattr(self, name, collection)
+        return collection
+
+db = LazyDatabase()
 
 # Collections
 users_collection = db.users
 videos_collection = db.videos
 
+# collection -> [(keys, options)]. The hash of this spec is the schema version:
+# any change here makes the next startup create the indexes again
+INDEXES = {
+    "users": [
+        ("email", {"unique": True}),
+        ("username", {"unique": True}),
+    ],
+    "videos": [
+        # Every list query: one user, most recent first (optionally one status)
+        ([("user_id", 1), ("data_criacao", -1), ("_id", 1)], {}),
+        ([("user_id", 1), ("status", 1), ("data_criacao", -1), ("_id", 1)], {}),
+        ([("titulo", "text"), ("descricao", "text"), ("roteiro", "text")], {}),
+        ([("user_id", 1), ("search_grams", 1)], {}),
+        ([("user_id", 1), ("data_conclusao", 1)], {}),
+    ],
+    # Time-series rollups
+    "video_rollups": [
+        ([("user_id", 1), ("interval", 1), ("start", 1)], {"unique": True}),
+    ],
+}
+
+# Indexes dropped from the spec, removed from existing databases: the single-field
+# ones are superseded by the compound indexes above (their user_id prefix included)
+RETIRED_INDEXES = {
+    "videos": ["user_id_1", "status_1", "data_criacao_1"],
+}
+
+SCHEMA_VERSION = hashlib.sha1(repr((INDEXES, RETIRED_INDEXES)).encode()).hexdigest()[:16]
+
+# {_id: "indexes", version, updated_at}
+schema_collection = db.schema_version
+
 # Create indexes for better performance
-async def create_indexes():
-    """Create indexes for MongoDB collections"""
-    # Users indexes
-    await users_collection.create_index("email", unique=True)
-    await users_collection.create_index("username", unique=True)
+async def create_indexes() -> bool:
+    """Create indexes for MongoDB collections, unless the stored schema version is current.
+    
+    Returns whether they were created. One createIndexes command per collection;
+    retired indexes are dropped.
+    """
+    stored = await schema_collection.find_one({"_id": "indexes"})
+    if stored is not None and stored.get("version") == SCHEMA_VERSION:
+        return False
     
-    # Videos indexes
-    await videos_collection.create_index("user_id")
-    await videos_collection.create_index("status")
-    await videos_collection.create_index("data_criacao")
-    await videos_collection.create_index([("titulo", "text"), ("descricao", "text"), ("roteiro", "text")])
+    from pymongo import IndexModel
+    for name, indexes in INDEXES.items():
+        collection = getattr(db, name)
+        await collection.create_indexes([IndexModel(keys, **options) for keys, options in indexes])
+        existing = await collection.index_information()
+        for index_name in RETIRED_INDEXES.get(name, ()):
+            if index_name in existing:
+                await collection.drop_index(index_name)
     
-    print("MongoDB indexes created successfully")
+    await schema_collection.update_one(
+        {"_id": "indexes"},
+        {"$set": {"version": SCHEMA_VERSION, "updated_at": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+    logger.info(f"MongoDB indexes created (schema version {SCHEMA_VERSION})")
+    return True
 
 # Dependency to get database
 async def get_db():
-    return db
+    return get_database()
@@ -1,11 +0,0 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
-
-MONGO_URL = os.getenv("MONGO_URL")
-DB_NAME = os.getenv("DB_NAME", "videoflow_db")
-
-client = AsyncIOMotorClient(MONGO_URL)
-db = client[DB_NAME]
-
-users_collection = db["users"]
-videos_collection = db["videos"]
@@ -1,31 +1,190 @@
 # Database setup for SQLite with SQLAlchemy
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
 from sqlalchemy.orm import declarative_base
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+import hashlib
 import os
 from pathlib import Path
 
 # SQLite database path
 ROOT_DIR = Path(__file__).parent
-DATABASE_PATH = ROOT_DIR / "videoflow.db"
+DATABASE_PATH = Path(os.environ.get("SQLITE_DATABASE_PATH", ROOT_DIR / "videoflow.db"))
 DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
 
-# Create async engine
+# Connection tuning, applied to every connection as it is opened
+JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "wal")
+SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "normal")
+CACHE_SIZE_KIB = int(os.environ.get("SQLITE_CACHE_SIZE_KIB", "65536"))
+MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Read-only connections shared by GET routes; writes go through one connection
+READ_POOL_SIZE = int(os.environ.get("SQLITE_READ_POOL_SIZE", "4"))
+WRITE_QUEUE_TIMEOUT = float(os.environ.get("SQLITE_WRITE_QUEUE_TIMEOUT", "30"))
+
+def apply_pragmas(dbapi_connection, read_only: bool = False):
+    """Set WAL and the cache/mmap/sync pragmas on a new connection"""
+    cursor = dbapi_connection.cursor()
+    # The journal mode is stored in the file, so only the writer sets it
+    if not read_only:
+        cursor.execute(f"PRAGMA journal_mode={JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+    cursor.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+# Create async engine: a single writer connection. Sessions queue (FIFO) for
+# it in the pool instead of fighting over the file lock
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
-    future=True
+    future=True,
+    pool_size=1,
+    max_overflow=0,
+    pool_timeout=WRITE_QUEUE_TIMEOUT
+)
+
+# Read-only connections; with WAL they never block on (or block) the writer
+read_engine = create_async_engine(
+    f"sqlite+aiosqlite:///file:{DATABASE_PATH}?mode=ro&uri=true",
+    echo=False,
+    future=True,
+    pool_size=READ_POOL_SIZE,
+    max_overflow=0
 )
 
-# Create session factory
+@event.listens_for(engine.sync_engine, "connect")
+def set_writer_pragmas(dbapi_connection, connection_record):
+    apply_pragmas(dbapi_connection)
+    # Let SQLAlchemy issue BEGIN itself (below): the driver's implicit BEGIN
+    # breaks SAVEPOINTs, which group commit relies on
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine.sync_engine, "begin")
+def begin_writer_transaction(connection):
+    connection.exec_driver_sql("BEGIN")
+
+@event.listens_for(read_engine.sync_engine, "connect")
+def set_reader_pragmas(dbapi_connection, connection_record):
+    apply_pragmas(dbapi_connection, read_only=True)
+
+# Create session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
+def create_missing_indexes(connection):
+    """Create indexes added to models after their tables already existed"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+# Indexes no query needs anymore: single-column status/data_criacao indexes,
+# superseded by the (user_id, [status,] data_criacao) ones every list query uses,
+# and the titulo one (title search goes through the FTS5 index)
+RETIRED_INDEXES = ("ix_videos_status", "ix_videos_data_criacao", "ix_videos_titulo")
+
+def drop_retired_indexes(connection):
+    """Drop indexes removed from the models (each one slows every write down)"""
+    for name in RETIRED_INDEXES:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+
+def create_missing_columns(connection):
+    """Add columns added to models after their tables already existed"""
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+
+# ==================== SCHEMA VERSION ====================
+
+# Single row holding the version of the schema the file was last migrated to
+SCHEMA_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+def schema_version(extra_ddl: Iterable[str] = ()) -> str:
+    """Hash of the DDL of every model table and index (plus extra statements).
+    
+    It changes with any model change, so nobody has to remember to bump it.
+    """
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=engine.dialect)))
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            statements.append(str(CreateIndex(index).compile(dialect=engine.dialect)))
+    statements.extend(extra_ddl)
+    statements.extend(RETIRED_INDEXES)
+    return hashlib.sha1("\n".join(statements).encode()).hexdigest()[:16]
+
+def stored_schema_version(connection):
+    try:
+        return connection.exec_driver_sql("SELECT version FROM schema_version WHERE id = 1").scalar()
+    except OperationalError:
+        # No schema_version table yet: a new file, or one created before it existed
+        return None
+
+def migrate_schema(
+    connection,
+    steps: Iterable[Callable] = (),
+    extra_ddl: Iterable[str] = ()
+) -> bool:
+    """Create/upgrade tables, columns and indexes (then run `steps`) unless the
+    stored schema version is already current; returns whether any DDL ran"""
+    version = schema_version(extra_ddl)
+    if stored_schema_version(connection) == version:
+        return False
+    
+    Base.metadata.create_all(connection)
+    create_missing_columns(connection)
+    create_missing_indexes(connection)
+    drop_retired_indexes(connection)
+    for step in steps:
+        step(connection)
+    
+    connection.exec_driver_sql(SCHEMA_VERSION_DDL)
+    connection.exec_driver_sql(
+        "INSERT INTO schema_version (id, version, updated_at) VALUES (1, ?, ?) "
+        "ON CONFLICT (id) DO UPDATE SET version = excluded.version, updated_at = excluded.updated_at",
+        (version, datetime.now(timezone.utc).isoformat())
+    )
+    return True
+
+async def migrate_database() -> bool:
+    """Bring the database file to the current schema (tables, indexes, FTS5 search
+    index); one SELECT when it already is. Returns whether any DDL ran"""
+    # Imported here: the search index module builds on the models, which import this one
+    from search_sqlite import SEARCH_INDEX_DDL, create_search_index
+    
+    async with engine.begin() as conn:
+        return await conn.run_sync(migrate_schema, [create_search_index], SEARCH_INDEX_DDL)
+
 # Dependency to get database session
 async def get_db():
     async with AsyncSessionLocal() as session:
@@ -33,3 +192,16 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+# Dependency to get a read-only session (GET routes)
+async def get_read_db():
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def dispose_engines():
+    """Close the writer connection and the reader pool"""
+    await read_engine.dispose()
+    await engine.dispose()
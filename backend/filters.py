@@ -0,0 +1,37 @@
+# Shared query filters for the video list endpoints (both backends)
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# time_filter value -> how far back from now it reaches
+TIME_FILTERS = {
+    "1h": timedelta(hours=1),
+    "4h": timedelta(hours=4),
+    "6h": timedelta(hours=6),
+    "12h": timedelta(hours=12),
+    "1d": timedelta(days=1),
+    "3d": timedelta(days=3),
+    "1s": timedelta(weeks=1),
+    "1m": timedelta(days=30),
+    "3m": timedelta(days=90),
+    "6m": timedelta(days=180),
+    "1a": timedelta(days=365),
+}
+
+def time_filter_start(time_filter: Optional[str]) -> Optional[datetime]:
+    """Earliest data_criacao included by a time filter (None when unknown/unset)"""
+    if time_filter not in TIME_FILTERS:
+        return None
+    return datetime.now(timezone.utc) - TIME_FILTERS[time_filter]
+
+class VideoFilters:
+    """Search/status/time query parameters shared by every video list endpoint"""
+    
+    def __init__(
+        self,
+        search: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        time_filter: Optional[str] = None
+    ):
+        self.search = search
+        self.status_filter = status_filter
+        self.time_filter = time_filter
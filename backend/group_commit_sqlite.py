@@ -0,0 +1,129 @@
+# Group commit: concurrent single-video writes share one SQLite transaction
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import contextvars
+import logging
+import os
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database_sqlite import AsyncSessionLocal
+
+# How long the first write of a batch waits for others to join, and the batch cap
+GROUP_COMMIT_WINDOW_MS = float(os.environ.get("GROUP_COMMIT_WINDOW_MS", "2"))
+GROUP_COMMIT_MAX_BATCH = int(os.environ.get("GROUP_COMMIT_MAX_BATCH", "64"))
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Operation = Callable[[AsyncSession], Awaitable[T]]
+
+class GroupCommitter:
+    """Runs write operations in shared transactions, one commit per batch.
+    
+    Each operation runs inside its own SAVEPOINT, so a failing one (404,
+    constraint error...) is rolled back alone and only its caller sees the
+    error; the rest of the batch still commits.
+    """
+    
+    def __init__(self, window_ms: float = GROUP_COMMIT_WINDOW_MS, max_batch: int = GROUP_COMMIT_MAX_BATCH):
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.operations = 0
+    
+    async def submit(self, operation: Operation) -> T:
+        """Run operation(session) in the next batch; returns its result once committed"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((operation, future, contextvars.copy_context()))
+        return await future
+    
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self.worker is None or self.worker.done() or self.worker.get_loop() is not loop:
+            self.queue = asyncio.Queue()
+            # A fresh context: the shared BEGIN/COMMIT belong to no request, not
+            # to whichever request happened to start the worker
+            self.worker = loop.create_task(self._run(), context=contextvars.Context())
+    
+    async def _collect(self) -> List[Tuple[Operation, asyncio.Future, contextvars.Context]]:
+        batch = [await self.queue.get()]
+        # Give concurrent writers a moment to join before committing
+        if self.max_batch > 1 and self.window > 0:
+            await asyncio.sleep(self.window)
+        while len(batch) < self.max_batch and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+    
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            try:
+                await self._commit(batch)
+            except Exception as e:
+                # Keep the worker alive; every caller already got its error
+                logger.error(f"Group commit worker error: {str(e)}")
+    
+    async def _apply(self, session: AsyncSession, operation: Operation) -> T:
+        async with session.begin_nested():
+            return await operation(session)
+    
+    async def _commit(self, batch: List[Tuple[Operation, asyncio.Future, contextvars.Context]]):
+        done = []
+        try:
+            async with AsyncSessionLocal() as session:
+                # Begin here so BEGIN belongs to the batch, not to its first operation
+                await session.connection()
+                for operation, future, context in batch:
+                    if future.cancelled():
+                        continue
+                    try:
+                        # Run in the caller's context so its queries are attributed to its request
+                        result = await asyncio.create_task(self._apply(session, operation), context=context)
+                    except Exception as e:
+                        future.set_exception(e)
+                    else:
+                        done.append((future, result))
+                
+                await session.commit()
+        except BaseException as e:
+            # The shared commit failed: nothing in the batch was written
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e if isinstance(e, Exception) else RuntimeError("Group commit aborted"))
+            raise
+        
+        self.batches += 1
+        self.operations += len(done)
+        for future, result in done:
+            if not future.done():
+                future.set_result(result)
+    
+    async def close(self):
+        """Stop the worker (pending callers get an error)"""
+        if self.worker is not None and not self.worker.done():
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+        self.worker = None
+        
+        while self.queue is not None and not self.queue.empty():
+            _, future, _ = self.queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Group commit stopped"))
+    
+    def stats(self) -> Dict[str, float]:
+        """Batches committed, operations in them and the average batch size"""
+        return {
+            "batches": self.batches,
+            "operations": self.operations,
+            "avg_batch_size": round(self.operations / self.batches, 2) if self.batches else 0.0,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+        }
+
+group_committer = GroupCommitter()
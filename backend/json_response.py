@@ -0,0 +1,26 @@
+# Pre-serialized JSON for the list endpoints: dicts built straight from rows, dumped by orjson
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+# Same keys and order as schemas.VideoResponse, so the JSON matches the pydantic output
+VIDEO_FIELDS = ("id", "titulo", "descricao", "roteiro", "url", "status", "data_criacao", "data_conclusao", "user_id")
+
+class JSONBytesResponse(Response):
+    media_type = "application/json"
+
+def dump_json(content: Any) -> bytes:
+    """orjson, with datetimes written as UTC "Z" like the pydantic responses
+    (naive ones, as read back from the database, are UTC)"""
+    return orjson.dumps(content, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+
+def json_response(content: Any, response: Response) -> JSONBytesResponse:
+    """Serialize once, skipping response_model validation.
+    
+    A returned Response bypasses the headers dependencies set on the injected
+    `response` (ETag, cursor), so they are copied over.
+    """
+    serialized = JSONBytesResponse(dump_json(content))
+    serialized.raw_headers.extend(response.raw_headers)
+    return serialized
@@ -0,0 +1,10 @@
+# In-process load testing for both backends (run from backend/: python -m loadtest --help)
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# The server modules and the benchmark corpus are imported as top-level modules
+for path in (BACKEND_DIR, BACKEND_DIR / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,73 @@
+# Usage (from backend/):
+#   python -m loadtest --backend sqlite --users 5 --videos 500 --concurrency 50 --duration 30
+#   python -m loadtest --backend mongo                     (mongomock stand-in)
+#   python -m loadtest --backend mongo --mongo-url mongodb://localhost:27017
+#   python -m loadtest --backend all --transport uvicorn
+import argparse
+import asyncio
+import logging
+import subprocess
+import sys
+import time
+
+from loadtest import BACKEND_DIR
+from loadtest.apps import BACKENDS, TRANSPORTS, load_backend, open_client, stop_backend
+from loadtest.runner import format_report, run_load
+from loadtest.scenario import Scenario
+from loadtest.seed import seed_users
+
+async def run(args) -> str:
+    module = load_backend(args.backend, args.mongo_url)
+    # Per-request access logs would swamp the report
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    
+    # mongomock has no $text support, so searches use substring matching
+    search_mode = args.search_mode or ("substring" if args.backend == "mongo" and not args.mongo_url else "text")
+    scenario = Scenario(search_mode=search_mode, roteiro_paragraphs=args.roteiro_paragraphs)
+    
+    await module.startup()
+    try:
+        async with open_client(module.app, args.transport, args.concurrency) as client:
+            start = time.perf_counter()
+            users = await seed_users(client, args.users, args.videos, args.seed, args.roteiro_paragraphs)
+            seeded_in = time.perf_counter() - start
+            
+            results = await run_load(client, users, scenario, args.concurrency, args.duration, args.seed)
+    finally:
+        await stop_backend(module)
+    
+    header = (
+        f"backend={args.backend} transport={args.transport} users={args.users} videos/user={args.videos} "
+        f"concurrency={args.concurrency} duration={args.duration:.0f}s search_mode={search_mode} "
+        f"(seeded in {seeded_in:.1f}s)"
+    )
+    return header + "\n" + format_report(results, args.duration)
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="In-process load test of the VideoFlow API")
+    parser.add_argument("--backend", choices=BACKENDS + ("all",), default="sqlite")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="asgi",
+                        help="asgi calls the app directly; uvicorn serves it on a local port")
+    parser.add_argument("--mongo-url", help="Real mongod to use instead of the mongomock stand-in")
+    parser.add_argument("--users", type=int, default=5, help="Seeded users")
+    parser.add_argument("--videos", type=int, default=200, help="Seeded videos per user")
+    parser.add_argument("--roteiro-paragraphs", type=int, default=6, help="Paragraphs per seeded script")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent workers")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load after seeding")
+    parser.add_argument("--search-mode", choices=("text", "substring"), help="Search mode for the Mongo backend")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and request mix")
+    args = parser.parse_args()
+    
+    if args.backend != "all":
+        print(asyncio.run(run(args)))
+        return
+    
+    # One process per backend: each server module owns its own database globals
+    for backend in BACKENDS:
+        # argparse keeps the last --backend, overriding "all"
+        argv = [*sys.argv[1:], "--backend", backend]
+        subprocess.run([sys.executable, "-m", "loadtest", *argv], cwd=BACKEND_DIR, check=True)
+        print()
+
+if __name__ == "__main__":
+    main()
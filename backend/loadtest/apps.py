@@ -0,0 +1,76 @@
+# Loading a backend's FastAPI app in-process and exposing it to an httpx client
+import asyncio
+import os
+import socket
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import httpx
+
+BACKENDS = ("sqlite", "mongo")
+TRANSPORTS = ("asgi", "uvicorn")
+
+def load_backend(backend: str, mongo_url: Optional[str] = None):
+    """Import the server module of a backend against a throwaway database"""
+    # database settings are read at import time, so they are set first
+    if backend == "sqlite":
+        os.environ["SQLITE_DATABASE_PATH"] = str(Path(tempfile.mkdtemp()) / "loadtest.db")
+        import server_sqlite
+        return server_sqlite
+    
+    os.environ["DB_NAME"] = f"videoflow_loadtest_{int(time.time())}"
+    if mongo_url:
+        os.environ["MONGO_URL"] = mongo_url
+    else:
+        try:
+            import mongomock_motor
+        except ImportError:
+            raise SystemExit("Install mongomock-motor or pass --mongo-url to load test the Mongo backend")
+        import motor.motor_asyncio
+        motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+    import server
+    return server
+
+async def stop_backend(module):
+    """Release the backend's connections (and drop the throwaway Mongo database)"""
+    if module.__name__ == "server":
+        import database
+        await database.get_client().drop_database(database.DB_NAME)
+    await module.shutdown()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@asynccontextmanager
+async def open_client(app, transport: str, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    """httpx client talking to the app directly (asgi) or over a local uvicorn socket"""
+    timeout = httpx.Timeout(120)
+    if transport == "asgi":
+        asgi = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=asgi, base_url="http://loadtest", timeout=timeout) as client:
+            yield client
+        return
+    
+    import uvicorn
+    
+    port = free_port()
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()
+        await asyncio.sleep(0.01)
+    
+    try:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=timeout, limits=limits) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await serving
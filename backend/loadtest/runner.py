@@ -0,0 +1,71 @@
+# Closed-loop load generation and per-route latency reporting
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from loadtest.scenario import ROUTES, Scenario
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class RouteStats:
+    """Latencies and failures recorded for one route"""
+    
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors: Dict[int, int] = defaultdict(int)
+    
+    def record(self, status_code: int, elapsed_ms: float):
+        self.latencies.append(elapsed_ms)
+        if status_code >= 400:
+            self.errors[status_code] += 1
+
+async def run_load(client, users: List[dict], scenario: Scenario, concurrency: int, duration: float, seed: int = 42) -> Dict[str, RouteStats]:
+    """Keep `concurrency` workers busy for `duration` seconds; each waits for its response before the next call"""
+    results: Dict[str, RouteStats] = defaultdict(RouteStats)
+    deadline = time.perf_counter() + duration
+    
+    async def worker(index: int):
+        rng = random.Random(seed + index)
+        user = users[index % len(users)]
+        while time.perf_counter() < deadline:
+            label = scenario.choose(rng, user)
+            start = time.perf_counter()
+            response = await scenario.perform(label, client, rng, user)
+            results[label].record(response.status_code, (time.perf_counter() - start) * 1000)
+    
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return results
+
+def format_report(results: Dict[str, RouteStats], duration: float) -> str:
+    """Per-route throughput and latency percentiles, plus a total row"""
+    lines = [
+        f"{'route':<28}{'requests':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}  errors"
+    ]
+    
+    def row(name: str, latencies: List[float], errors: Dict[int, int]) -> str:
+        error_text = ", ".join(f"{code}x{count}" for code, count in sorted(errors.items())) or "-"
+        return (
+            f"{name:<28}{len(latencies):>9}{len(latencies) / duration:>9.1f}"
+            f"{percentile(latencies, 50):>9.1f}{percentile(latencies, 95):>9.1f}"
+            f"{percentile(latencies, 99):>9.1f}{max(latencies, default=float('nan')):>9.1f}  {error_text}"
+        )
+    
+    every_latency = []
+    every_error: Dict[int, int] = defaultdict(int)
+    for label in ROUTES:
+        if label not in results:
+            continue
+        stats = results[label]
+        lines.append(row(ROUTES[label], stats.latencies, stats.errors))
+        every_latency.extend(stats.latencies)
+        for code, count in stats.errors.items():
+            every_error[code] += count
+    
+    lines.append(row("total", every_latency, every_error))
+    return "\n".join(lines)
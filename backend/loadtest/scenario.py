@@ -0,0 +1,98 @@
+# Dashboard-like request mix replayed by the load test workers
+import random
+
+from corpus import RARE_WORDS, STATUSES, WORDS, generate_video
+
+# Relative weight of each route: mostly reads, as when browsing the dashboard
+MIX = {
+    "list": 30,
+    "page": 10,
+    "search": 15,
+    "count": 5,
+    "stats": 15,
+    "get": 10,
+    "create": 6,
+    "update": 6,
+    "delete": 3,
+}
+
+# Route label -> method and path template shown in the report
+ROUTES = {
+    "list": "GET /api/videos",
+    "page": "GET /api/videos/page",
+    "search": "GET /api/videos?search",
+    "count": "GET /api/videos/count",
+    "stats": "GET /api/videos/stats",
+    "get": "GET /api/videos/{id}",
+    "create": "POST /api/videos",
+    "update": "PUT /api/videos/{id}",
+    "delete": "DELETE /api/videos/{id}",
+}
+
+class Scenario:
+    """Picks the next route for a worker and performs it for one seeded user"""
+    
+    def __init__(self, mix: dict = MIX, search_mode: str = "text", roteiro_paragraphs: int = 6):
+        self.labels = list(mix)
+        self.weights = [mix[label] for label in self.labels]
+        self.search_mode = search_mode
+        self.roteiro_paragraphs = roteiro_paragraphs
+    
+    def choose(self, rng: random.Random, user: dict) -> str:
+        label = rng.choices(self.labels, self.weights)[0]
+        # Keep something to read, update and delete
+        if label in ("get", "update", "delete") and not user["video_ids"]:
+            return "create"
+        return label
+    
+    async def perform(self, label: str, client, rng: random.Random, user: dict):
+        headers = user["headers"]
+        
+        if label == "list":
+            params = {"limit": 12}
+            if rng.random() < 0.3:
+                params["status_filter"] = rng.choice(STATUSES)
+            return await client.get("/api/videos", params=params, headers=headers)
+        
+        if label == "page":
+            params = {"skip": 12 * rng.randint(0, 4), "limit": 12}
+            return await client.get("/api/videos/page", params=params, headers=headers)
+        
+        if label == "search":
+            term = rng.choice(RARE_WORDS) if rng.random() < 0.2 else rng.choice(WORDS)
+            params = {"search": term, "search_mode": self.search_mode, "limit": 12}
+            return await client.get("/api/videos", params=params, headers=headers)
+        
+        if label == "count":
+            params = {"status_filter": rng.choice(STATUSES)}
+            return await client.get("/api/videos/count", params=params, headers=headers)
+        
+        if label == "stats":
+            # The dashboard revalidates its cached stats with the last ETag
+            etag = user["etags"].get("stats")
+            conditional = {**headers, "If-None-Match": etag} if etag else headers
+            response = await client.get("/api/videos/stats", headers=conditional)
+            if "etag" in response.headers:
+                user["etags"]["stats"] = response.headers["etag"]
+            return response
+        
+        if label == "get":
+            video_id = rng.choice(user["video_ids"])
+            return await client.get(f"/api/videos/{video_id}", headers=headers)
+        
+        if label == "create":
+            video = generate_video(rng, self.roteiro_paragraphs)
+            response = await client.post("/api/videos", json=video, headers=headers)
+            if response.status_code == 201:
+                user["video_ids"].append(response.json()["id"])
+            return response
+        
+        if label == "update":
+            video_id = rng.choice(user["video_ids"])
+            update = {"status": rng.choice(STATUSES)}
+            return await client.put(f"/api/videos/{video_id}", json=update, headers=headers)
+        
+        # delete: taken out of the pool first so no other worker picks it again
+        video_ids = user["video_ids"]
+        video_id = video_ids.pop(rng.randrange(len(video_ids)))
+        return await client.delete(f"/api/videos/{video_id}", headers=headers)
@@ -0,0 +1,51 @@
+# Synthetic users and videos seeded through the public API
+from typing import List
+
+from corpus import generate_videos
+from pagination import NEXT_CURSOR_HEADER
+from video_text import format_video_block
+
+PASSWORD = "senha-carga-123"
+
+async def register_user(client, index: int) -> dict:
+    """Register one load-test user and return its auth headers"""
+    name = f"carga{index}"
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": f"{name}@example.com", "username": name, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def list_video_ids(client, headers: dict) -> List:
+    """Every video id of a user, walking the keyset cursor"""
+    video_ids = []
+    params = {"limit": 100}
+    while True:
+        response = await client.get("/api/videos", params=params, headers=headers)
+        response.raise_for_status()
+        video_ids.extend(video["id"] for video in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return video_ids
+        params["cursor"] = cursor
+
+async def seed_users(client, users: int, videos: int, seed: int = 42, roteiro_paragraphs: int = 6) -> List[dict]:
+    """Create users x videos through the streaming import; returns each user's headers and ids"""
+    seeded = []
+    for index in range(users):
+        headers = await register_user(client, index)
+        
+        content = "\n".join(
+            format_video_block(video)
+            for video in generate_videos(videos, seed=seed + index, roteiro_paragraphs=roteiro_paragraphs)
+        )
+        response = await client.post(
+            "/api/videos/import/stream",
+            content=content.encode("utf-8"),
+            headers={**headers, "Content-Type": "text/plain; charset=utf-8"}
+        )
+        response.raise_for_status()
+        
+        seeded.append({"headers": headers, "video_ids": await list_video_ids(client, headers), "etags": {}})
+    return seeded
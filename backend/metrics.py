@@ -0,0 +1,254 @@
+# Prometheus text-format metrics for both backends (requests, DB queries, caches)
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import bisect
+import hmac
+import os
+import threading
+import time
+
+from fastapi import HTTPException, Request, Response, status
+
+from auth_cache import auth_cache_stats
+from password_hashing import password_pool_stats
+from query_tracking import check_query_budget, record_query as record_request_query, track_queries
+
+# Collection can be switched off entirely; METRICS_TOKEN protects the scrape endpoint
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+# Route label for requests that matched no route, and labels for queries run outside a request
+UNMATCHED_ROUTE = "unmatched"
+BACKGROUND_LABELS = ("", "background")
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def format_labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+# ==================== METRIC TYPES ====================
+
+class Counter:
+    """Monotonic value per label set"""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.values: Dict[tuple, float] = {}
+    
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}")
+        return lines
+
+class Gauge(Counter):
+    """Value per label set that can go up and down"""
+    
+    kind = "gauge"
+    
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+    
+    def set(self, labels: tuple, value: float) -> None:
+        self.values[labels] = value
+
+class Histogram:
+    """Bucketed observations per label set (counts kept per bucket, summed on render)"""
+    
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self.series: Dict[tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+    
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.labelnames + ("le",)
+        for labels, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{format_labels(bucket_names, labels + (format_value(bound),))} {cumulative}"
+                )
+            label_text = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+def gauge_family(name: str, help: str, samples: Iterable[Tuple[tuple, float]], labelnames: Tuple[str, ...] = (), kind: str = "gauge") -> List[str]:
+    """Render values read at scrape time (cache and pool statistics)"""
+    metric = Gauge(name, help, labelnames)
+    metric.kind = kind
+    for labels, value in samples:
+        metric.set(labels, value)
+    return metric.render()
+
+# ==================== REGISTRY ====================
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"), LATENCY_BUCKETS
+)
+http_response_size_bytes = Histogram(
+    "http_response_size_bytes", "HTTP response body size", ("method", "route"), SIZE_BUCKETS
+)
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests being served")
+db_queries_total = Counter("db_queries_total", "Database queries/commands by route", ("method", "route"))
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds", "Database query/command latency by route", ("method", "route"), QUERY_LATENCY_BUCKETS
+)
+db_queries_per_request = Histogram(
+    "db_queries_per_request", "Database queries/commands issued by one request", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+
+REGISTRY = (
+    http_requests_total, http_request_duration_seconds, http_response_size_bytes, http_requests_in_flight,
+    db_queries_total, db_query_duration_seconds, db_queries_per_request,
+)
+
+# ==================== DB QUERY ATTRIBUTION ====================
+
+# Queries outside a request may come from driver threads (PyMongo), so they lock
+_background_lock = threading.Lock()
+
+def record_query(statement: str, seconds: float) -> None:
+    """Called from the DB event hooks for every finished query/command"""
+    if record_request_query(statement, seconds):
+        return
+    
+    with _background_lock:
+        db_queries_total.inc(BACKGROUND_LABELS)
+        db_query_duration_seconds.observe(BACKGROUND_LABELS, seconds)
+
+# ==================== MIDDLEWARE ====================
+
+def route_template(scope: dict) -> str:
+    """Path template of the matched route (/api/videos/{video_id}), never the raw path"""
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: request count, latency, response size and DB queries per route"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        response_size = 0
+        
+        async def send_with_metrics(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+        
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            with track_queries() as queries:
+                await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            
+            route = route_template(scope)
+            labels = (scope["method"], route)
+            http_requests_total.inc(labels + (str(status_code),))
+            http_request_duration_seconds.observe(labels, elapsed)
+            http_response_size_bytes.observe(labels, response_size)
+            db_queries_per_request.observe(labels, len(queries))
+            if queries:
+                db_queries_total.inc(labels, len(queries))
+                for seconds in queries.durations:
+                    db_query_duration_seconds.observe(labels, seconds)
+            check_query_budget(scope["method"], route, queries)
+
+# ==================== EXPOSITION ====================
+
+def auth_cache_metrics() -> List[str]:
+    caches = auth_cache_stats()
+    lines = gauge_family(
+        "auth_cache_hits_total", "Auth cache hits",
+        (((name,), stats["hits"]) for name, stats in caches.items()), ("cache",), kind="counter"
+    )
+    lines += gauge_family(
+        "auth_cache_misses_total", "Auth cache misses",
+        (((name,), stats["misses"]) for name, stats in caches.items()), ("cache",), kind="counter"
+    )
+    lines += gauge_family(
+        "auth_cache_hit_ratio", "Auth cache hits / lookups since start",
+        (((name,), stats["hits"] / max(stats["hits"] + stats["misses"], 1)) for name, stats in caches.items()),
+        ("cache",)
+    )
+    lines += gauge_family(
+        "auth_cache_entries", "Auth cache entries",
+        (((name,), stats["size"]) for name, stats in caches.items()), ("cache",)
+    )
+    return lines
+
+def password_pool_metrics() -> List[str]:
+    pool = password_pool_stats()
+    return gauge_family(
+        "password_pool_operations", "bcrypt operations in the worker pool",
+        ((("in_flight",), pool["in_flight"]), (("queued",), pool["queue_depth"])), ("state",)
+    )
+
+def render_metrics(collectors: Iterable[Callable[[], List[str]]] = ()) -> str:
+    """Whole scrape body: registry metrics plus values read at scrape time"""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    for collect in (auth_cache_metrics, password_pool_metrics, *collectors):
+        lines += collect()
+    return "\n".join(lines) + "\n"
+
+def metrics_response(request: Request, collectors: Iterable[Callable[[], List[str]]] = ()) -> Response:
+    """Scrape response; requires `Authorization: Bearer <METRICS_TOKEN>` when a token is configured"""
+    if METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "")
+        if not hmac.compare_digest(supplied.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(render_metrics(collectors), media_type=CONTENT_TYPE)
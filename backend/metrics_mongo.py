@@ -0,0 +1,143 @@
+# PyMongo command and connection pool monitoring feeding the per-request query tracking and metrics
+from collections import defaultdict
+from typing import List
+import contextvars
+import functools
+import threading
+
+from pymongo import monitoring
+
+from database import MONGO_MAX_POOL_SIZE
+from metrics import gauge_family, record_query
+
+def command_statement(command_name: str, command) -> str:
+    """"find videos", "getMore videos"... (what the N+1 detector compares)"""
+    target = command.get(command_name)
+    if not isinstance(target, str):
+        target = command.get("collection", "")
+    return f"{command_name} {target}".strip()
+
+class QueryMetricsListener(monitoring.CommandListener):
+    """Records the duration of every command sent to MongoDB"""
+    
+    def __init__(self):
+        # Finished events don't carry the command, so it is kept from the start
+        self._statements = {}
+    
+    def started(self, event):
+        self._statements[(event.connection_id, event.request_id)] = command_statement(event.command_name, event.command)
+    
+    def succeeded(self, event):
+        self._finish(event)
+    
+    def failed(self, event):
+        self._finish(event)
+    
+    def _finish(self, event):
+        statement = self._statements.pop((event.connection_id, event.request_id), event.command_name)
+        record_query(statement, event.duration_micros / 1_000_000)
+
+def propagate_request_context() -> None:
+    """Run Motor's executor calls in the caller's context.
+    
+    Motor hands every PyMongo call to a thread pool without copying context
+    variables, so command events would not know which request issued them.
+    """
+    from motor.frameworks import asyncio as motor_asyncio
+    
+    run_on_executor = motor_asyncio.run_on_executor
+    if getattr(run_on_executor, "propagates_context", False):
+        return
+    
+    @functools.wraps(run_on_executor)
+    def run_in_caller_context(loop, fn, *args, **kwargs):
+        context = contextvars.copy_context()
+        return run_on_executor(loop, context.run, functools.partial(fn, *args, **kwargs))
+    
+    run_in_caller_context.propagates_context = True
+    motor_asyncio.run_on_executor = run_in_caller_context
+
+# Counters kept per server address
+POOL_FIELDS = ("open", "in_use", "waiting", "created", "checkout_failures", "cleared")
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Connections open, checked out and waited for, per server, from PyMongo's pool events"""
+    
+    def __init__(self):
+        # Events arrive from the driver's threads
+        self._lock = threading.Lock()
+        self._pools = defaultdict(lambda: dict.fromkeys(POOL_FIELDS, 0))
+    
+    def _add(self, event, **deltas):
+        address = "%s:%s" % event.address
+        with self._lock:
+            pool = self._pools[address]
+            for field, delta in deltas.items():
+                pool[field] += delta
+    
+    def pool_created(self, event):
+        self._add(event)
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        self._add(event, cleared=1)
+    
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop("%s:%s" % event.address, None)
+    
+    def connection_created(self, event):
+        self._add(event, open=1, created=1)
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        self._add(event, open=-1)
+    
+    def connection_check_out_started(self, event):
+        self._add(event, waiting=1)
+    
+    def connection_check_out_failed(self, event):
+        self._add(event, waiting=-1, checkout_failures=1)
+    
+    def connection_checked_out(self, event):
+        self._add(event, waiting=-1, in_use=1)
+    
+    def connection_checked_in(self, event):
+        self._add(event, in_use=-1)
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {address: dict(pool) for address, pool in self._pools.items()}
+
+# One listener for the process: the client is shared
+pool_listener = PoolMetricsListener()
+
+def mongo_pool_metrics() -> List[str]:
+    pools = pool_listener.stats()
+    lines = gauge_family(
+        "mongo_pool_connections", "Connections in the MongoDB pool by server and state",
+        (
+            ((address, state), pool[state])
+            for address, pool in pools.items()
+            for state in ("open", "in_use", "waiting")
+        ),
+        ("address", "state")
+    )
+    lines += gauge_family("mongo_pool_max_size", "maxPoolSize of the MongoDB client", (((), MONGO_MAX_POOL_SIZE),))
+    lines += gauge_family(
+        "mongo_pool_connections_created_total", "Connections the MongoDB pool opened",
+        (((address,), pool["created"]) for address, pool in pools.items()), ("address",), kind="counter"
+    )
+    lines += gauge_family(
+        "mongo_pool_checkout_failures_total", "Connection checkouts that failed (wait queue timeout, network error)",
+        (((address,), pool["checkout_failures"]) for address, pool in pools.items()), ("address",), kind="counter"
+    )
+    lines += gauge_family(
+        "mongo_pool_cleared_total", "Times the MongoDB pool was cleared after an error",
+        (((address,), pool["cleared"]) for address, pool in pools.items()), ("address",), kind="counter"
+    )
+    return lines
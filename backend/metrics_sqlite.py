@@ -0,0 +1,37 @@
+# SQLAlchemy cursor events feeding the per-request query tracking and metrics
+from typing import List
+import time
+
+from sqlalchemy import event
+
+from group_commit_sqlite import group_committer
+from metrics import gauge_family, record_query
+
+def instrument_engine(async_engine) -> None:
+    """Time every statement an engine executes and attribute it to the current request"""
+    sync_engine = async_engine.sync_engine
+    
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+    
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+        record_query(statement, time.perf_counter() - conn.info["query_start"].pop())
+    
+    @event.listens_for(sync_engine, "handle_error")
+    def stop_failed_query_timer(exception_context):
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            record_query(exception_context.statement or "", time.perf_counter() - starts.pop())
+
+def group_commit_metrics() -> List[str]:
+    stats = group_committer.stats()
+    lines = gauge_family(
+        "group_commit_batches_total", "Group-commit transactions committed", (((), stats["batches"]),), kind="counter"
+    )
+    lines += gauge_family(
+        "group_commit_operations_total", "Writes committed through group commit", (((), stats["operations"]),), kind="counter"
+    )
+    lines += gauge_family("group_commit_queue_depth", "Writes waiting for the next batch", (((), stats["queue_depth"]),))
+    return lines
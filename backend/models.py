@@ -3,12 +3,15 @@ from pydantic import BaseModel, Field, EmailStr
 from typing import Optional
 from datetime import datetime, timezone
 from bson import ObjectId
+from pydantic_core import core_schema
 
 # Custom ObjectId handler
 class PyObjectId(ObjectId):
     @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.validate, serialization=core_schema.to_string_ser_schema()
+        )
 
     @classmethod
     def validate(cls, v):
@@ -17,8 +20,8 @@ class PyObjectId(ObjectId):
         return ObjectId(v)
 
     @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return {"type": "string"}
 
 # User Model
 class UserDB(BaseModel):
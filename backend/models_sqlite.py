@@ -1,8 +1,8 @@
 # Database models for VideoFlow
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
-from database import Base
+from database_sqlite import Base
 
 class User(Base):
     __tablename__ = "users"
@@ -20,14 +20,58 @@ class Video(Base):
     __tablename__ = "videos"
     
     id = Column(Integer, primary_key=True, index=True)
-    titulo = Column(String, nullable=False, index=True)
+    titulo = Column(String, nullable=False)
     descricao = Column(Text, nullable=True)
     roteiro = Column(Text, nullable=True)
     url = Column(String, nullable=True)
-    status = Column(String, default="planejado", index=True)  # planejado, em-producao, em-edicao, concluido
-    data_criacao = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    status = Column(String, default="planejado")  # planejado, em-producao, em-edicao, concluido
+    data_criacao = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     data_conclusao = Column(DateTime, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Relationship with user
     owner = relationship("User", back_populates="videos")
+    
+    __table_args__ = (
+        # Matches the list order, so every page (skip or cursor) is an index range scan
+        Index("ix_videos_user_created", "user_id", data_criacao.desc(), "id"),
+        # Same order within one status (status filter, per-status counts and bulk edits)
+        Index("ix_videos_user_status_created", "user_id", "status", data_criacao.desc(), "id"),
+        # Completed-videos range of the time series
+        Index("ix_videos_user_completed", "user_id", "data_conclusao"),
+    )
+
+class UserVideoStats(Base):
+    __tablename__ = "user_video_stats"
+    
+    # One materialized counters row per user, kept in sync by every video write
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_videos = Column(Integer, default=0, nullable=False)
+    planejado = Column(Integer, default=0, nullable=False)
+    em_producao = Column(Integer, default=0, nullable=False)
+    em_edicao = Column(Integer, default=0, nullable=False)
+    concluido = Column(Integer, default=0, nullable=False)
+    # Bumped by every video write; read endpoints derive their ETag from it
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)
+    # Bumped by writes that can change closed time-series buckets (deletes,
+    # explicit data_conclusao); rollups built for an older version are rebuilt
+    history_version = Column(Integer, default=0, server_default="0", nullable=False)
+
+class VideoRollup(Base):
+    __tablename__ = "video_rollups"
+    
+    # Created/completed counts of one closed time-series bucket
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    interval = Column(String, primary_key=True)  # day, week, month
+    bucket_start = Column(DateTime, primary_key=True)
+    created = Column(Integer, default=0, nullable=False)
+    completed = Column(Integer, default=0, nullable=False)
+
+class VideoRollupState(Base):
+    __tablename__ = "video_rollup_state"
+    
+    # How far a user's rollup reaches, and the history version it was built from
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    interval = Column(String, primary_key=True)
+    rolled_until = Column(DateTime, nullable=False)
+    history_version = Column(Integer, nullable=False)
@@ -0,0 +1,27 @@
+# Opaque keyset cursors for paging video lists by (data_criacao DESC, id ASC)
+import base64
+import json
+from datetime import datetime
+from typing import Tuple, Union
+
+from fastapi import HTTPException, status
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(data_criacao: datetime, video_id: Union[int, str]) -> str:
+    """Encode the sort key of the last video on a page"""
+    payload = json.dumps([data_criacao.isoformat(), video_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Union[int, str]]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data_criacao, video_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(data_criacao), video_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
@@ -0,0 +1,44 @@
+# Bounded worker pool that keeps bcrypt hashing/verification off the event loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, TypeVar
+import asyncio
+import os
+
+# Concurrency cap: at most this many bcrypt operations run at once, the rest queue up
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+
+# bcrypt releases the GIL while hashing, so plain threads give real parallelism
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_in_flight = 0
+
+T = TypeVar("T")
+
+async def run_in_password_pool(func: Callable[..., T], *args) -> T:
+    """Run a blocking password function in the worker pool"""
+    global _in_flight
+    _in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _in_flight -= 1
+
+def password_pool_stats() -> Dict[str, int]:
+    """Pool size, operations in flight and how many of them are waiting for a worker"""
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "in_flight": _in_flight,
+        "queue_depth": max(_in_flight - PASSWORD_HASH_WORKERS, 0),
+    }
+
+@lru_cache(maxsize=None)
+def password_context():
+    """bcrypt context, built on first use: only register/login pay passlib's import"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def hash_password(password: str) -> str:
+    return password_context().hash(password)
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    return password_context().verify(plain_password, hashed_password)
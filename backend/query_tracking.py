@@ -0,0 +1,104 @@
+# Per-request DB query tracking: attribution, query budgets and N+1 detection (both backends)
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+import logging
+import os
+import re
+
+# Queries a request may issue before a warning is logged (0 disables the check)
+QUERY_BUDGET = int(os.environ.get("QUERY_BUDGET", "10"))
+
+# The same statement this many times in one request is reported as a likely N+1
+QUERY_REPEAT_THRESHOLD = int(os.environ.get("QUERY_REPEAT_THRESHOLD", "5"))
+
+# Per-route budgets ("METHOD /template"); None for routes whose query count
+# grows with the payload by design (one statement per chunk or batch)
+ROUTE_QUERY_BUDGETS = {
+    "POST /api/videos/import": None,
+    "POST /api/videos/import/stream": None,
+    "GET /api/videos/export": None,
+    "POST /api/videos/bulk-update": None,
+    "POST /api/videos/bulk-delete": None,
+    # The filter-based routes run a fixed handful of set-based statements however
+    # many videos match (no id chunks), dry_run fewer still: a tight budget flags
+    # any slide into per-video work
+    "POST /api/videos/bulk-update/by-filter": 6,
+    "POST /api/videos/bulk-delete/by-filter": 6,
+}
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Transaction control repeats legitimately (one SAVEPOINT per grouped write)
+TRANSACTION_PATTERN = re.compile(r"(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+class RequestQueries:
+    """Statements and durations of the queries issued inside one tracking block"""
+    
+    def __init__(self):
+        self.queries: List[Tuple[str, float]] = []
+    
+    def __len__(self) -> int:
+        return len(self.queries)
+    
+    @property
+    def statements(self) -> List[str]:
+        return [WHITESPACE_PATTERN.sub(" ", statement).strip() for statement, _ in self.queries]
+    
+    @property
+    def durations(self) -> List[float]:
+        return [seconds for _, seconds in self.queries]
+    
+    def repeated(self, threshold: int = QUERY_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statements issued at least `threshold` times, most repeated first"""
+        return [
+            (statement, count) for statement, count in Counter(self.statements).most_common()
+            if count >= threshold and not TRANSACTION_PATTERN.match(statement)
+        ]
+
+# Tracking block of the current request (None outside requests)
+_current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+def record_query(statement: str, seconds: float) -> bool:
+    """Attribute one finished query to the current block; False when issued outside any"""
+    queries = _current_queries.get()
+    if queries is None:
+        return False
+    # list.append is atomic, so driver threads (PyMongo) can record safely
+    queries.queries.append((statement, seconds))
+    return True
+
+@contextmanager
+def track_queries() -> Iterator[RequestQueries]:
+    """Collect the queries issued inside the block.
+    
+    Blocks nest: queries seen by an inner block (the one the metrics middleware
+    opens per request) are also reported to the outer one, so a test can wrap
+    a client call and assert the exact number of queries the endpoint issued.
+    """
+    parent = _current_queries.get()
+    queries = RequestQueries()
+    token = _current_queries.set(queries)
+    try:
+        yield queries
+    finally:
+        _current_queries.reset(token)
+        if parent is not None:
+            parent.queries.extend(queries.queries)
+
+def check_query_budget(method: str, route: str, queries: RequestQueries) -> None:
+    """Log a warning when a request exceeded its route's budget or repeated a statement"""
+    key = f"{method} {route}"
+    budget = ROUTE_QUERY_BUDGETS.get(key, QUERY_BUDGET)
+    if budget is None:
+        return
+    
+    if budget and len(queries) > budget:
+        logger.warning(f"{key} issued {len(queries)} queries (budget {budget})")
+    
+    if QUERY_REPEAT_THRESHOLD:
+        for statement, count in queries.repeated():
+            logger.warning(f"Possible N+1 on {key}: {count}x {statement[:200]}")
@@ -1,7 +1,20 @@
 # Pydantic schemas for request/response models
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
-from datetime import datetime
+from pydantic import AfterValidator, BaseModel, EmailStr, Field
+from typing import Annotated, Optional, List, Union
+from datetime import datetime, timezone
+
+# Integer primary keys on SQLite, ObjectId strings on MongoDB
+RecordId = Union[int, str]
+
+def as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values are UTC, as every backend stores them"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+# Always serialized as "...Z", whether the value was just written (aware) or read
+# back from the database (naive), and stored as UTC when it comes in a request
+UTCDatetime = Annotated[datetime, AfterValidator(as_utc)]
 
 # User Schemas
 class UserCreate(BaseModel):
@@ -14,10 +27,10 @@ class UserLogin(BaseModel):
     password: str
 
 class UserResponse(BaseModel):
-    id: int
+    id: RecordId
     email: str
     username: str
-    created_at: datetime
+    created_at: UTCDatetime
     
     class Config:
         from_attributes = True
@@ -41,39 +54,63 @@ class VideoUpdate(BaseModel):
     roteiro: Optional[str] = None
     url: Optional[str] = None
     status: Optional[str] = None
-    data_conclusao: Optional[datetime] = None
+    data_conclusao: Optional[UTCDatetime] = None
 
 class VideoResponse(BaseModel):
-    id: int
+    id: RecordId
     titulo: str
     descricao: Optional[str]
     roteiro: Optional[str]
     url: Optional[str]
     status: str
-    data_criacao: datetime
-    data_conclusao: Optional[datetime]
-    user_id: int
+    data_criacao: UTCDatetime
+    data_conclusao: Optional[UTCDatetime]
+    user_id: RecordId
     
     class Config:
         from_attributes = True
 
+class VideoSearchResponse(VideoResponse):
+    snippet: Optional[str] = None  # Highlighted match, only present when requested
+
+class VideoPageResponse(BaseModel):
+    items: List[VideoSearchResponse]
+    total: int
+
 # Bulk Operations
 class BulkUpdateRequest(BaseModel):
-    video_ids: List[int]
+    video_ids: List[RecordId]
     status: Optional[str] = None
-    data_conclusao: Optional[datetime] = None
+    data_conclusao: Optional[UTCDatetime] = None
 
 class BulkDeleteRequest(BaseModel):
-    video_ids: List[int]
+    video_ids: List[RecordId]
+
+class BulkFilterUpdateRequest(BaseModel):
+    status: Optional[str] = None
+    data_conclusao: Optional[UTCDatetime] = None
+
+class BulkChunkReport(BaseModel):
+    chunk: int
+    ids: int
+    affected: int
+    elapsed_ms: float
 
 # Import/Export
 class ImportRequest(BaseModel):
     content: str
 
+class ImportBatchReport(BaseModel):
+    batch: int
+    imported_count: int
+    errors: List[str] = []
+    elapsed_ms: float
+
 class ImportResponse(BaseModel):
     success: bool
     imported_count: int
     errors: List[str] = []
+    batches: List[ImportBatchReport] = []
 
 # Stats
 class StatsResponse(BaseModel):
@@ -83,3 +120,13 @@ class StatsResponse(BaseModel):
     videos_em_producao: int
     videos_em_edicao: int
     nivel: int
+
+# Time series
+class TimeseriesBucket(BaseModel):
+    start: UTCDatetime
+    created: int
+    completed: int
+
+class TimeseriesResponse(BaseModel):
+    interval: str
+    buckets: List[TimeseriesBucket]
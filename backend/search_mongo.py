@@ -0,0 +1,127 @@
+# Full-text search for the MongoDB backend ($text index plus an n-gram substring fallback)
+import argparse
+import asyncio
+import re
+import unicodedata
+from typing import Dict, List, Mapping, Set, Tuple
+
+from database import videos_collection
+
+SEARCH_FIELDS = ("titulo", "descricao", "roteiro")
+SEARCH_MODES = ("text", "substring")
+
+# Every video stores the trigrams of its (accent/case folded) words in this field,
+# indexed together with user_id, so substring search never scans whole documents.
+GRAMS_FIELD = "search_grams"
+GRAM_SIZE = 3
+
+_word_re = re.compile(r"\w+")
+
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics ("Edição" -> "edicao")"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+def word_grams(word: str) -> Set[str]:
+    """Trigrams of a word; short words are kept whole"""
+    if len(word) <= GRAM_SIZE:
+        return {word}
+    return {word[i:i + GRAM_SIZE] for i in range(len(word) - GRAM_SIZE + 1)}
+
+def search_grams(video: Mapping) -> List[str]:
+    """Build the n-gram token field for a video document"""
+    grams = set()
+    for field in SEARCH_FIELDS:
+        for word in _word_re.findall(fold(video.get(field) or "")):
+            grams |= word_grams(word)
+    return sorted(grams)
+
+def folded_variants() -> Dict[str, str]:
+    """Every Latin letter that folds to a single ASCII letter, by that letter ("e" -> "eEéÉèÈ...")"""
+    variants = {}
+    for code in range(0x41, 0x250):
+        char = chr(code)
+        folded = fold(char)
+        if len(folded) == 1 and folded.isascii() and folded.isalpha():
+            variants[folded] = variants.get(folded, "") + char
+    return variants
+
+FOLDED_VARIANTS = folded_variants()
+
+# Combining marks of text stored decomposed ("e" + U+0301 instead of "é")
+COMBINING_MARKS = "[\u0300-\u036f]*"
+
+def folded_pattern(word: str) -> str:
+    """Regex matching `word` (already folded) regardless of case and accents"""
+    parts = []
+    for char in word:
+        variants = FOLDED_VARIANTS.get(char)
+        parts.append(f"[{variants}]{COMBINING_MARKS}" if variants else re.escape(char))
+    return "".join(parts)
+
+def substring_filter(search: str) -> dict:
+    """Filter matching videos where every search word is a substring of one
+    field, ignoring case and accents.
+    
+    The grams of the longer words narrow the candidates through the
+    (user_id, search_grams) index; each word is then checked with an escaped
+    regex on the fields, since grams alone can come from different words or
+    fields. Words shorter than a gram are only checked by the regex.
+    """
+    words = list(dict.fromkeys(_word_re.findall(fold(search))))
+    conditions = [
+        {"$or": [{field: {"$regex": folded_pattern(word)}} for field in SEARCH_FIELDS]}
+        for word in words
+    ]
+    
+    grams = set()
+    for word in words:
+        if len(word) >= GRAM_SIZE:
+            grams |= word_grams(word)
+    
+    search_filter = {GRAMS_FIELD: {"$all": sorted(grams)}} if grams else {}
+    if conditions:
+        search_filter["$and"] = conditions
+    return search_filter
+
+def apply_search(query: dict, search: str, mode: str = "substring") -> Tuple[dict, bool]:
+    """Add a search filter to query; returns (query, whether textScore is available).
+    
+    "text" matches whole words through the $text index (rankable by textScore);
+    "substring" matches parts of words through the n-gram field.
+    """
+    if mode == "text":
+        return {**query, "$text": {"$search": search}}, True
+    return {**query, **substring_filter(search)}, False
+
+async def backfill_search_grams(batch_size: int = 500) -> int:
+    """Populate the n-gram field on videos written before it existed (run by the
+    startup that migrates the indexes, or by hand)"""
+    from pymongo import UpdateOne
+    
+    updated = 0
+    cursor = videos_collection.find(
+        {GRAMS_FIELD: {"$exists": False}},
+        {field: 1 for field in SEARCH_FIELDS}
+    )
+    
+    batch = []
+    async for video in cursor:
+        batch.append(UpdateOne({"_id": video["_id"]}, {"$set": {GRAMS_FIELD: search_grams(video)}}))
+        if len(batch) >= batch_size:
+            await videos_collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+    
+    if batch:
+        await videos_collection.bulk_write(batch, ordered=False)
+        updated += len(batch)
+    
+    return updated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Populate the n-gram search field on existing videos")
+    parser.parse_args()
+    
+    count = asyncio.run(backfill_search_grams())
+    print(f"Backfilled search n-grams for {count} video(s)")
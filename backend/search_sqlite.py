@@ -0,0 +1,120 @@
+# Full-text search for the SQLite backend (FTS5 index over videos)
+import re
+from typing import Optional
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, func, literal_column, or_, select
+from sqlalchemy.sql import Select
+
+from models_sqlite import Video
+
+# External-content FTS5 table: stores only the index, rows live in `videos`.
+# remove_diacritics folds accents, so "edicao" matches "edição" (and vice versa).
+videos_fts = Table(
+    "videos_fts",
+    MetaData(),  # Kept out of Base.metadata: create_all can't build virtual tables
+    Column("rowid", Integer, primary_key=True),
+    Column("titulo", Text),
+    Column("descricao", Text),
+    Column("roteiro", Text),
+)
+
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+        titulo, descricao, roteiro,
+        content='videos', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # Triggers keep the index in sync with every write to videos
+    """
+    CREATE TRIGGER IF NOT EXISTS videos_fts_ai AFTER INSERT ON videos BEGIN
+        INSERT INTO videos_fts(rowid, titulo, descricao, roteiro)
+        VALUES (new.id, new.titulo, new.descricao, new.roteiro);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS videos_fts_ad AFTER DELETE ON videos BEGIN
+        INSERT INTO videos_fts(videos_fts, rowid, titulo, descricao, roteiro)
+        VALUES ('delete', old.id, old.titulo, old.descricao, old.roteiro);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS videos_fts_au AFTER UPDATE OF titulo, descricao, roteiro ON videos BEGIN
+        INSERT INTO videos_fts(videos_fts, rowid, titulo, descricao, roteiro)
+        VALUES ('delete', old.id, old.titulo, old.descricao, old.roteiro);
+        INSERT INTO videos_fts(rowid, titulo, descricao, roteiro)
+        VALUES (new.id, new.titulo, new.descricao, new.roteiro);
+    END
+    """,
+]
+
+# bm25 column weights: a hit in the title counts more than one deep in the script
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+SNIPPET_MARKERS = ("<mark>", "</mark>", "…")
+SNIPPET_TOKENS = 16
+
+_word_re = re.compile(r"\w+")
+
+def create_search_index(connection) -> None:
+    """Create the FTS5 index and its triggers, backfilling it on first creation"""
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'videos_fts'"
+    ).first()
+    
+    for statement in SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+    
+    if not exists:
+        connection.exec_driver_sql("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')")
+
+def fts_query(search: str) -> Optional[str]:
+    """Turn raw user input into a safe FTS5 query: every word becomes a quoted prefix term"""
+    words = _word_re.findall(search)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+def apply_search(query: Select, search: str, rank: bool = False, highlight: bool = False) -> Select:
+    """Filter a videos query by search text, optionally ranked by bm25 and with a snippet column"""
+    match = fts_query(search)
+    
+    # Nothing indexable (e.g. only punctuation): keep the old substring behaviour
+    if match is None:
+        search_pattern = f"%{search}%"
+        return query.where(
+            or_(
+                Video.titulo.ilike(search_pattern),
+                Video.descricao.ilike(search_pattern),
+                Video.roteiro.ilike(search_pattern)
+            )
+        )
+    
+    fts = literal_column("videos_fts")
+    
+    # Plain filtering: the matching ids are collected once, so an index walk over
+    # the user's videos (e.g. in date order) doesn't run one FTS probe per video
+    if not (rank or highlight):
+        matches = select(videos_fts.c.rowid).where(fts.op("MATCH")(match))
+        return query.where(Video.id.in_(matches))
+    
+    # bm25() and snippet() need the FTS cursor, so the matches come from a subquery
+    # over videos_fts: the index drives the query and videos are looked up by id,
+    # whatever indexes on videos the planner could otherwise walk first
+    columns = [videos_fts.c.rowid]
+    if rank:
+        columns.append(func.bm25(fts, *BM25_WEIGHTS).label("rank"))
+    if highlight:
+        columns.append(func.snippet(fts, -1, *SNIPPET_MARKERS, SNIPPET_TOKENS).label("snippet"))
+    matches = select(*columns).where(fts.op("MATCH")(match)).subquery("matches")
+    
+    query = query.join(matches, matches.c.rowid == Video.id)
+    
+    if rank:
+        query = query.order_by(matches.c.rank)
+    
+    if highlight:
+        query = query.add_columns(matches.c.snippet)
+    
+    return query
@@ -1,27 +1,39 @@
 # VideoFlow FastAPI Backend with MongoDB and JWT
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timezone
+from typing import List, Literal, Optional, Union
 import os
 import logging
-import re
+import time
+from collections import Counter
 from pathlib import Path
 from dotenv import load_dotenv
-from bson import ObjectId
 
 # Import local modules
-from database import db, users_collection, videos_collection, create_indexes
-from models import UserDB, VideoDB
+from database import db, users_collection, videos_collection, close_client, connect_client, create_indexes
 from schemas import (
     UserCreate, UserLogin, UserResponse, TokenResponse,
-    VideoCreate, VideoUpdate, VideoResponse,
-    BulkUpdateRequest, BulkDeleteRequest,
-    ImportRequest, ImportResponse, StatsResponse
+    VideoCreate, VideoUpdate, VideoResponse, VideoPageResponse,
+    BulkUpdateRequest, BulkDeleteRequest, BulkFilterUpdateRequest, BulkChunkReport,
+    ImportRequest, ImportResponse, ImportBatchReport, StatsResponse, TimeseriesResponse
 )
-from auth_mongo import (
+from auth import (
     get_password_hash, verify_password, create_access_token, get_current_user
 )
+from counters import counter_deltas, status_change_deltas, stats_from_counters
+from counters_mongo import apply_counter_deltas, count_statuses, get_data_version, get_user_counters
+from timeseries_mongo import get_timeseries
+from search_mongo import GRAMS_FIELD, SEARCH_FIELDS, apply_search, backfill_search_grams, search_grams
+from pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from filters import VideoFilters, time_filter_start
+from bulk import chunked, unique_ids
+from conditional import check_etag
+from json_response import json_response
+from metrics import METRICS_ENABLED, METRICS_PATH, MetricsMiddleware, metrics_response
+from video_text import EXPORT_BATCH_SIZE, IMPORT_BATCH_SIZE, batched, parse_video_stream
+from video_export import EXPORT_FORMATS, stream_export
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
@@ -40,8 +52,13 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Request/DB command metrics, scraped from /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -52,9 +69,32 @@ logger = logging.getLogger(__name__)
 # Database initialization
 @app.on_event("startup")
 async def startup():
-    """Initialize database on startup"""
-    await create_indexes()
-    logger.info("MongoDB initialized successfully")
+    """Connect the shared client and initialize the database on startup"""
+    ping_ms = await connect_client()
+    if await create_indexes():
+        # First start on this index spec: give videos written before the n-gram
+        # field existed their search grams, or substring search would miss them
+        backfilled = await backfill_search_grams()
+        if backfilled:
+            logger.info(f"Backfilled search n-grams for {backfilled} video(s)")
+    logger.info(f"MongoDB initialized successfully (ping {ping_ms:.1f} ms)")
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the shared client and its connection pool"""
+    close_client()
+
+def stored_now() -> datetime:
+    """Now, cut to the milliseconds BSON dates keep, so a response built from a
+    document just written shows the same time as reading it back"""
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+def to_object_id(value):
+    """ObjectId of a string id (raises on an invalid one)"""
+    # Imported here: bson ships with PyMongo, loaded with the client, not with the app
+    from bson import ObjectId
+    return ObjectId(value)
 
 # Helper function to convert ObjectId to string
 def video_helper(video) -> dict:
@@ -70,6 +110,9 @@ def video_helper(video) -> dict:
         "user_id": str(video["user_id"])
     }
 
+# List responses never need the search grams stored on every video
+LIST_PROJECTION = {GRAMS_FIELD: 0}
+
 def user_helper(user) -> dict:
     return {
         "id": str(user["_id"]),
@@ -100,12 +143,12 @@ async def register(user_data: UserCreate):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     new_user = {
         "email": user_data.email,
         "username": user_data.username,
         "hashed_password": hashed_password,
-        "created_at": datetime.now(timezone.utc)
+        "created_at": stored_now()
     }
     
     result = await users_collection.insert_one(new_user)
@@ -125,7 +168,7 @@ async def login(user_data: UserLogin):
     # Find user by email
     user = await users_collection.find_one({"email": user_data.email})
     
-    if not user or not verify_password(user_data.password, user["hashed_password"]):
+    if not user or not await verify_password(user_data.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -146,127 +189,166 @@ async def get_me(current_user: dict = Depends(get_current_user)):
 
 # ==================== VIDEO ROUTES ====================
 
-@api_router.get("/videos/stats", response_model=StatsResponse)
+async def check_data_version(
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user)
+):
+    """Conditional GET: 304 before any video query when the client's ETag is current"""
+    user_id = str(current_user["_id"])
+    check_etag(request, response, user_id, await get_data_version(user_id))
+
+@api_router.get("/videos/stats", response_model=StatsResponse, dependencies=[Depends(check_data_version)])
 async def get_stats(current_user: dict = Depends(get_current_user)):
     """Get user's video statistics"""
     user_id = str(current_user["_id"])
     
-    # Get total count
-    total_videos = await videos_collection.count_documents({"user_id": user_id})
-    
-    # Get count by status
-    videos_concluidos = await videos_collection.count_documents({"user_id": user_id, "status": "concluido"})
-    videos_planejado = await videos_collection.count_documents({"user_id": user_id, "status": "planejado"})
-    videos_em_producao = await videos_collection.count_documents({"user_id": user_id, "status": "em-producao"})
-    videos_em_edicao = await videos_collection.count_documents({"user_id": user_id, "status": "em-edicao"})
-    
-    # Calculate nivel (level) based on completed videos
-    nivel = min(videos_concluidos // 5 + 1, 99)
-    
-    return StatsResponse(
-        total_videos=total_videos,
-        videos_concluidos=videos_concluidos,
-        videos_planejado=videos_planejado,
-        videos_em_producao=videos_em_producao,
-        videos_em_edicao=videos_em_edicao,
-        nivel=nivel
-    )
+    counters = await get_user_counters(user_id)
+    return stats_from_counters(counters)
+
+@api_router.get("/videos/timeseries", response_model=TimeseriesResponse, dependencies=[Depends(check_data_version)])
+async def get_videos_timeseries(
+    interval: Literal["day", "week", "month"] = "day",
+    current_user: dict = Depends(get_current_user)
+):
+    """Videos created and completed per day, week or month"""
+    return await get_timeseries(str(current_user["_id"]), interval)
+
+def build_video_query(user_id: str, filters: VideoFilters, search_mode: str = "substring"):
+    """Build the user/status/time/search query shared by every list endpoint.
+    
+    Returns (query, text_score) where text_score tells whether the query is a
+    $text search, so results can be sorted by textScore.
+    """
+    query = {"user_id": user_id}
+    
+    # Apply status filter
+    if filters.status_filter:
+        query["status"] = filters.status_filter
+    
+    # Apply time filter
+    created_after = time_filter_start(filters.time_filter)
+    if created_after:
+        query["data_criacao"] = {"$gte": created_after}
+    
+    # Apply search filter (n-gram substrings, or whole words through the $text index)
+    if filters.search:
+        return apply_search(query, filters.search, search_mode)
+    
+    return query, False
 
-@api_router.get("/videos", response_model=List[VideoResponse])
+def video_sort(by_text_score: bool = False) -> list:
+    """Most recent first, _id breaks ties (best textScore first when ranking a $text search)"""
+    sort = [("data_criacao", -1), ("_id", 1)]
+    if by_text_score:
+        sort.insert(0, ("score", {"$meta": "textScore"}))
+    return sort
+
+@api_router.get("/videos", response_model=List[VideoResponse], dependencies=[Depends(check_data_version)])
 async def get_videos(
-    search: Optional[str] = None,
-    status_filter: Optional[str] = None,
-    time_filter: Optional[str] = None,
+    response: Response,
+    filters: VideoFilters = Depends(),
     skip: int = 0,
     limit: int = 12,
+    cursor: Optional[str] = None,
+    search_mode: Literal["text", "substring"] = "substring",
+    rank: bool = False,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get user's videos with filters and pagination"""
-    user_id = str(current_user["_id"])
-    query = {"user_id": user_id}
+    """Get user's videos with filters and pagination (skip/limit or keyset cursor)"""
+    if cursor and rank:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not available for ranked searches"
+        )
     
-    # Apply search filter
-    if search:
-        query["$or"] = [
-            {"titulo": {"$regex": search, "$options": "i"}},
-            {"descricao": {"$regex": search, "$options": "i"}},
-            {"roteiro": {"$regex": search, "$options": "i"}}
-        ]
+    user_id = str(current_user["_id"])
+    query, text_score = build_video_query(user_id, filters, search_mode)
     
-    # Apply status filter
-    if status_filter:
-        query["status"] = status_filter
+    # A cursor continues right after the last video of the previous page
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        try:
+            cursor_id = to_object_id(cursor_id)
+        except:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = {"$and": [query, {"$or": [
+            {"data_criacao": {"$lt": cursor_date}},
+            {"data_criacao": cursor_date, "_id": {"$gt": cursor_id}}
+        ]}]}
     
-    # Apply time filter
-    if time_filter:
-        now = datetime.now(timezone.utc)
-        time_filters = {
-            "1h": now - timedelta(hours=1),
-            "4h": now - timedelta(hours=4),
-            "6h": now - timedelta(hours=6),
-            "12h": now - timedelta(hours=12),
-            "1d": now - timedelta(days=1),
-            "3d": now - timedelta(days=3),
-            "1s": now - timedelta(weeks=1),
-            "1m": now - timedelta(days=30),
-            "3m": now - timedelta(days=90),
-            "6m": now - timedelta(days=180),
-            "1a": now - timedelta(days=365),
-        }
-        if time_filter in time_filters:
-            query["data_criacao"] = {"$gte": time_filters[time_filter]}
+    by_text_score = rank and text_score
+    projection = dict(LIST_PROJECTION)
+    if by_text_score:
+        projection["score"] = {"$meta": "textScore"}
     
     # Get videos with pagination
-    cursor = videos_collection.find(query).sort("data_criacao", -1).skip(skip).limit(limit)
-    videos = await cursor.to_list(length=limit)
+    videos_cursor = videos_collection.find(query, projection).sort(video_sort(by_text_score))
+    if not cursor:
+        videos_cursor = videos_cursor.skip(skip)
+    videos = await videos_cursor.limit(limit).to_list(length=limit)
     
-    return [VideoResponse(**video_helper(video)) for video in videos]
+    if len(videos) == limit and not rank:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(videos[-1]["data_criacao"], str(videos[-1]["_id"]))
+    
+    return json_response([video_helper(video) for video in videos], response)
 
-@api_router.get("/videos/count")
+@api_router.get("/videos/count", dependencies=[Depends(check_data_version)])
 async def get_videos_count(
-    search: Optional[str] = None,
-    status_filter: Optional[str] = None,
-    time_filter: Optional[str] = None,
+    filters: VideoFilters = Depends(),
+    search_mode: Literal["text", "substring"] = "substring",
     current_user: dict = Depends(get_current_user)
 ):
     """Get total count of videos matching filters"""
     user_id = str(current_user["_id"])
-    query = {"user_id": user_id}
-    
-    # Apply search filter
-    if search:
-        query["$or"] = [
-            {"titulo": {"$regex": search, "$options": "i"}},
-            {"descricao": {"$regex": search, "$options": "i"}},
-            {"roteiro": {"$regex": search, "$options": "i"}}
-        ]
-    
-    # Apply status filter
-    if status_filter:
-        query["status"] = status_filter
-    
-    # Apply time filter
-    if time_filter:
-        now = datetime.now(timezone.utc)
-        time_filters = {
-            "1h": now - timedelta(hours=1),
-            "4h": now - timedelta(hours=4),
-            "6h": now - timedelta(hours=6),
-            "12h": now - timedelta(hours=12),
-            "1d": now - timedelta(days=1),
-            "3d": now - timedelta(days=3),
-            "1s": now - timedelta(weeks=1),
-            "1m": now - timedelta(days=30),
-            "3m": now - timedelta(days=90),
-            "6m": now - timedelta(days=180),
-            "1a": now - timedelta(days=365),
-        }
-        if time_filter in time_filters:
-            query["data_criacao"] = {"$gte": time_filters[time_filter]}
+    query, _ = build_video_query(user_id, filters, search_mode)
     
     count = await videos_collection.count_documents(query)
     return {"count": count}
 
+@api_router.get(
+    "/videos/page", response_model=VideoPageResponse, response_model_exclude_unset=True,
+    dependencies=[Depends(check_data_version)]
+)
+async def get_videos_page(
+    response: Response,
+    filters: VideoFilters = Depends(),
+    skip: int = 0,
+    limit: int = 12,
+    search_mode: Literal["text", "substring"] = "substring",
+    rank: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get one page of videos plus the total matching the filters, in a single aggregation"""
+    user_id = str(current_user["_id"])
+    query, text_score = build_video_query(user_id, filters, search_mode)
+    
+    # $facet runs the page and the count over the same $match in one round trip.
+    # Stages inside $facet can't use an index, so the sort comes first, where
+    # it is pushed down to the (user_id, data_criacao, _id) index scan
+    pipeline = [
+        {"$match": query},
+        {"$sort": dict(video_sort(rank and text_score))},
+        {"$facet": {
+            "items": [
+                {"$skip": skip},
+                {"$limit": limit},
+                {"$project": LIST_PROJECTION}
+            ],
+            "total": [{"$count": "count"}]
+        }}
+    ]
+    result = await videos_collection.aggregate(pipeline).to_list(length=1)
+    page = result[0]
+    
+    return json_response({
+        "items": [video_helper(video) for video in page["items"]],
+        "total": page["total"][0]["count"] if page["total"] else 0
+    }, response)
+
 @api_router.post("/videos", response_model=VideoResponse, status_code=status.HTTP_201_CREATED)
 async def create_video(
     video_data: VideoCreate,
@@ -275,23 +357,59 @@ async def create_video(
     """Create a new video"""
     user_id = str(current_user["_id"])
     
+    now = stored_now()
     new_video = {
         "titulo": video_data.titulo,
         "descricao": video_data.descricao,
         "roteiro": video_data.roteiro,
         "url": video_data.url,
         "status": video_data.status,
-        "data_criacao": datetime.now(timezone.utc),
-        "data_conclusao": datetime.now(timezone.utc) if video_data.status == "concluido" else None,
+        "data_criacao": now,
+        "data_conclusao": now if video_data.status == "concluido" else None,
         "user_id": user_id
     }
+    new_video[GRAMS_FIELD] = search_grams(new_video)
     
     result = await videos_collection.insert_one(new_video)
     new_video["_id"] = result.inserted_id
+    await apply_counter_deltas(user_id, counter_deltas(added={new_video["status"]: 1}))
     
     return VideoResponse(**video_helper(new_video))
 
-@api_router.get("/videos/{video_id}", response_model=VideoResponse)
+# Registered before /videos/{video_id} so "export" isn't captured as an id
+@api_router.get("/videos/export")
+async def export_videos(
+    export_format: Literal["text", "ndjson", "csv", "parquet"] = Query("text", alias="format"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Export all user videos (text, NDJSON, CSV or Parquet), streamed in batches"""
+    user_id = str(current_user["_id"])
+    
+    cursor = (
+        videos_collection.find(
+            {"user_id": user_id},
+            {
+                "titulo": 1, "descricao": 1, "roteiro": 1, "url": 1, "status": 1,
+                "data_criacao": 1, "data_conclusao": 1
+            }
+        )
+        .sort([("data_criacao", -1), ("_id", 1)])
+        .batch_size(EXPORT_BATCH_SIZE)
+    )
+    
+    async def videos():
+        async for video in cursor:
+            video["id"] = str(video.pop("_id"))
+            yield video
+    
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        stream_export(videos(), export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="videos.{extension}"'}
+    )
+
+@api_router.get("/videos/{video_id}", response_model=VideoResponse, dependencies=[Depends(check_data_version)])
 async def get_video(
     video_id: str,
     current_user: dict = Depends(get_current_user)
@@ -300,7 +418,7 @@ async def get_video(
     user_id = str(current_user["_id"])
     
     try:
-        video = await videos_collection.find_one({"_id": ObjectId(video_id), "user_id": user_id})
+        video = await videos_collection.find_one({"_id": to_object_id(video_id), "user_id": user_id})
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -325,7 +443,7 @@ async def update_video(
     user_id = str(current_user["_id"])
     
     try:
-        video = await videos_collection.find_one({"_id": ObjectId(video_id), "user_id": user_id})
+        video = await videos_collection.find_one({"_id": to_object_id(video_id), "user_id": user_id})
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -341,16 +459,27 @@ async def update_video(
     # Update fields
     update_data = video_data.model_dump(exclude_unset=True)
     
-    # Auto-set data_conclusao if status changed to concluido
-    if video_data.status == "concluido" and not video.get("data_conclusao"):
-        update_data["data_conclusao"] = datetime.now(timezone.utc)
+    # Auto-set data_conclusao if status changed to concluido (and none was given)
+    if video_data.status == "concluido" and not video.get("data_conclusao") and "data_conclusao" not in update_data:
+        update_data["data_conclusao"] = stored_now()
+    
+    # Keep the n-gram search field in sync with the text fields
+    if any(field in update_data for field in SEARCH_FIELDS):
+        update_data[GRAMS_FIELD] = search_grams({**video, **update_data})
     
     await videos_collection.update_one(
-        {"_id": ObjectId(video_id)},
+        {"_id": to_object_id(video_id)},
         {"$set": update_data}
     )
     
-    updated_video = await videos_collection.find_one({"_id": ObjectId(video_id)})
+    # Empty deltas when the status is unchanged; still bumps the data version
+    new_status = update_data.get("status") or video["status"]
+    await apply_counter_deltas(
+        user_id, status_change_deltas({video["status"]: 1}, new_status),
+        history_changed="data_conclusao" in video_data.model_fields_set
+    )
+    
+    updated_video = await videos_collection.find_one({"_id": to_object_id(video_id)})
     return VideoResponse(**video_helper(updated_video))
 
 @api_router.delete("/videos/{video_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -362,36 +491,34 @@ async def delete_video(
     user_id = str(current_user["_id"])
     
     try:
-        result = await videos_collection.delete_one({"_id": ObjectId(video_id), "user_id": user_id})
+        video = await videos_collection.find_one_and_delete(
+            {"_id": to_object_id(video_id), "user_id": user_id},
+            projection={"status": 1}
+        )
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid video ID"
         )
     
-    if result.deleted_count == 0:
+    if video is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Video not found"
         )
     
+    await apply_counter_deltas(user_id, counter_deltas(removed={video["status"]: 1}), history_changed=True)
+    
     return None
 
 # ==================== BULK OPERATIONS ====================
 
-@api_router.post("/videos/bulk-update")
-async def bulk_update_videos(
-    bulk_data: BulkUpdateRequest,
-    current_user: dict = Depends(get_current_user)
-):
-    """Bulk update videos status"""
-    user_id = str(current_user["_id"])
-    
-    # Convert string IDs to ObjectId
+def parse_object_ids(video_ids: List) -> List:
+    """Convert string IDs to ObjectId, skipping invalid ones and repeats"""
     object_ids = []
-    for vid_id in bulk_data.video_ids:
+    for vid_id in unique_ids(str(vid_id) for vid_id in video_ids):
         try:
-            object_ids.append(ObjectId(str(vid_id)))
+            object_ids.append(to_object_id(vid_id))
         except:
             pass
     
@@ -401,20 +528,64 @@ async def bulk_update_videos(
             detail="No valid video IDs provided"
         )
     
+    return object_ids
+
+async def stamp_completion(query: dict, bulk_data: Union[BulkUpdateRequest, BulkFilterUpdateRequest]) -> None:
+    """Auto-set data_conclusao on the matched videos being completed that have none yet,
+    so completing a video again keeps its original completion date"""
+    if bulk_data.status == "concluido" and not bulk_data.data_conclusao:
+        await videos_collection.update_many(
+            {"$and": [query, {"data_conclusao": None}]},
+            {"$set": {"data_conclusao": stored_now()}}
+        )
+
+@api_router.post("/videos/bulk-update")
+async def bulk_update_videos(
+    bulk_data: BulkUpdateRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Bulk update videos status"""
+    user_id = str(current_user["_id"])
+    object_ids = parse_object_ids(bulk_data.video_ids)
+    
     update_data = {}
     if bulk_data.status:
         update_data["status"] = bulk_data.status
-        if bulk_data.status == "concluido":
-            update_data["data_conclusao"] = datetime.now(timezone.utc)
     if bulk_data.data_conclusao:
         update_data["data_conclusao"] = bulk_data.data_conclusao
     
-    result = await videos_collection.update_many(
-        {"_id": {"$in": object_ids}, "user_id": user_id},
-        {"$set": update_data}
-    )
+    updated_count = 0
+    chunks = []
     
-    return {"success": True, "updated_count": result.modified_count}
+    # Chunked $in lists; counters move with each chunk so they stay in step
+    # with what has been written even if a later chunk fails
+    for index, chunk_ids in enumerate(chunked(object_ids), 1):
+        started = time.perf_counter()
+        query = {"_id": {"$in": chunk_ids}, "user_id": user_id}
+        
+        # Statuses about to change, so the counters can be moved along with them
+        old_statuses = {}
+        if bulk_data.status:
+            old_statuses = await count_statuses({**query, "status": {"$ne": bulk_data.status}})
+        
+        # Stamped before the status moves, while the query still matches the same videos
+        await stamp_completion(query, bulk_data)
+        result = await videos_collection.update_many(query, {"$set": update_data})
+        
+        await apply_counter_deltas(
+            user_id, status_change_deltas(old_statuses, bulk_data.status),
+            history_changed=bool(bulk_data.data_conclusao)
+        )
+        
+        updated_count += result.modified_count
+        chunks.append(BulkChunkReport(
+            chunk=index,
+            ids=len(chunk_ids),
+            affected=result.modified_count,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+        ))
+    
+    return {"success": True, "updated_count": updated_count, "chunks": chunks}
 
 @api_router.post("/videos/bulk-delete")
 async def bulk_delete_videos(
@@ -423,79 +594,171 @@ async def bulk_delete_videos(
 ):
     """Bulk delete videos"""
     user_id = str(current_user["_id"])
+    object_ids = parse_object_ids(bulk_data.video_ids)
     
-    # Convert string IDs to ObjectId
-    object_ids = []
-    for vid_id in bulk_data.video_ids:
-        try:
-            object_ids.append(ObjectId(str(vid_id)))
-        except:
-            pass
+    deleted_count = 0
+    chunks = []
     
-    if not object_ids:
+    for index, chunk_ids in enumerate(chunked(object_ids), 1):
+        started = time.perf_counter()
+        query = {"_id": {"$in": chunk_ids}, "user_id": user_id}
+        
+        removed_statuses = await count_statuses(query)
+        result = await videos_collection.delete_many(query)
+        await apply_counter_deltas(user_id, counter_deltas(removed=removed_statuses), history_changed=True)
+        
+        deleted_count += result.deleted_count
+        chunks.append(BulkChunkReport(
+            chunk=index,
+            ids=len(chunk_ids),
+            affected=result.deleted_count,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+        ))
+    
+    return {"success": True, "deleted_count": deleted_count, "chunks": chunks}
+
+@api_router.post("/videos/bulk-update/by-filter")
+async def bulk_update_videos_by_filter(
+    bulk_data: BulkFilterUpdateRequest,
+    filters: VideoFilters = Depends(),
+    search_mode: Literal["text", "substring"] = "substring",
+    dry_run: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    """Bulk update every video matching the list filters (dry_run only counts them)"""
+    user_id = str(current_user["_id"])
+    query, _ = build_video_query(user_id, filters, search_mode)
+    
+    if dry_run:
+        matched_count = await videos_collection.count_documents(query)
+        return {"success": True, "dry_run": True, "matched_count": matched_count}
+    
+    update_data = {}
+    if bulk_data.status:
+        update_data["status"] = bulk_data.status
+    if bulk_data.data_conclusao:
+        update_data["data_conclusao"] = bulk_data.data_conclusao
+    
+    if not update_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No valid video IDs provided"
+            detail="No fields to update"
         )
     
-    result = await videos_collection.delete_many(
-        {"_id": {"$in": object_ids}, "user_id": user_id}
+    # Statuses about to change, so the counters can be moved along with them
+    # ($and: the query may already filter on status)
+    old_statuses = {}
+    if bulk_data.status:
+        old_statuses = await count_statuses({"$and": [query, {"status": {"$ne": bulk_data.status}}]})
+    
+    # Stamped before the status moves, while the query still matches the same videos
+    await stamp_completion(query, bulk_data)
+    result = await videos_collection.update_many(query, {"$set": update_data})
+    
+    if not result.matched_count:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No videos found"
+        )
+    
+    await apply_counter_deltas(
+        user_id, status_change_deltas(old_statuses, bulk_data.status),
+        history_changed=bool(bulk_data.data_conclusao)
     )
     
+    return {"success": True, "updated_count": result.modified_count}
+
+@api_router.post("/videos/bulk-delete/by-filter")
+async def bulk_delete_videos_by_filter(
+    filters: VideoFilters = Depends(),
+    search_mode: Literal["text", "substring"] = "substring",
+    dry_run: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    """Bulk delete every video matching the list filters (dry_run only counts them)"""
+    user_id = str(current_user["_id"])
+    query, _ = build_video_query(user_id, filters, search_mode)
+    
+    if dry_run:
+        matched_count = await videos_collection.count_documents(query)
+        return {"success": True, "dry_run": True, "matched_count": matched_count}
+    
+    removed_statuses = await count_statuses(query)
+    result = await videos_collection.delete_many(query)
+    
+    if not result.deleted_count:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No videos found"
+        )
+    
+    await apply_counter_deltas(user_id, counter_deltas(removed=removed_statuses), history_changed=True)
+    
     return {"success": True, "deleted_count": result.deleted_count}
 
 # ==================== IMPORT/EXPORT ====================
 
-def parse_video_text(content: str) -> List[dict]:
-    """Parse video data from text format using REGEX"""
-    videos = []
-    video_blocks = re.split(r'(?=\[TÍTULO\])', content)
-    
-    for block in video_blocks:
-        if not block.strip():
-            continue
-        
-        video_data = {}
-        
-        titulo_match = re.search(r'\[TÍTULO\]\s*(.+?)(?=\n|\[|$)', block, re.IGNORECASE)
-        if titulo_match:
-            video_data['titulo'] = titulo_match.group(1).strip()
-        else:
-            continue
-        
-        descricao_match = re.search(r'\[DESCRIÇÃO\]\s*(.+?)(?=\n\[|$)', block, re.IGNORECASE | re.DOTALL)
-        if descricao_match:
-            video_data['descricao'] = descricao_match.group(1).strip()
+async def import_video_stream(chunks, user_id: str) -> ImportResponse:
+    """Parse videos as chunks arrive and insert them in fixed-size batches"""
+    # Imported here: PyMongo is loaded with the client, not with the app
+    from pymongo.errors import BulkWriteError
+    
+    errors = []
+    batches = []
+    imported_count = 0
+    
+    async for videos in batched(parse_video_stream(chunks), IMPORT_BATCH_SIZE):
+        started = time.perf_counter()
+        now = stored_now()
+        docs = []
+        for video_data in videos:
+            new_video = {
+                **video_data,
+                "user_id": user_id,
+                "data_criacao": now,
+                "data_conclusao": now if video_data["status"] == "concluido" else None
+            }
+            new_video[GRAMS_FIELD] = search_grams(new_video)
+            docs.append(new_video)
         
-        roteiro_match = re.search(r'\[ROTEIRO\]\s*(.+?)(?=\n\[|$)', block, re.IGNORECASE | re.DOTALL)
-        if roteiro_match:
-            video_data['roteiro'] = roteiro_match.group(1).strip()
+        # Unordered insert_many: one bad document doesn't stop the rest of the batch
+        batch_errors = []
+        failed = set()
+        try:
+            await videos_collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed.add(error["index"])
+                batch_errors.append(f"Error importing '{docs[error['index']]['titulo']}': {error['errmsg']}")
+        except Exception as e:
+            failed = set(range(len(docs)))
+            batch_errors.append(f"Error importing batch {len(batches) + 1} ('{docs[0]['titulo']}'...): {str(e)}")
         
-        url_match = re.search(r'\[URL\]\s*(.+?)(?=\n|\[|$)', block, re.IGNORECASE)
-        if url_match:
-            video_data['url'] = url_match.group(1).strip()
+        inserted = [doc for index, doc in enumerate(docs) if index not in failed]
+        await apply_counter_deltas(user_id, counter_deltas(added=Counter(doc["status"] for doc in inserted)))
         
-        status_match = re.search(r'\[STATUS\]\s*(.+?)(?=\n|\[|$)', block, re.IGNORECASE)
-        if status_match:
-            status_text = status_match.group(1).strip().lower()
-            status_map = {
-                'planejado': 'planejado',
-                'em produção': 'em-producao',
-                'em producao': 'em-producao',
-                'em-producao': 'em-producao',
-                'em edição': 'em-edicao',
-                'em edicao': 'em-edicao',
-                'em-edicao': 'em-edicao',
-                'concluído': 'concluido',
-                'concluido': 'concluido'
-            }
-            video_data['status'] = status_map.get(status_text, 'planejado')
-        else:
-            video_data['status'] = 'planejado'
-        
-        videos.append(video_data)
+        imported_count += len(inserted)
+        errors.extend(batch_errors)
+        batches.append(ImportBatchReport(
+            batch=len(batches) + 1,
+            imported_count=len(inserted),
+            errors=batch_errors,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+        ))
+        logger.info(f"Import batch {len(batches)}: {len(inserted)}/{len(docs)} videos, {imported_count} so far")
+    
+    if not batches:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No valid videos found in the content"
+        )
     
-    return videos
+    return ImportResponse(
+        success=True,
+        imported_count=imported_count,
+        errors=errors,
+        batches=batches
+    )
 
 @api_router.post("/videos/import", response_model=ImportResponse)
 async def import_videos(
@@ -505,37 +768,13 @@ async def import_videos(
     """Import videos from text format"""
     user_id = str(current_user["_id"])
     
+    async def content():
+        yield import_data.content
+    
     try:
-        parsed_videos = parse_video_text(import_data.content)
-        
-        if not parsed_videos:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No valid videos found in the content"
-            )
-        
-        errors = []
-        imported_count = 0
-        
-        for video_data in parsed_videos:
-            try:
-                new_video = {
-                    **video_data,
-                    "user_id": user_id,
-                    "data_criacao": datetime.now(timezone.utc),
-                    "data_conclusao": datetime.now(timezone.utc) if video_data.get('status') == "concluido" else None
-                }
-                
-                await videos_collection.insert_one(new_video)
-                imported_count += 1
-            except Exception as e:
-                errors.append(f"Error importing '{video_data.get('titulo', 'Unknown')}': {str(e)}")
-        
-        return ImportResponse(
-            success=True,
-            imported_count=imported_count,
-            errors=errors
-        )
+        return await import_video_stream(content(), user_id)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Import error: {str(e)}")
         raise HTTPException(
@@ -543,31 +782,24 @@ async def import_videos(
             detail=f"Error parsing content: {str(e)}"
         )
 
-@api_router.get("/videos/export")
-async def export_videos(current_user: dict = Depends(get_current_user)):
-    """Export all user videos to text format"""
+@api_router.post("/videos/import/stream", response_model=ImportResponse)
+async def import_videos_stream(
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """Import videos from a raw text upload, parsed and inserted while it streams in"""
     user_id = str(current_user["_id"])
     
-    cursor = videos_collection.find({"user_id": user_id}).sort("data_criacao", -1)
-    videos = await cursor.to_list(length=None)
-    
-    if not videos:
-        return {"content": ""}
-    
-    lines = []
-    for video in videos:
-        lines.append(f"[TÍTULO] {video['titulo']}")
-        if video.get('descricao'):
-            lines.append(f"[DESCRIÇÃO] {video['descricao']}")
-        if video.get('roteiro'):
-            lines.append(f"[ROTEIRO] {video['roteiro']}")
-        if video.get('url'):
-            lines.append(f"[URL] {video['url']}")
-        lines.append(f"[STATUS] {video['status']}")
-        lines.append("")
-    
-    content = "\n".join(lines)
-    return {"content": content}
+    try:
+        return await import_video_stream(request.stream(), user_id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Import error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error parsing content: {str(e)}"
+        )
 
 # Include router in app
 app.include_router(api_router)
@@ -576,3 +808,12 @@ app.include_router(api_router)
 @app.get("/")
 async def root():
     return {"message": "VideoFlow API is running", "version": "1.0.0 (MongoDB)"}
+
+@app.get(METRICS_PATH, include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus scrape endpoint"""
+    if not METRICS_ENABLED:
+        return metrics_response(request)
+    # Imported here: PyMongo is loaded with the client, not with the app
+    from metrics_mongo import mongo_pool_metrics
+    return metrics_response(request, [mongo_pool_metrics])
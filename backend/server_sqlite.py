@@ -1,28 +1,46 @@
 # VideoFlow FastAPI Backend with SQLite and JWT
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_
-from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from sqlalchemy import select, insert, update, delete, func, or_, and_
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
 import os
 import logging
-import re
+import time
+from collections import Counter
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Import local modules
-from database import engine, Base, get_db
-from models import User, Video
+from database_sqlite import (
+    engine, read_engine, ReadSessionLocal, get_db, get_read_db, dispose_engines, migrate_database
+)
+from models_sqlite import User, Video
 from schemas import (
     UserCreate, UserLogin, UserResponse, TokenResponse,
-    VideoCreate, VideoUpdate, VideoResponse,
-    BulkUpdateRequest, BulkDeleteRequest,
-    ImportRequest, ImportResponse, StatsResponse
+    VideoCreate, VideoUpdate, VideoResponse, VideoSearchResponse, VideoPageResponse,
+    BulkUpdateRequest, BulkDeleteRequest, BulkFilterUpdateRequest, BulkChunkReport,
+    ImportRequest, ImportResponse, ImportBatchReport, StatsResponse, TimeseriesResponse
 )
-from auth import (
+from auth_sqlite import (
     get_password_hash, verify_password, create_access_token, get_current_user
 )
+from counters import counter_deltas, status_change_deltas, stats_from_counters
+from counters_sqlite import apply_counter_deltas, get_data_version, get_user_counters
+from search_sqlite import apply_search
+from timeseries_sqlite import get_timeseries
+from pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from filters import VideoFilters, time_filter_start
+from bulk import chunked, unique_ids
+from group_commit_sqlite import group_committer
+from conditional import check_etag
+from json_response import VIDEO_FIELDS, json_response
+from metrics import METRICS_ENABLED, METRICS_PATH, MetricsMiddleware, metrics_response
+from metrics_sqlite import group_commit_metrics, instrument_engine
+from video_text import EXPORT_BATCH_SIZE, IMPORT_BATCH_SIZE, batched, parse_video_stream
+from video_export import EXPORT_FORMATS, stream_export
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
@@ -41,8 +59,15 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Request/DB query metrics, scraped from /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -54,9 +79,27 @@ logger = logging.getLogger(__name__)
 @app.on_event("startup")
 async def startup():
     """Initialize database on startup"""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Database initialized successfully")
+    # Skipped (one SELECT) when the file is already at the current schema version
+    migrated = await migrate_database()
+    logger.info("Database initialized successfully" + (" (schema migrated)" if migrated else ""))
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the database connections"""
+    await group_committer.close()
+    await dispose_engines()
+
+# List endpoints select plain columns instead of ORM entities
+VIDEO_COLUMNS = tuple(getattr(Video, field) for field in VIDEO_FIELDS)
+
+def video_row_helper(row) -> dict:
+    """JSON-ready dict of a video row"""
+    video = dict(zip(VIDEO_FIELDS, row))
+    # Rows carry a snippet column only when highlighting a full-text search
+    snippet = row._mapping.get("snippet")
+    if snippet is not None:
+        video["snippet"] = snippet
+    return video
 
 # ==================== AUTH ROUTES ====================
 
@@ -79,8 +122,11 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
             detail="Username already taken"
         )
     
+    # End the read transaction so no pooled connection is held during the slow hash
+    await db.commit()
+    
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     new_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -100,13 +146,16 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     )
 
 @api_router.post("/auth/login", response_model=TokenResponse)
-async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_read_db)):
     """Login user and return JWT token"""
     # Find user by email
     result = await db.execute(select(User).where(User.email == user_data.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(user_data.password, user.hashed_password):
+    # End the read transaction so no pooled connection is held during the slow verify
+    await db.rollback()
+    
+    if not user or not await verify_password(user_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -127,190 +176,216 @@ async def get_me(current_user: User = Depends(get_current_user)):
 
 # ==================== VIDEO ROUTES ====================
 
-@api_router.get("/videos/stats", response_model=StatsResponse)
+async def check_data_version(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Conditional GET: 304 before any video query when the client's ETag is current"""
+    check_etag(request, response, current_user.id, await get_data_version(db, current_user.id))
+
+@api_router.get("/videos/stats", response_model=StatsResponse, dependencies=[Depends(check_data_version)])
 async def get_stats(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get user's video statistics"""
-    # Get total count
-    result = await db.execute(
-        select(func.count(Video.id)).where(Video.user_id == current_user.id)
-    )
-    total_videos = result.scalar_one()
+    counters = await get_user_counters(db, current_user.id)
+    return stats_from_counters(counters)
+
+@api_router.get("/videos/timeseries", response_model=TimeseriesResponse, dependencies=[Depends(check_data_version)])
+async def get_videos_timeseries(
+    interval: Literal["day", "week", "month"] = "day",
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Videos created and completed per day, week or month"""
+    return await get_timeseries(db, current_user.id, interval)
+
+def apply_video_filters(query, user_id: int, filters: VideoFilters, rank: bool = False, highlight: bool = False):
+    """Apply the user/search/status/time filters shared by every list endpoint"""
+    query = query.where(Video.user_id == user_id)
     
-    # Get count by status
-    result = await db.execute(
-        select(func.count(Video.id))
-        .where(and_(Video.user_id == current_user.id, Video.status == "concluido"))
-    )
-    videos_concluidos = result.scalar_one()
+    # Apply search filter (FTS5 index, diacritic-insensitive)
+    if filters.search:
+        query = apply_search(query, filters.search, rank=rank, highlight=highlight)
     
-    result = await db.execute(
-        select(func.count(Video.id))
-        .where(and_(Video.user_id == current_user.id, Video.status == "planejado"))
-    )
-    videos_planejado = result.scalar_one()
+    # Apply status filter
+    if filters.status_filter:
+        query = query.where(Video.status == filters.status_filter)
     
-    result = await db.execute(
-        select(func.count(Video.id))
-        .where(and_(Video.user_id == current_user.id, Video.status == "em-producao"))
-    )
-    videos_em_producao = result.scalar_one()
+    # Apply time filter
+    created_after = time_filter_start(filters.time_filter)
+    if created_after:
+        query = query.where(Video.data_criacao >= created_after)
     
-    result = await db.execute(
-        select(func.count(Video.id))
-        .where(and_(Video.user_id == current_user.id, Video.status == "em-edicao"))
-    )
-    videos_em_edicao = result.scalar_one()
-    
-    # Calculate nivel (level) based on completed videos
-    nivel = min(videos_concluidos // 5 + 1, 99)  # Level up every 5 completed videos, max 99
-    
-    return StatsResponse(
-        total_videos=total_videos,
-        videos_concluidos=videos_concluidos,
-        videos_planejado=videos_planejado,
-        videos_em_producao=videos_em_producao,
-        videos_em_edicao=videos_em_edicao,
-        nivel=nivel
-    )
+    return query
 
-@api_router.get("/videos", response_model=List[VideoResponse])
-async def get_videos(
-    search: Optional[str] = None,
-    status_filter: Optional[str] = None,
-    time_filter: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 12,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get user's videos with filters and pagination"""
-    query = select(Video).where(Video.user_id == current_user.id)
+def apply_video_page(query, skip: int, limit: int, cursor: Optional[str] = None):
+    """Order most recent first (id breaks ties) and cut one page by offset or keyset cursor"""
+    query = query.order_by(Video.data_criacao.desc(), Video.id)
     
-    # Apply search filter
-    if search:
-        search_pattern = f"%{search}%"
+    # A cursor continues right after the last video of the previous page
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
         query = query.where(
             or_(
-                Video.titulo.ilike(search_pattern),
-                Video.descricao.ilike(search_pattern),
-                Video.roteiro.ilike(search_pattern)
+                Video.data_criacao < cursor_date,
+                and_(Video.data_criacao == cursor_date, Video.id > cursor_id)
             )
         )
+    else:
+        query = query.offset(skip)
     
-    # Apply status filter
-    if status_filter:
-        query = query.where(Video.status == status_filter)
+    return query.limit(limit)
+
+@api_router.get(
+    "/videos", response_model=List[VideoSearchResponse], response_model_exclude_unset=True,
+    dependencies=[Depends(check_data_version)]
+)
+async def get_videos(
+    response: Response,
+    filters: VideoFilters = Depends(),
+    skip: int = 0,
+    limit: int = 12,
+    cursor: Optional[str] = None,
+    rank: bool = False,
+    highlight: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get user's videos with filters and pagination (skip/limit or keyset cursor)"""
+    if cursor and rank:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not available for ranked searches"
+        )
     
-    # Apply time filter
-    if time_filter:
-        now = datetime.now(timezone.utc)
-        time_filters = {
-            "1h": now - timedelta(hours=1),
-            "4h": now - timedelta(hours=4),
-            "6h": now - timedelta(hours=6),
-            "12h": now - timedelta(hours=12),
-            "1d": now - timedelta(days=1),
-            "3d": now - timedelta(days=3),
-            "1s": now - timedelta(weeks=1),
-            "1m": now - timedelta(days=30),
-            "3m": now - timedelta(days=90),
-            "6m": now - timedelta(days=180),
-            "1a": now - timedelta(days=365),
-        }
-        if time_filter in time_filters:
-            query = query.where(Video.data_criacao >= time_filters[time_filter])
-    
-    # Order by creation date (most recent first)
-    query = query.order_by(Video.data_criacao.desc())
-    
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
+    query = apply_video_filters(select(*VIDEO_COLUMNS), current_user.id, filters, rank=rank, highlight=highlight)
+    query = apply_video_page(query, skip, limit, cursor)
     
     result = await db.execute(query)
-    videos = result.scalars().all()
+    rows = result.all()
     
-    return [VideoResponse.model_validate(video) for video in videos]
+    if len(rows) == limit and not rank:
+        last_video = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_video.data_criacao, last_video.id)
+    
+    return json_response([video_row_helper(row) for row in rows], response)
 
-@api_router.get("/videos/count")
+@api_router.get("/videos/count", dependencies=[Depends(check_data_version)])
 async def get_videos_count(
-    search: Optional[str] = None,
-    status_filter: Optional[str] = None,
-    time_filter: Optional[str] = None,
+    filters: VideoFilters = Depends(),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get total count of videos matching filters"""
-    query = select(func.count(Video.id)).where(Video.user_id == current_user.id)
-    
-    # Apply search filter
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                Video.titulo.ilike(search_pattern),
-                Video.descricao.ilike(search_pattern),
-                Video.roteiro.ilike(search_pattern)
-            )
-        )
-    
-    # Apply status filter
-    if status_filter:
-        query = query.where(Video.status == status_filter)
-    
-    # Apply time filter
-    if time_filter:
-        now = datetime.now(timezone.utc)
-        time_filters = {
-            "1h": now - timedelta(hours=1),
-            "4h": now - timedelta(hours=4),
-            "6h": now - timedelta(hours=6),
-            "12h": now - timedelta(hours=12),
-            "1d": now - timedelta(days=1),
-            "3d": now - timedelta(days=3),
-            "1s": now - timedelta(weeks=1),
-            "1m": now - timedelta(days=30),
-            "3m": now - timedelta(days=90),
-            "6m": now - timedelta(days=180),
-            "1a": now - timedelta(days=365),
-        }
-        if time_filter in time_filters:
-            query = query.where(Video.data_criacao >= time_filters[time_filter])
+    query = apply_video_filters(select(func.count(Video.id)), current_user.id, filters)
     
     result = await db.execute(query)
     count = result.scalar_one()
     
     return {"count": count}
 
+@api_router.get(
+    "/videos/page", response_model=VideoPageResponse, response_model_exclude_unset=True,
+    dependencies=[Depends(check_data_version)]
+)
+async def get_videos_page(
+    response: Response,
+    filters: VideoFilters = Depends(),
+    skip: int = 0,
+    limit: int = 12,
+    rank: bool = False,
+    highlight: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get one page of videos plus the total matching the filters, in a single query"""
+    # The total is an uncorrelated scalar subquery, counted once from the covering
+    # indexes, while the page itself is read in index order up to OFFSET + LIMIT rows
+    # (a COUNT(*) OVER () window would materialize and sort every match instead)
+    total = apply_video_filters(select(func.count(Video.id)), current_user.id, filters).scalar_subquery()
+    query = select(*VIDEO_COLUMNS, total.label("total"))
+    query = apply_video_filters(query, current_user.id, filters, rank=rank, highlight=highlight)
+    query = apply_video_page(query, skip, limit)
+    
+    result = await db.execute(query)
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    else:
+        # Page past the end (or no matches): no row to read the window total from
+        result = await db.execute(
+            apply_video_filters(select(func.count(Video.id)), current_user.id, filters)
+        )
+        total = result.scalar_one()
+    
+    return json_response({"items": [video_row_helper(row) for row in rows], "total": total}, response)
+
 @api_router.post("/videos", response_model=VideoResponse, status_code=status.HTTP_201_CREATED)
 async def create_video(
     video_data: VideoCreate,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Create a new video"""
-    new_video = Video(
-        **video_data.model_dump(),
-        user_id=current_user.id
-    )
-    
-    # Set data_conclusao if status is concluido
-    if new_video.status == "concluido":
-        new_video.data_conclusao = datetime.now(timezone.utc)
+    async def create(db: AsyncSession) -> VideoResponse:
+        new_video = Video(
+            **video_data.model_dump(),
+            user_id=current_user.id
+        )
+        
+        # Set data_conclusao if status is concluido
+        if new_video.status == "concluido":
+            new_video.data_conclusao = datetime.now(timezone.utc)
+        
+        db.add(new_video)
+        await apply_counter_deltas(db, current_user.id, counter_deltas(added={new_video.status: 1}))
+        await db.flush()
+        
+        return VideoResponse.model_validate(new_video)
     
-    db.add(new_video)
-    await db.commit()
-    await db.refresh(new_video)
+    # Committed together with other writes arriving in the same window
+    return await group_committer.submit(create)
+
+# Registered before /videos/{video_id} so "export" isn't captured as an id
+@api_router.get("/videos/export")
+async def export_videos(
+    export_format: Literal["text", "ndjson", "csv", "parquet"] = Query("text", alias="format"),
+    current_user: User = Depends(get_current_user)
+):
+    """Export all user videos (text, NDJSON, CSV or Parquet), streamed in batches"""
+    query = (
+        select(
+            Video.id, Video.titulo, Video.descricao, Video.roteiro, Video.url, Video.status,
+            Video.data_criacao, Video.data_conclusao
+        )
+        .where(Video.user_id == current_user.id)
+        .order_by(Video.data_criacao.desc(), Video.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
     
-    return VideoResponse.model_validate(new_video)
+    async def videos():
+        # The request's session is closed before the body streams, so use a dedicated one
+        async with ReadSessionLocal() as session:
+            result = await session.stream(query)
+            async for row in result.mappings():
+                yield row
+    
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        stream_export(videos(), export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="videos.{extension}"'}
+    )
 
-@api_router.get("/videos/{video_id}", response_model=VideoResponse)
+@api_router.get("/videos/{video_id}", response_model=VideoResponse, dependencies=[Depends(check_data_version)])
 async def get_video(
     video_id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific video"""
     result = await db.execute(
@@ -332,59 +407,69 @@ async def get_video(
 async def update_video(
     video_id: int,
     video_data: VideoUpdate,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Update a video"""
-    result = await db.execute(
-        select(Video).where(
-            and_(Video.id == video_id, Video.user_id == current_user.id)
+    async def update_one(db: AsyncSession) -> VideoResponse:
+        result = await db.execute(
+            select(Video).where(
+                and_(Video.id == video_id, Video.user_id == current_user.id)
+            )
         )
-    )
-    video = result.scalar_one_or_none()
-    
-    if not video:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Video not found"
+        video = result.scalar_one_or_none()
+        
+        if not video:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Video not found"
+            )
+        
+        old_status = video.status
+        
+        # Update fields
+        update_data = video_data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(video, field, value)
+        
+        # Auto-set data_conclusao if status changed to concluido
+        if video_data.status == "concluido" and not video.data_conclusao:
+            video.data_conclusao = datetime.now(timezone.utc)
+        
+        # Empty deltas when the status is unchanged; still bumps the data version
+        await apply_counter_deltas(
+            db, current_user.id, status_change_deltas({old_status: 1}, video.status),
+            history_changed="data_conclusao" in update_data
         )
+        await db.flush()
+        
+        return VideoResponse.model_validate(video)
     
-    # Update fields
-    update_data = video_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(video, field, value)
-    
-    # Auto-set data_conclusao if status changed to concluido
-    if video_data.status == "concluido" and not video.data_conclusao:
-        video.data_conclusao = datetime.now(timezone.utc)
-    
-    await db.commit()
-    await db.refresh(video)
-    
-    return VideoResponse.model_validate(video)
+    return await group_committer.submit(update_one)
 
 @api_router.delete("/videos/{video_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_video(
     video_id: int,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """Delete a video"""
-    result = await db.execute(
-        select(Video).where(
-            and_(Video.id == video_id, Video.user_id == current_user.id)
-        )
-    )
-    video = result.scalar_one_or_none()
-    
-    if not video:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Video not found"
+    async def delete_one(db: AsyncSession) -> None:
+        result = await db.execute(
+            select(Video).where(
+                and_(Video.id == video_id, Video.user_id == current_user.id)
+            )
         )
+        video = result.scalar_one_or_none()
+        
+        if not video:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Video not found"
+            )
+        
+        await db.delete(video)
+        await apply_counter_deltas(db, current_user.id, counter_deltas(removed={video.status: 1}), history_changed=True)
     
-    await db.delete(video)
-    await db.commit()
+    await group_committer.submit(delete_one)
     
     return None
 
@@ -397,35 +482,70 @@ async def bulk_update_videos(
     db: AsyncSession = Depends(get_db)
 ):
     """Bulk update videos status"""
-    result = await db.execute(
-        select(Video).where(
-            and_(
-                Video.id.in_(bulk_data.video_ids),
-                Video.user_id == current_user.id
-            )
+    values = {}
+    if bulk_data.status:
+        values["status"] = bulk_data.status
+        # Auto-set data_conclusao if status changed to concluido
+        if bulk_data.status == "concluido":
+            values["data_conclusao"] = func.coalesce(Video.data_conclusao, datetime.now(timezone.utc))
+    if bulk_data.data_conclusao:
+        values["data_conclusao"] = bulk_data.data_conclusao
+    
+    old_statuses = Counter()
+    updated_count = 0
+    chunks = []
+    
+    # Chunks keep each statement under SQLite's bound-parameter limit; they
+    # all run in this session's transaction and commit together
+    for index, video_ids in enumerate(chunked(unique_ids(bulk_data.video_ids)), 1):
+        started = time.perf_counter()
+        selected = and_(
+            Video.id.in_(video_ids),
+            Video.user_id == current_user.id
         )
-    )
-    videos = result.scalars().all()
-    
-    if not videos:
+        
+        # Statuses before the update, for the counters (RETURNING only sees new values)
+        result = await db.execute(
+            select(Video.status, func.count(Video.id)).where(selected).group_by(Video.status)
+        )
+        chunk_statuses = dict(result.all())
+        affected = sum(chunk_statuses.values())
+        
+        if values and chunk_statuses:
+            # One UPDATE for the whole chunk instead of a flush per ORM object
+            result = await db.execute(
+                update(Video)
+                .where(selected)
+                .values(**values)
+                .returning(Video.id)
+                .execution_options(synchronize_session=False)
+            )
+            affected = len(result.all())
+        
+        old_statuses.update(chunk_statuses)
+        updated_count += affected
+        chunks.append(BulkChunkReport(
+            chunk=index,
+            ids=len(video_ids),
+            affected=affected,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+        ))
+    
+    if not updated_count:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No videos found"
         )
     
-    # Update videos
-    for video in videos:
-        if bulk_data.status:
-            video.status = bulk_data.status
-            # Auto-set data_conclusao if status changed to concluido
-            if bulk_data.status == "concluido" and not video.data_conclusao:
-                video.data_conclusao = datetime.now(timezone.utc)
-        if bulk_data.data_conclusao:
-            video.data_conclusao = bulk_data.data_conclusao
+    deltas = {}
+    if bulk_data.status:
+        old_statuses.pop(bulk_data.status, None)
+        deltas = status_change_deltas(old_statuses, bulk_data.status)
+    await apply_counter_deltas(db, current_user.id, deltas, history_changed=bool(bulk_data.data_conclusao))
     
     await db.commit()
     
-    return {"success": True, "updated_count": len(videos)}
+    return {"success": True, "updated_count": updated_count, "chunks": chunks}
 
 @api_router.post("/videos/bulk-delete")
 async def bulk_delete_videos(
@@ -434,90 +554,200 @@ async def bulk_delete_videos(
     db: AsyncSession = Depends(get_db)
 ):
     """Bulk delete videos"""
-    result = await db.execute(
-        select(Video).where(
-            and_(
-                Video.id.in_(bulk_data.video_ids),
-                Video.user_id == current_user.id
+    removed_statuses = Counter()
+    chunks = []
+    
+    # Chunks keep each statement under SQLite's bound-parameter limit; they
+    # all run in this session's transaction and commit together
+    for index, video_ids in enumerate(chunked(unique_ids(bulk_data.video_ids)), 1):
+        started = time.perf_counter()
+        
+        # One DELETE per chunk; RETURNING gives the statuses for the counters
+        result = await db.execute(
+            delete(Video)
+            .where(
+                and_(
+                    Video.id.in_(video_ids),
+                    Video.user_id == current_user.id
+                )
             )
+            .returning(Video.id, Video.status)
+            .execution_options(synchronize_session=False)
         )
+        deleted = result.all()
+        
+        removed_statuses.update(row.status for row in deleted)
+        chunks.append(BulkChunkReport(
+            chunk=index,
+            ids=len(video_ids),
+            affected=len(deleted),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+        ))
+    
+    deleted_count = sum(removed_statuses.values())
+    if not deleted_count:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No videos found"
+        )
+    
+    await apply_counter_deltas(db, current_user.id, counter_deltas(removed=removed_statuses), history_changed=True)
+    await db.commit()
+    
+    return {"success": True, "deleted_count": deleted_count, "chunks": chunks}
+
+@api_router.post("/videos/bulk-update/by-filter")
+async def bulk_update_videos_by_filter(
+    bulk_data: BulkFilterUpdateRequest,
+    filters: VideoFilters = Depends(),
+    dry_run: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk update every video matching the list filters (dry_run only counts them)"""
+    result = await db.execute(
+        apply_video_filters(select(Video.status, func.count(Video.id)), current_user.id, filters)
+        .group_by(Video.status)
     )
-    videos = result.scalars().all()
+    old_statuses = Counter(dict(result.all()))
+    matched_count = sum(old_statuses.values())
+    
+    if dry_run:
+        return {"success": True, "dry_run": True, "matched_count": matched_count}
     
-    if not videos:
+    if not matched_count:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No videos found"
         )
     
-    # Delete videos
-    for video in videos:
-        await db.delete(video)
+    values = {}
+    if bulk_data.status:
+        values["status"] = bulk_data.status
+        # Auto-set data_conclusao if status changed to concluido
+        if bulk_data.status == "concluido":
+            values["data_conclusao"] = func.coalesce(Video.data_conclusao, datetime.now(timezone.utc))
+    if bulk_data.data_conclusao:
+        values["data_conclusao"] = bulk_data.data_conclusao
+    
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
+    
+    # One UPDATE ... WHERE id IN (<filtered list query>), nothing shipped by the client
+    result = await db.execute(
+        update(Video)
+        .where(Video.id.in_(apply_video_filters(select(Video.id), current_user.id, filters)))
+        .values(**values)
+        .returning(Video.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated_count = len(result.all())
+    
+    deltas = {}
+    if bulk_data.status:
+        old_statuses.pop(bulk_data.status, None)
+        deltas = status_change_deltas(old_statuses, bulk_data.status)
+    await apply_counter_deltas(db, current_user.id, deltas, history_changed=bool(bulk_data.data_conclusao))
     
     await db.commit()
     
-    return {"success": True, "deleted_count": len(videos)}
+    return {"success": True, "updated_count": updated_count}
 
-# ==================== IMPORT/EXPORT ====================
-
-def parse_video_text(content: str) -> List[dict]:
-    """Parse video data from text format using REGEX"""
-    videos = []
+@api_router.post("/videos/bulk-delete/by-filter")
+async def bulk_delete_videos_by_filter(
+    filters: VideoFilters = Depends(),
+    dry_run: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk delete every video matching the list filters (dry_run only counts them)"""
+    if dry_run:
+        result = await db.execute(
+            apply_video_filters(select(func.count(Video.id)), current_user.id, filters)
+        )
+        return {"success": True, "dry_run": True, "matched_count": result.scalar()}
     
-    # Split by video entries (assuming each video starts with [TÍTULO])
-    video_blocks = re.split(r'(?=\[TÍTULO\])', content)
+    # One DELETE ... WHERE id IN (<filtered list query>); RETURNING gives the statuses for the counters
+    result = await db.execute(
+        delete(Video)
+        .where(Video.id.in_(apply_video_filters(select(Video.id), current_user.id, filters)))
+        .returning(Video.id, Video.status)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.all()
     
-    for block in video_blocks:
-        if not block.strip():
-            continue
-        
-        video_data = {}
-        
-        # Extract TÍTULO
-        titulo_match = re.search(r'\[TÍTULO\]\s*(.+?)(?=\n|\[|$)', block, re.IGNORECASE)
-        if titulo_match:
-            video_data['titulo'] = titulo_match.group(1).strip()
-        else:
-            continue  # Skip if no title
-        
-        # Extract DESCRIÇÃO
-        descricao_match = re.search(r'\[DESCRIÇÃO\]\s*(.+?)(?=\n\[|$)', block, re.IGNORECASE | re.DOTALL)
-        if descricao_match:
-            video_data['descricao'] = descricao_match.group(1).strip()
-        
-        # Extract ROTEIRO (multi-line)
-        roteiro_match = re.search(r'\[ROTEIRO\]\s*(.+?)(?=\n\[|$)', block, re.IGNORECASE | re.DOTALL)
-        if roteiro_match:
-            video_data['roteiro'] = roteiro_match.group(1).strip()
-        
-        # Extract URL
-        url_match = re.search(r'\[URL\]\s*(.+?)(?=\n|\[|$)', block, re.IGNORECASE)
-        if url_match:
-            video_data['url'] = url_match.group(1).strip()
-        
-        # Extract STATUS
-        status_match = re.search(r'\[STATUS\]\s*(.+?)(?=\n|\[|$)', block, re.IGNORECASE)
-        if status_match:
-            status_text = status_match.group(1).strip().lower()
-            # Normalize status
-            status_map = {
-                'planejado': 'planejado',
-                'em produção': 'em-producao',
-                'em producao': 'em-producao',
-                'em-producao': 'em-producao',
-                'em edição': 'em-edicao',
-                'em edicao': 'em-edicao',
-                'em-edicao': 'em-edicao',
-                'concluído': 'concluido',
-                'concluido': 'concluido'
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No videos found"
+        )
+    
+    await apply_counter_deltas(
+        db, current_user.id,
+        counter_deltas(removed=Counter(row.status for row in deleted)),
+        history_changed=True
+    )
+    await db.commit()
+    
+    return {"success": True, "deleted_count": len(deleted)}
+
+# ==================== IMPORT/EXPORT ====================
+
+async def import_video_stream(chunks, user_id: int, db: AsyncSession) -> ImportResponse:
+    """Parse videos as chunks arrive and insert them in fixed-size batches"""
+    errors = []
+    batches = []
+    imported_count = 0
+    
+    async for videos in batched(parse_video_stream(chunks), IMPORT_BATCH_SIZE):
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                **video_data,
+                "user_id": user_id,
+                "data_criacao": now,
+                "data_conclusao": now if video_data["status"] == "concluido" else None
             }
-            video_data['status'] = status_map.get(status_text, 'planejado')
-        else:
-            video_data['status'] = 'planejado'
+            for video_data in videos
+        ]
+        
+        # One executemany INSERT and one commit per batch
+        try:
+            await db.execute(insert(Video), rows)
+            await apply_counter_deltas(db, user_id, counter_deltas(added=Counter(row["status"] for row in rows)))
+            await db.commit()
+            batch_imported, batch_errors = len(rows), []
+        except Exception as e:
+            await db.rollback()
+            batch_imported = 0
+            batch_errors = [f"Error importing batch {len(batches) + 1} ('{rows[0]['titulo']}'...): {str(e)}"]
         
-        videos.append(video_data)
+        imported_count += batch_imported
+        errors.extend(batch_errors)
+        batches.append(ImportBatchReport(
+            batch=len(batches) + 1,
+            imported_count=batch_imported,
+            errors=batch_errors,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1)
+        ))
+        logger.info(f"Import batch {len(batches)}: {batch_imported}/{len(rows)} videos, {imported_count} so far")
+    
+    if not batches:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No valid videos found in the content"
+        )
     
-    return videos
+    return ImportResponse(
+        success=True,
+        imported_count=imported_count,
+        errors=errors,
+        batches=batches
+    )
 
 @api_router.post("/videos/import", response_model=ImportResponse)
 async def import_videos(
@@ -526,41 +756,13 @@ async def import_videos(
     db: AsyncSession = Depends(get_db)
 ):
     """Import videos from text format"""
+    async def content():
+        yield import_data.content
+    
     try:
-        parsed_videos = parse_video_text(import_data.content)
-        
-        if not parsed_videos:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No valid videos found in the content"
-            )
-        
-        errors = []
-        imported_count = 0
-        
-        for video_data in parsed_videos:
-            try:
-                new_video = Video(
-                    **video_data,
-                    user_id=current_user.id
-                )
-                
-                # Set data_conclusao if status is concluido
-                if new_video.status == "concluido":
-                    new_video.data_conclusao = datetime.now(timezone.utc)
-                
-                db.add(new_video)
-                imported_count += 1
-            except Exception as e:
-                errors.append(f"Error importing '{video_data.get('titulo', 'Unknown')}': {str(e)}")
-        
-        await db.commit()
-        
-        return ImportResponse(
-            success=True,
-            imported_count=imported_count,
-            errors=errors
-        )
+        return await import_video_stream(content(), current_user.id, db)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Import error: {str(e)}")
         raise HTTPException(
@@ -568,38 +770,23 @@ async def import_videos(
             detail=f"Error parsing content: {str(e)}"
         )
 
-@api_router.get("/videos/export")
-async def export_videos(
+@api_router.post("/videos/import/stream", response_model=ImportResponse)
+async def import_videos_stream(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Export all user videos to text format"""
-    result = await db.execute(
-        select(Video)
-        .where(Video.user_id == current_user.id)
-        .order_by(Video.data_criacao.desc())
-    )
-    videos = result.scalars().all()
-    
-    if not videos:
-        return {"content": ""}
-    
-    # Generate text content
-    lines = []
-    for video in videos:
-        lines.append(f"[TÍTULO] {video.titulo}")
-        if video.descricao:
-            lines.append(f"[DESCRIÇÃO] {video.descricao}")
-        if video.roteiro:
-            lines.append(f"[ROTEIRO] {video.roteiro}")
-        if video.url:
-            lines.append(f"[URL] {video.url}")
-        lines.append(f"[STATUS] {video.status}")
-        lines.append("")  # Empty line between videos
-    
-    content = "\n".join(lines)
-    
-    return {"content": content}
+    """Import videos from a raw text upload, parsed and inserted while it streams in"""
+    try:
+        return await import_video_stream(request.stream(), current_user.id, db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Import error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error parsing content: {str(e)}"
+        )
 
 # Include router in app
 app.include_router(api_router)
@@ -608,3 +795,8 @@ app.include_router(api_router)
 @app.get("/")
 async def root():
     return {"message": "VideoFlow API is running", "version": "1.0.0"}
+
+@app.get(METRICS_PATH, include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus scrape endpoint"""
+    return metrics_response(request, [group_commit_metrics])
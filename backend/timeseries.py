@@ -0,0 +1,57 @@
+# Created/completed videos per day, week or month (shared by both backends)
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
+
+from schemas import TimeseriesBucket, TimeseriesResponse
+
+INTERVALS = ("day", "week", "month")
+
+# A bucket is rolled up only this long after it ended, so a write stamped just
+# before the boundary but committed just after it still lands in the live query
+ROLLUP_DELAY = timedelta(seconds=int(os.environ.get("TIMESERIES_ROLLUP_DELAY_SECONDS", "60")))
+
+# Weeks start on Monday; 1970-01-05 was the first Monday after the epoch
+WEEK_ORIGIN = datetime(1970, 1, 5)
+
+def utc_now() -> datetime:
+    """Now as a naive UTC datetime, like the stored dates"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def bucket_start(moment: datetime, interval: str) -> datetime:
+    """Start of the bucket containing moment"""
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    return day
+
+def next_bucket(start: datetime, interval: str) -> datetime:
+    """Start of the bucket after the one starting at start"""
+    if interval == "week":
+        return start + timedelta(weeks=1)
+    if interval == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+def closed_until(interval: str, now: Optional[datetime] = None) -> datetime:
+    """Buckets starting before this are closed and can be rolled up"""
+    return bucket_start((now or utc_now()) - ROLLUP_DELAY, interval)
+
+def timeseries_response(interval: str, counts: Iterable[Tuple[datetime, int, int]]) -> TimeseriesResponse:
+    """Series from (bucket start, created, completed) rows, empty buckets in between filled with zeros"""
+    by_start: Dict[datetime, Tuple[int, int]] = {}
+    for start, created, completed in counts:
+        previous_created, previous_completed = by_start.get(start, (0, 0))
+        by_start[start] = (previous_created + created, previous_completed + completed)
+    
+    buckets: List[TimeseriesBucket] = []
+    if by_start:
+        start, last = min(by_start), max(by_start)
+        while start <= last:
+            created, completed = by_start.get(start, (0, 0))
+            buckets.append(TimeseriesBucket(start=start, created=created, completed=completed))
+            start = next_bucket(start, interval)
+    
+    return TimeseriesResponse(interval=interval, buckets=buckets)
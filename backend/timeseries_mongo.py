@@ -0,0 +1,121 @@
+# Time series of created/completed videos with incremental rollups for the MongoDB backend
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from counters_mongo import get_history_version
+from database import db, videos_collection
+from schemas import TimeseriesResponse
+from timeseries import WEEK_ORIGIN, closed_until, timeseries_response
+
+# One document per closed bucket: {user_id, interval, start, created, completed}
+rollups_collection = db.video_rollups
+
+# One document per user and interval: {_id: "<user_id>:<interval>", rolled_until, history_version}
+rollup_state_collection = db.video_rollup_state
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+def bucket_expression(interval: str, date: str) -> dict:
+    """Bucket start of a date field (plain date arithmetic, so it runs on servers without $dateTrunc)"""
+    if interval == "month":
+        return {"$dateFromParts": {"year": {"$year": date}, "month": {"$month": date}}}
+    
+    origin, size = (WEEK_ORIGIN, 7 * DAY_MS) if interval == "week" else (datetime(1970, 1, 1), DAY_MS)
+    return {"$subtract": [date, {"$mod": [{"$subtract": [date, origin]}, size]}]}
+
+def date_range(start: Optional[datetime], end: Optional[datetime]) -> dict:
+    bounds = {"$ne": None}
+    if start is not None:
+        bounds["$gte"] = start
+    if end is not None:
+        bounds["$lt"] = end
+    return bounds
+
+async def count_buckets(
+    user_id: str,
+    interval: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[Tuple[datetime, int, int]]:
+    """(bucket start, created, completed) in [start, end), from one $group over both dates"""
+    bounds = date_range(start, end)
+    pipeline = [
+        {"$match": {
+            "user_id": user_id,
+            "$or": [{"data_criacao": bounds}, {"data_conclusao": bounds}]
+        }},
+        # Each video yields a creation (kind 0) and a completion (kind 1) event
+        {"$project": {"_id": 0, "data_criacao": 1, "data_conclusao": 1, "kind": {"$literal": [0, 1]}}},
+        {"$unwind": "$kind"},
+        {"$project": {
+            "kind": 1,
+            "date": {"$cond": [{"$eq": ["$kind", 0]}, "$data_criacao", "$data_conclusao"]}
+        }},
+        {"$match": {"date": bounds}},
+        {"$group": {
+            "_id": bucket_expression(interval, "$date"),
+            "created": {"$sum": {"$cond": [{"$eq": ["$kind", 0]}, 1, 0]}},
+            "completed": {"$sum": {"$cond": [{"$eq": ["$kind", 1]}, 1, 0]}}
+        }}
+    ]
+    return [
+        (bucket["_id"], bucket["created"], bucket["completed"])
+        async for bucket in videos_collection.aggregate(pipeline)
+    ]
+
+async def load_rollup(user_id: str, interval: str, until: datetime) -> List[Tuple[datetime, int, int]]:
+    # Bounded by `until` so a bucket a concurrent request rolled further isn't also counted live
+    return [
+        (bucket["start"], bucket["created"], bucket["completed"])
+        async for bucket in rollups_collection.find(
+            {"user_id": user_id, "interval": interval, "start": {"$lt": until}},
+            {"_id": 0, "start": 1, "created": 1, "completed": 1}
+        )
+    ]
+
+async def extend_rollup(user_id: str, interval: str, state: Optional[dict], history_version: int, until: datetime) -> None:
+    """Roll closed buckets up to `until`.
+    
+    Only buckets past the stored state are counted, unless the history changed
+    since the rollup was built, in which case it is rebuilt from scratch.
+    Buckets are $set (never $inc), so concurrent refreshes converge.
+    """
+    rolled_from = None
+    if state is not None and state["history_version"] == history_version:
+        rolled_from = state["rolled_until"]
+    else:
+        await rollups_collection.delete_many({"user_id": user_id, "interval": interval})
+    
+    counts = await count_buckets(user_id, interval, rolled_from, until)
+    if counts:
+        from pymongo import UpdateOne
+        await rollups_collection.bulk_write([
+            UpdateOne(
+                {"user_id": user_id, "interval": interval, "start": start},
+                {"$set": {"created": created, "completed": completed}},
+                upsert=True
+            )
+            for start, created, completed in counts
+        ], ordered=False)
+    
+    await rollup_state_collection.update_one(
+        {"_id": f"{user_id}:{interval}"},
+        {"$set": {"rolled_until": until, "history_version": history_version}},
+        upsert=True
+    )
+
+async def get_timeseries(user_id: str, interval: str) -> TimeseriesResponse:
+    """Closed buckets from the rollup (extended first when behind), open ones counted live"""
+    until = closed_until(interval)
+    history_version = await get_history_version(user_id)
+    
+    state = await rollup_state_collection.find_one({"_id": f"{user_id}:{interval}"})
+    if state is not None and state["history_version"] == history_version and state["rolled_until"] >= until:
+        rolled_until = state["rolled_until"]
+    else:
+        await extend_rollup(user_id, interval, state, history_version, until)
+        rolled_until = until
+    
+    rollup = await load_rollup(user_id, interval, rolled_until)
+    live = await count_buckets(user_id, interval, start=rolled_until)
+    return timeseries_response(interval, [*rollup, *live])
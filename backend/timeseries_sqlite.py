@@ -0,0 +1,134 @@
+# Time series of created/completed videos with incremental rollups for the SQLite backend
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, delete, func, literal, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from counters_sqlite import get_history_version
+from database_sqlite import AsyncSessionLocal
+from models_sqlite import Video, VideoRollup, VideoRollupState
+from schemas import TimeseriesResponse
+from timeseries import closed_until, timeseries_response
+
+# Bucket start (YYYY-MM-DD) of a stored datetime; 'weekday 1' moves forward to
+# the next Monday, so going back 6 days first lands on the Monday on or before
+BUCKET_EXPRESSIONS = {
+    "day": lambda column: func.date(column),
+    "week": lambda column: func.date(column, "-6 days", "weekday 1"),
+    "month": lambda column: func.date(column, "start of month"),
+}
+
+def in_range(column, start: Optional[datetime], end: Optional[datetime]):
+    conditions = [column.is_not(None)]
+    if start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column < end)
+    return conditions
+
+async def count_buckets(
+    db: AsyncSession,
+    user_id: int,
+    interval: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[Tuple[datetime, int, int]]:
+    """(bucket start, created, completed) in [start, end), from one GROUP BY over both dates"""
+    bucket = BUCKET_EXPRESSIONS[interval]
+    events = union_all(
+        select(bucket(Video.data_criacao).label("bucket"), literal(1).label("created"), literal(0).label("completed"))
+        .where(Video.user_id == user_id, *in_range(Video.data_criacao, start, end)),
+        select(bucket(Video.data_conclusao), literal(0), literal(1))
+        .where(Video.user_id == user_id, *in_range(Video.data_conclusao, start, end)),
+    ).subquery()
+    
+    result = await db.execute(
+        select(events.c.bucket, func.sum(events.c.created), func.sum(events.c.completed))
+        .group_by(events.c.bucket)
+    )
+    return [(datetime.fromisoformat(day), created, completed) for day, created, completed in result.all()]
+
+async def load_rollup(db: AsyncSession, user_id: int, interval: str, until: datetime) -> List[Tuple[datetime, int, int]]:
+    # Bounded by `until` so a bucket a concurrent request rolled further isn't also counted live
+    result = await db.execute(
+        select(VideoRollup.bucket_start, VideoRollup.created, VideoRollup.completed)
+        .where(
+            VideoRollup.user_id == user_id,
+            VideoRollup.interval == interval,
+            VideoRollup.bucket_start < until
+        )
+    )
+    return result.all()
+
+async def extend_rollup(
+    user_id: int,
+    interval: str,
+    history_version: int,
+    until: datetime
+) -> Tuple[List[Tuple[datetime, int, int]], datetime]:
+    """Roll closed buckets up to `until` in a short writer session; returns the
+    whole rollup and the date it reaches.
+    
+    Only buckets past the stored state are counted, unless the history changed
+    since the rollup was built, in which case it is rebuilt from scratch.
+    """
+    async with AsyncSessionLocal() as writer:
+        # Re-read under the write lock: a concurrent request may have extended it already
+        state = await writer.get(VideoRollupState, (user_id, interval))
+        rolled_from = None
+        if state is not None and state.history_version == history_version:
+            rolled_from = state.rolled_until
+        else:
+            await writer.execute(
+                delete(VideoRollup).where(VideoRollup.user_id == user_id, VideoRollup.interval == interval)
+            )
+        
+        rolled_until = max(rolled_from or until, until)
+        if rolled_from is None or rolled_from < until:
+            counts = await count_buckets(writer, user_id, interval, rolled_from, until)
+            if counts:
+                stmt = sqlite_insert(VideoRollup)
+                # One executemany: a long day series would overflow a multi-row VALUES
+                await writer.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=[VideoRollup.user_id, VideoRollup.interval, VideoRollup.bucket_start],
+                        set_={"created": stmt.excluded.created, "completed": stmt.excluded.completed}
+                    ),
+                    [
+                        {"user_id": user_id, "interval": interval, "bucket_start": start, "created": created, "completed": completed}
+                        for start, created, completed in counts
+                    ]
+                )
+            
+            stmt = sqlite_insert(VideoRollupState).values(
+                user_id=user_id, interval=interval, rolled_until=until, history_version=history_version
+            )
+            await writer.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[VideoRollupState.user_id, VideoRollupState.interval],
+                    set_={"rolled_until": stmt.excluded.rolled_until, "history_version": stmt.excluded.history_version}
+                )
+            )
+        
+        rollup = await load_rollup(writer, user_id, interval, rolled_until)
+        await writer.commit()
+        return rollup, rolled_until
+
+async def get_timeseries(db: AsyncSession, user_id: int, interval: str) -> TimeseriesResponse:
+    """Closed buckets from the rollup (extended first when behind), open ones counted live"""
+    until = closed_until(interval)
+    history_version = await get_history_version(db, user_id)
+    
+    state = await db.get(VideoRollupState, (user_id, interval))
+    if state is not None and state.history_version == history_version and state.rolled_until >= until:
+        rolled_until = state.rolled_until
+        rollup = await load_rollup(db, user_id, interval, rolled_until)
+    else:
+        # This read session's snapshot predates the writer's commit, so the
+        # rollup comes back from the writer session
+        rollup, rolled_until = await extend_rollup(user_id, interval, history_version, until)
+    
+    live = await count_buckets(db, user_id, interval, start=rolled_until)
+    return timeseries_response(interval, [*rollup, *live])
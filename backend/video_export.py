@@ -0,0 +1,126 @@
+# Export formats for analytics (NDJSON, CSV, Parquet), streamed in batches (both backends)
+from typing import AsyncIterable, AsyncIterator, Mapping
+import asyncio
+import csv
+import io
+import os
+
+from json_response import dump_json
+from video_text import EXPORT_BATCH_SIZE, batched, stream_video_text
+
+# Columns of the row/columnar formats (the text format keeps its own tags)
+EXPORT_FIELDS = ("id", "titulo", "descricao", "roteiro", "url", "status", "data_criacao", "data_conclusao")
+DATE_FIELDS = ("data_criacao", "data_conclusao")
+DATE_INDEXES = tuple(EXPORT_FIELDS.index(field) for field in DATE_FIELDS)
+
+PARQUET_COMPRESSION = os.environ.get("PARQUET_COMPRESSION", "zstd")
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "text": ("text/plain; charset=utf-8", "txt"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+async def stream_ndjson(videos: AsyncIterable[Mapping], batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[bytes]:
+    """One JSON object per line, one chunk per batch"""
+    async for batch in batched(videos, batch_size):
+        yield b"".join(
+            dump_json({field: video.get(field) for field in EXPORT_FIELDS}) + b"\n" for video in batch
+        )
+
+def csv_row(video: Mapping) -> list:
+    row = [video.get(field) for field in EXPORT_FIELDS]
+    # Same ISO 8601 UTC dates as the JSON formats (str() would use a space separator)
+    for index in DATE_INDEXES:
+        if row[index] is not None:
+            row[index] = dump_json(row[index])[1:-1].decode()
+    return row
+
+async def stream_csv(videos: AsyncIterable[Mapping], batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    """Header row, then one chunk of rows per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    
+    async for batch in batched(videos, batch_size):
+        writer.writerows(map(csv_row, batch))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    # Nothing to export: still send the header
+    if buffer.tell():
+        yield buffer.getvalue()
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file handing out what was written so far; tell() keeps the
+    absolute offset the Parquet footer refers to"""
+    
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def parquet_schema(pa, integer_ids: bool):
+    return pa.schema(
+        [("id", pa.int64() if integer_ids else pa.string())]
+        + [(field, pa.string()) for field in ("titulo", "descricao", "roteiro", "url", "status")]
+        + [(field, pa.timestamp("us", tz="UTC")) for field in DATE_FIELDS]
+    )
+
+async def stream_parquet(videos: AsyncIterable[Mapping], batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[bytes]:
+    """One row group per batch, built from column arrays; the footer comes last"""
+    # Heavy imports, only paid by the requests that need them
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    sink = ChunkSink()
+    writer = None
+    
+    async for batch in batched(videos, batch_size):
+        frame = pd.DataFrame({field: [video.get(field) for video in batch] for field in EXPORT_FIELDS})
+        # Stored dates are naive UTC
+        for field in DATE_FIELDS:
+            frame[field] = pd.to_datetime(frame[field], utc=True)
+        
+        if writer is None:
+            schema = parquet_schema(pa, pd.api.types.is_integer_dtype(frame["id"]))
+            writer = pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+        
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        # Encoding and compression are CPU-bound: keep them off the event loop
+        await asyncio.to_thread(writer.write_table, table)
+        yield sink.drain()
+    
+    if writer is None:
+        writer = pq.ParquetWriter(sink, parquet_schema(pa, integer_ids=False), compression=PARQUET_COMPRESSION)
+    writer.close()
+    yield sink.drain()
+
+def stream_export(videos: AsyncIterable[Mapping], export_format: str) -> AsyncIterator:
+    """Body stream of an export in the requested format"""
+    if export_format == "ndjson":
+        return stream_ndjson(videos)
+    if export_format == "csv":
+        return stream_csv(videos)
+    if export_format == "parquet":
+        return stream_parquet(videos)
+    return stream_video_text(videos)
@@ -0,0 +1,179 @@
+# Plain-text video format used by import/export ([TÍTULO] ... [STATUS] blocks)
+from typing import AsyncIterable, AsyncIterator, Iterator, List, Mapping, Optional, TypeVar, Union
+import codecs
+import re
+
+# Every video block starts with this marker
+TITLE_MARKER = "[TÍTULO]"
+
+# Videos rendered per chunk of a streamed export
+EXPORT_BATCH_SIZE = 500
+
+# Videos inserted per batch of an import
+IMPORT_BATCH_SIZE = 500
+
+T = TypeVar("T")
+
+# Tags as the old per-field regexes matched them (case-insensitive); the
+# named group says which field a tag sets
+TAG_PATTERN = re.compile(
+    r'\[(?:(?P<titulo>TÍTULO)|(?P<descricao>DESCRIÇÃO)|(?P<roteiro>ROTEIRO)|(?P<url>URL)|(?P<status>STATUS))\]',
+    re.IGNORECASE
+)
+WHITESPACE_PATTERN = re.compile(r'\s*')
+
+# These run until the next "\n[" instead of the end of the line
+MULTILINE_FIELDS = frozenset({"descricao", "roteiro"})
+
+# Key order of the parsed dicts (status is always set last)
+VIDEO_FIELDS = ("titulo", "descricao", "roteiro", "url")
+
+STATUS_MAP = {
+    'planejado': 'planejado',
+    'em produção': 'em-producao',
+    'em producao': 'em-producao',
+    'em-producao': 'em-producao',
+    'em edição': 'em-edicao',
+    'em edicao': 'em-edicao',
+    'em-edicao': 'em-edicao',
+    'concluído': 'concluido',
+    'concluido': 'concluido'
+}
+
+def _tag_value(content: str, field: str, start: int, end: int) -> Optional[str]:
+    """Value following a tag that ends at `start` in the block ending at `end` (None when there is none)"""
+    value_start = WHITESPACE_PATTERN.match(content, start, end).end()
+    
+    if value_start == end:
+        # Only whitespace left in the block: still an (empty) value unless
+        # a single-line field has nothing but newlines after it
+        tail = content[start:end]
+        if field in MULTILINE_FIELDS:
+            return "" if tail else None
+        return "" if tail.strip("\n") else None
+    
+    if field in MULTILINE_FIELDS:
+        value_end = content.find("\n[", value_start + 1, end)
+        if value_end == -1:
+            value_end = end
+    else:
+        value_end = content.find("\n", value_start + 1, end)
+        if value_end == -1:
+            value_end = end
+        bracket = content.find("[", value_start + 1, value_end)
+        if bracket != -1:
+            value_end = bracket
+    
+    return content[value_start:value_end].strip()
+
+def _build_video(content: str, tags: List[tuple], end: int) -> Optional[dict]:
+    """Video dict from the tags seen in one block (None when it has no title)"""
+    values = {}
+    for field, start in tags:
+        # The first tag of each kind that has a value wins
+        if field not in values:
+            value = _tag_value(content, field, start, end)
+            if value is not None:
+                values[field] = value
+    
+    if "titulo" not in values:
+        return None  # Skip if no title
+    
+    video_data = {field: values[field] for field in VIDEO_FIELDS if field in values}
+    status_text = values.get("status")
+    video_data["status"] = STATUS_MAP.get(status_text.lower(), "planejado") if status_text is not None else "planejado"
+    return video_data
+
+def iter_video_text(content: str) -> Iterator[dict]:
+    """Parse videos from text format in a single pass, yielding them as each block ends"""
+    # Blocks start at every exact [TÍTULO]; the text before the first one is a block too
+    block_start = 0
+    tags = []
+    
+    for match in TAG_PATTERN.finditer(content):
+        if match.group() == TITLE_MARKER and match.start() > block_start:
+            video = _build_video(content, tags, match.start())
+            if video:
+                yield video
+            block_start = match.start()
+            tags = []
+        tags.append((match.lastgroup, match.end()))
+    
+    video = _build_video(content, tags, len(content))
+    if video:
+        yield video
+
+def parse_video_block(block: str) -> Optional[dict]:
+    """Parse one [TÍTULO] block (None when it has no title)"""
+    return next(iter_video_text(block), None)
+
+def parse_video_text(content: str) -> List[dict]:
+    """Parse video data from text format"""
+    return list(iter_video_text(content))
+
+async def iter_video_blocks(chunks: AsyncIterable[Union[bytes, str]]) -> AsyncIterator[str]:
+    """Split a streamed upload into [TÍTULO] blocks as the chunks arrive"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    scan_from = 1  # A block is complete once the *next* marker shows up
+    
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        
+        start = buffer.find(TITLE_MARKER, scan_from)
+        while start != -1:
+            yield buffer[:start]
+            buffer = buffer[start:]
+            start = buffer.find(TITLE_MARKER, 1)
+        
+        # Only rescan the tail where a marker split across chunks could start
+        scan_from = max(1, len(buffer) - len(TITLE_MARKER) + 1)
+    
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+async def parse_video_stream(chunks: AsyncIterable[Union[bytes, str]]) -> AsyncIterator[dict]:
+    """Parse videos incrementally from a streamed upload"""
+    async for block in iter_video_blocks(chunks):
+        video = parse_video_block(block)
+        if video:
+            yield video
+
+async def batched(items: AsyncIterable[T], size: int) -> AsyncIterator[List[T]]:
+    """Group an async stream into lists of at most `size` items"""
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    
+    if batch:
+        yield batch
+
+def format_video_block(video: Mapping) -> str:
+    """Render one video as a text block (trailing newline included)"""
+    lines = [f"[TÍTULO] {video['titulo']}"]
+    if video.get("descricao"):
+        lines.append(f"[DESCRIÇÃO] {video['descricao']}")
+    if video.get("roteiro"):
+        lines.append(f"[ROTEIRO] {video['roteiro']}")
+    if video.get("url"):
+        lines.append(f"[URL] {video['url']}")
+    lines.append(f"[STATUS] {video['status']}")
+    return "\n".join(lines) + "\n"
+
+async def stream_video_text(videos: AsyncIterable[Mapping], batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    """Render videos incrementally, one chunk per batch, blank line between blocks"""
+    chunk = []
+    first = True
+    async for video in videos:
+        chunk.append(format_video_block(video) if first else "\n" + format_video_block(video))
+        first = False
+        if len(chunk) >= batch_size:
+            yield "".join(chunk)
+            chunk = []
+    
+    if chunk:
+        yield "".join(chunk)
@@ -7,7 +7,7 @@ Tests all authentication, CRUD, bulk operations, and import/export functionality
 import requests
 import sys
 import json
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 
 class VideoFlowAPITester:
@@ -196,6 +196,34 @@ class VideoFlowAPITester:
             self.log_test("Get Single Video", False, f"- {details}")
             return False
 
+    def test_video_datetimes_consistent(self):
+        """Test that a created video serializes its dates like its listed forms"""
+        success, created, details = self.make_request('POST', 'videos', {"titulo": "Datas Consistentes", "status": "concluido"}, 201)
+        if not success:
+            self.log_test("Datetimes Consistent", False, f"- {details}")
+            return False
+        self.created_video_ids.append(created['id'])
+
+        _, single, _ = self.make_request('GET', f"videos/{created['id']}")
+        _, listed, _ = self.make_request('GET', 'videos')
+        _, page, _ = self.make_request('GET', 'videos/page')
+        forms = {
+            "get": single,
+            "list": next((v for v in listed if v.get('id') == created['id']), {}),
+            "page": next((v for v in page.get('items', []) if v.get('id') == created['id']), {}),
+        }
+
+        mismatches = [
+            f"{name}.{field}={video.get(field)!r}"
+            for name, video in forms.items()
+            for field in ("data_criacao", "data_conclusao")
+            if video.get(field) != created[field]
+        ]
+        utc = created['data_criacao'].endswith('Z') and created['data_conclusao'].endswith('Z')
+        success = utc and not mismatches
+        self.log_test("Datetimes Consistent", success, f"- created: {created['data_criacao']} {' '.join(mismatches)}")
+        return success
+
     def test_video_update(self):
         """Test updating a video"""
         if not self.created_video_ids:
@@ -278,6 +306,29 @@ class VideoFlowAPITester:
             self.log_test("Bulk Update", False, f"- {details}")
             return False
 
+    def test_bulk_complete_keeps_date(self):
+        """Test that bulk-completing an already completed video keeps its completion date"""
+        success, created, details = self.make_request('POST', 'videos', {"titulo": "Concluído no Passado"}, 201)
+        if not success:
+            self.log_test("Bulk Complete Keeps Date", False, f"- {details}")
+            return False
+        self.created_video_ids.append(created['id'])
+
+        past = (datetime.now(timezone.utc) - timedelta(days=10)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        _, completed, _ = self.make_request('PUT', f"videos/{created['id']}", {"status": "concluido", "data_conclusao": past})
+        _, before, _ = self.make_request('GET', 'videos/timeseries')
+
+        success, _, details = self.make_request('POST', 'videos/bulk-update', {"video_ids": [created['id']], "status": "concluido"})
+        _, after, _ = self.make_request('GET', 'videos/timeseries')
+        _, video, _ = self.make_request('GET', f"videos/{created['id']}")
+
+        completed_before = sum(bucket['completed'] for bucket in before.get('buckets', []))
+        completed_after = sum(bucket['completed'] for bucket in after.get('buckets', []))
+        kept = video.get('data_conclusao') == completed.get('data_conclusao') == past
+        success = success and kept and completed_after == completed_before
+        self.log_test("Bulk Complete Keeps Date", success, f"- data_conclusao: {video.get('data_conclusao')}, completed: {completed_before} -> {completed_after}")
+        return success
+
     def test_import_videos(self):
         """Test video import functionality"""
         import_content = """[TÍTULO] Vídeo Importado 1
@@ -304,15 +355,20 @@ do vídeo importado
 
     def test_export_videos(self):
         """Test video export functionality"""
-        success, response, details = self.make_request('GET', 'videos/export')
+        # The export is streamed as plain text, not JSON
+        try:
+            response = requests.get(f"{self.base_url}/videos/export", headers={'Authorization': f'Bearer {self.token}'})
+        except requests.exceptions.RequestException as e:
+            self.log_test("Export Videos", False, f"- Request error: {str(e)}")
+            return False
         
-        if success and 'content' in response:
-            content_length = len(response['content'])
-            has_content = content_length > 0
+        if response.status_code == 200 and response.headers.get('content-type', '').startswith('text/plain'):
+            content_length = len(response.text)
+            has_content = '[TÍTULO]' in response.text
             self.log_test("Export Videos", has_content, f"- Content length: {content_length}")
             return has_content
         else:
-            self.log_test("Export Videos", False, f"- {details}")
+            self.log_test("Export Videos", False, f"- Status: {response.status_code}")
             return False
 
     def test_video_stats_with_data(self):
@@ -389,6 +445,7 @@ do vídeo importado
         self.test_video_get_all()
         self.test_video_get_count()
         self.test_video_get_one()
+        self.test_video_datetimes_consistent()
         self.test_video_update()
         
         # Search and Filter Tests
@@ -400,6 +457,7 @@ do vídeo importado
         # Bulk Operations Tests
         print("\n📦 Bulk Operations Tests")
         self.test_bulk_update()
+        self.test_bulk_complete_keeps_date()
         
         # Import/Export Tests
         print("\n📤 Import/Export Tests")
@@ -425,7 +483,8 @@ do vídeo importado
 
 def main():
     """Main test execution"""
-    tester = VideoFlowAPITester()
+    # Optional base URL (e.g. http://localhost:8001/api) instead of the preview deployment
+    tester = VideoFlowAPITester(*sys.argv[1:2])
     
     try:
         success = tester.run_all_tests()
@@ -49,14 +49,18 @@ export const authAPI = {
 export const videosAPI = {
   getAll: (params) => api.get('/videos', { params }),
   getCount: (params) => api.get('/videos/count', { params }),
+  getPage: (params) => api.get('/videos/page', { params }),
   getOne: (id) => api.get(`/videos/${id}`),
   create: (data) => api.post('/videos', data),
   update: (id, data) => api.put(`/videos/${id}`, data),
   delete: (id) => api.delete(`/videos/${id}`),
   bulkUpdate: (data) => api.post('/videos/bulk-update', data),
   bulkDelete: (data) => api.post('/videos/bulk-delete', data),
+  bulkUpdateByFilter: (params, data) => api.post('/videos/bulk-update/by-filter', data, { params }),
+  bulkDeleteByFilter: (params) => api.post('/videos/bulk-delete/by-filter', null, { params }),
   import: (data) => api.post('/videos/import', data),
-  export: () => api.get('/videos/export'),
+  importFile: (file) => api.post('/videos/import/stream', file, { headers: { 'Content-Type': 'text/plain' } }),
+  export: () => api.get('/videos/export', { responseType: 'blob' }),
   getStats: () => api.get('/videos/stats'),
 };
 
@@ -1,7 +1,14 @@
 import React, { useState } from 'react';
 import { X, ChevronDown } from 'lucide-react';
 
-export default function BulkActionBar({ selectedCount, onAction, onClear }) {
+export default function BulkActionBar({
+  selectedCount,
+  totalCount,
+  allMatchingSelected,
+  onSelectAllMatching,
+  onAction,
+  onClear,
+}) {
   const [showDropdown, setShowDropdown] = useState(false);
 
   const handleStatusChange = (status) => {
@@ -19,6 +26,15 @@ export default function BulkActionBar({ selectedCount, onAction, onClear }) {
           <span className="text-sm font-medium text-slate-700">
             {selectedCount === 1 ? '1 vídeo selecionado' : `${selectedCount} vídeos selecionados`}
           </span>
+          {!allMatchingSelected && totalCount > selectedCount && (
+            <button
+              onClick={onSelectAllMatching}
+              data-testid="bulk-select-all-matching"
+              className="text-sm font-medium text-[#4a5568] underline hover:text-slate-900 transition-colors"
+            >
+              Selecionar todos os {totalCount}
+            </button>
+          )}
         </div>
 
         <div className="h-6 w-px bg-slate-200"></div>
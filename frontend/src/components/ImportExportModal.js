@@ -6,6 +6,7 @@ import { X, Upload, Download, FileText, Type } from 'lucide-react';
 export default function ImportExportModal({ onClose, onImportSuccess }) {
   const [activeTab, setActiveTab] = useState('import');
   const [importText, setImportText] = useState('');
+  const [importFile, setImportFile] = useState(null);
   const [loading, setLoading] = useState(false);
   const fileInputRef = React.useRef(null);
 
@@ -17,7 +18,10 @@ export default function ImportExportModal({ onClose, onImportSuccess }) {
 
     setLoading(true);
     try {
-      const response = await videosAPI.import({ content: importText });
+      // Uploaded files are sent as-is so the server can parse them while they stream in
+      const response = importFile
+        ? await videosAPI.importFile(importFile)
+        : await videosAPI.import({ content: importText });
       const { imported_count, errors } = response.data;
       
       if (errors.length > 0) {
@@ -28,6 +32,7 @@ export default function ImportExportModal({ onClose, onImportSuccess }) {
       }
       
       setImportText('');
+      setImportFile(null);
       onImportSuccess();
       onClose();
     } catch (error) {
@@ -45,6 +50,7 @@ export default function ImportExportModal({ onClose, onImportSuccess }) {
     const reader = new FileReader();
     reader.onload = (event) => {
       setImportText(event.target.result);
+      setImportFile(file);
       toast.success('Arquivo carregado com sucesso!');
     };
     reader.onerror = () => {
@@ -56,16 +62,16 @@ export default function ImportExportModal({ onClose, onImportSuccess }) {
   const handleExport = async () => {
     setLoading(true);
     try {
+      // The export is streamed as a text/plain file
       const response = await videosAPI.export();
-      const { content } = response.data;
+      const blob = response.data;
 
-      if (!content) {
+      if (!blob.size) {
         toast.error('Nenhum vídeo para exportar');
         return;
       }
 
-      // Create and download file
-      const blob = new Blob([content], { type: 'text/plain' });
+      // Download file
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement('a');
       a.href = url;
@@ -192,7 +198,10 @@ com múltiplas linhas
                 </label>
                 <textarea
                   value={importText}
-                  onChange={(e) => setImportText(e.target.value)}
+                  onChange={(e) => {
+                    setImportText(e.target.value);
+                    setImportFile(null);
+                  }}
                   placeholder="Cole o conteúdo aqui..."
                   rows={12}
                   data-testid="import-textarea"
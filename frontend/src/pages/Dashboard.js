@@ -31,6 +31,7 @@ export default function Dashboard({ setIsAuthenticated }) {
   
   // Selection
   const [selectedVideos, setSelectedVideos] = useState([]);
+  const [allMatchingSelected, setAllMatchingSelected] = useState(false);
   const [showFilters, setShowFilters] = useState(false);
 
   const user = JSON.parse(localStorage.getItem('user') || '{}');
@@ -45,6 +46,11 @@ export default function Dashboard({ setIsAuthenticated }) {
     loadVideos();
   }, [searchQuery, statusFilter, timeFilter, currentPage, itemsPerPage]);
 
+  // "All matching" refers to the filters it was chosen under
+  useEffect(() => {
+    setAllMatchingSelected(false);
+  }, [searchQuery, statusFilter, timeFilter]);
+
   const loadStats = async () => {
     try {
       const response = await videosAPI.getStats();
@@ -54,25 +60,27 @@ export default function Dashboard({ setIsAuthenticated }) {
     }
   };
 
+  const getFilterParams = () => {
+    const params = {};
+    if (searchQuery) params.search = searchQuery;
+    if (statusFilter) params.status_filter = statusFilter;
+    if (timeFilter) params.time_filter = timeFilter;
+    return params;
+  };
+
   const loadVideos = async () => {
     setLoading(true);
     try {
       const params = {
         skip: (currentPage - 1) * itemsPerPage,
         limit: itemsPerPage,
+        ...getFilterParams(),
       };
-      
-      if (searchQuery) params.search = searchQuery;
-      if (statusFilter) params.status_filter = statusFilter;
-      if (timeFilter) params.time_filter = timeFilter;
 
-      const [videosResponse, countResponse] = await Promise.all([
-        videosAPI.getAll(params),
-        videosAPI.getCount(params),
-      ]);
+      const response = await videosAPI.getPage(params);
 
-      setVideos(videosResponse.data);
-      setTotalCount(countResponse.data.count);
+      setVideos(response.data.items);
+      setTotalCount(response.data.total);
     } catch (error) {
       toast.error('Erro ao carregar vídeos');
     } finally {
@@ -131,11 +139,24 @@ export default function Dashboard({ setIsAuthenticated }) {
 
   const handleClearSelection = () => {
     setSelectedVideos([]);
+    setAllMatchingSelected(false);
   };
 
   const handleBulkAction = async (action, value) => {
     try {
-      if (action === 'delete') {
+      // Everything matching the filters is changed server-side, no ids sent
+      if (allMatchingSelected) {
+        const params = getFilterParams();
+        if (action === 'delete') {
+          const preview = await videosAPI.bulkDeleteByFilter({ ...params, dry_run: true });
+          if (!window.confirm(`Excluir ${preview.data.matched_count} vídeo(s)?`)) return;
+          await videosAPI.bulkDeleteByFilter(params);
+          toast.success('Vídeos excluídos com sucesso');
+        } else if (action === 'status') {
+          await videosAPI.bulkUpdateByFilter(params, { status: value });
+          toast.success('Status atualizado com sucesso');
+        }
+      } else if (action === 'delete') {
         if (!window.confirm(`Excluir ${selectedVideos.length} vídeo(s)?`)) return;
         await videosAPI.bulkDelete({ video_ids: selectedVideos });
         toast.success('Vídeos excluídos com sucesso');
@@ -145,6 +166,7 @@ export default function Dashboard({ setIsAuthenticated }) {
       }
       
       setSelectedVideos([]);
+      setAllMatchingSelected(false);
       loadVideos();
       loadStats();
     } catch (error) {
@@ -424,9 +446,12 @@ export default function Dashboard({ setIsAuthenticated }) {
       )}
 
       {/* Bulk Action Bar */}
-      {selectedVideos.length > 0 && (
+      {(selectedVideos.length > 0 || allMatchingSelected) && (
         <BulkActionBar
-          selectedCount={selectedVideos.length}
+          selectedCount={allMatchingSelected ? totalCount : selectedVideos.length}
+          totalCount={totalCount}
+          allMatchingSelected={allMatchingSelected}
+          onSelectAllMatching={() => setAllMatchingSelected(true)}
           onAction={handleBulkAction}
           onClear={handleClearSelection}
         />
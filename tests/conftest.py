@@ -0,0 +1,12 @@
+# Shared setup for the backend tests: backend modules import flat (as from backend/),
+# and the SQLite backend runs on a throwaway database, never backend/videoflow.db
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(BACKEND_DIR / "benchmarks"))
+os.environ.setdefault("SQLITE_DATABASE_PATH", str(Path(tempfile.mkdtemp()) / "tests.db"))
@@ -0,0 +1,89 @@
+# Bulk-completing videos keeps the completion date of those already completed
+#
+# Runs against the SQLite backend, and against MongoDB too when TEST_MONGO_URL
+# points at a server (a throwaway database is created and dropped).
+#
+# Usage (from the repository root): python -m pytest tests/test_bulk_completion.py
+import asyncio
+import importlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from endpoints import prepare_user
+
+TEST_MONGO_URL = os.environ.get("TEST_MONGO_URL")
+
+@pytest.fixture(params=["sqlite", "mongo"])
+def app_module(request):
+    """The server module of each backend (MongoDB only with TEST_MONGO_URL)"""
+    if request.param == "sqlite":
+        return importlib.import_module("server_sqlite")
+    
+    if not TEST_MONGO_URL:
+        pytest.skip("set TEST_MONGO_URL to run against MongoDB")
+    os.environ["MONGO_URL"] = TEST_MONGO_URL
+    os.environ["DB_NAME"] = f"videoflow_test_{int(time.time())}"
+    return importlib.import_module("server")
+
+async def completed_total(client: httpx.AsyncClient, headers: dict) -> int:
+    response = await client.get("/api/videos/timeseries", headers=headers)
+    return sum(bucket["completed"] for bucket in response.json()["buckets"])
+
+async def bulk_complete(app_module, username: str):
+    await app_module.startup()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app_module.app), base_url="http://test") as client:
+            headers = await prepare_user(client, username)
+            past = (datetime.now(timezone.utc) - timedelta(days=10)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            
+            completed_ids = []
+            for titulo in ("Concluído há dias", "Também concluído"):
+                video = (await client.post("/api/videos", json={"titulo": titulo}, headers=headers)).json()
+                await client.put(
+                    f"/api/videos/{video['id']}", json={"status": "concluido", "data_conclusao": past}, headers=headers
+                )
+                completed_ids.append(video["id"])
+            pending = (await client.post("/api/videos", json={"titulo": "Ainda planejado"}, headers=headers)).json()
+            completed_before = await completed_total(client, headers)
+            
+            # By id, then by filter over everything already completed
+            response = await client.post(
+                "/api/videos/bulk-update", json={"video_ids": [*completed_ids, pending["id"]], "status": "concluido"},
+                headers=headers
+            )
+            assert response.status_code == 200, response.text
+            response = await client.post(
+                "/api/videos/bulk-update/by-filter", params={"status_filter": "concluido"}, json={"status": "concluido"},
+                headers=headers
+            )
+            assert response.status_code == 200, response.text
+            
+            videos = {}
+            for video_id in [*completed_ids, pending["id"]]:
+                videos[video_id] = (await client.get(f"/api/videos/{video_id}", headers=headers)).json()
+            completed_after = await completed_total(client, headers)
+        
+        if app_module.__name__ == "server":
+            import database
+            await database.get_client().drop_database(database.DB_NAME)
+    finally:
+        await app_module.shutdown()
+    
+    return past, completed_ids, pending["id"], videos, completed_before, completed_after
+
+def test_bulk_complete_keeps_existing_completion_dates(app_module):
+    past, completed_ids, pending_id, videos, completed_before, completed_after = asyncio.run(
+        bulk_complete(app_module, "completion")
+    )
+    
+    for video_id in completed_ids:
+        assert videos[video_id]["data_conclusao"] == past
+    
+    # Only the video completed by the bulk update gets a date (now) and a completion
+    pending_date = datetime.fromisoformat(videos[pending_id]["data_conclusao"].replace("Z", "+00:00"))
+    assert datetime.now(timezone.utc) - pending_date < timedelta(minutes=1)
+    assert completed_after == completed_before + 1
@@ -0,0 +1,75 @@
+# Exact number of DB queries each endpoint issues (SQLite backend)
+#
+# Every endpoint is called once inside query_tracking.track_queries(), so an
+# extra round trip or an N+1 loop fails here before it ships. After an
+# intentional change, update EXPECTED_QUERIES to the new count.
+#
+# Usage (from the repository root): python -m pytest tests/test_query_counts.py
+import asyncio
+
+import httpx
+import pytest
+
+import server_sqlite
+from endpoints import call_endpoints, prepare_user
+from query_tracking import track_queries
+
+# Queries per call with the auth cache warm. The shared BEGIN/COMMIT of a
+# group-commit batch belong to no request, so writes count their SAVEPOINTs only
+EXPECTED_QUERIES = {
+    "POST /api/videos": 4,
+    "GET /api/videos": 2,
+    "GET /api/videos?search": 2,
+    "GET /api/videos?status_filter": 2,
+    "GET /api/videos?time_filter": 2,
+    "GET /api/videos?limit": 2,
+    "GET /api/videos?cursor": 2,
+    "GET /api/videos/page": 2,
+    "GET /api/videos/count": 2,
+    "GET /api/videos/stats": 1,
+    "GET /api/videos/timeseries": 4,
+    "GET /api/videos/{id}": 2,
+    "PUT /api/videos/{id}": 4,
+    "POST /api/videos/bulk-update": 4,
+    "POST /api/videos/bulk-update/by-filter?dry_run": 2,
+    "POST /api/videos/bulk-update/by-filter": 4,
+    "POST /api/videos/import": 3,
+    "GET /api/videos/export": 1,
+    "DELETE /api/videos/{id}": 5,
+    "POST /api/videos/bulk-delete/by-filter?dry_run": 2,
+    "POST /api/videos/bulk-delete/by-filter": 3,
+    "GET /api/auth/me": 0,
+}
+
+async def track_endpoints() -> dict:
+    """Call every endpoint once, in order; returns the queries each call issued"""
+    await server_sqlite.startup()
+    transport = httpx.ASGITransport(app=server_sqlite.app)
+    tracked = {}
+    
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            headers = await prepare_user(client, "queries", videos=3)
+            
+            for name, call, expected_status in await call_endpoints(client, headers):
+                with track_queries() as queries:
+                    response = await call()
+                assert response.status_code == expected_status, f"{name}: {response.text[:200]}"
+                tracked[name] = queries
+    finally:
+        await server_sqlite.shutdown()
+    
+    return tracked
+
+@pytest.fixture(scope="module")
+def endpoint_queries() -> dict:
+    # The calls depend on each other (create, then read, update, delete), so they run once
+    return asyncio.run(track_endpoints())
+
+def test_every_endpoint_is_counted(endpoint_queries):
+    assert list(endpoint_queries) == list(EXPECTED_QUERIES)
+
+@pytest.mark.parametrize("endpoint, expected", EXPECTED_QUERIES.items())
+def test_query_count(endpoint_queries, endpoint, expected):
+    queries = endpoint_queries[endpoint]
+    assert len(queries) == expected, "\n".join(queries.statements)
@@ -0,0 +1,119 @@
+# Differential test of the single-pass import parser against the parser it replaced
+#
+# Both must return the same videos for hand-picked edge cases, a generated
+# export-format corpus and randomly mangled inputs. The legacy parser is kept
+# verbatim here as the reference (benchmarks/bench_parse_video_text.py times both).
+import random
+import re
+from typing import List
+
+import pytest
+
+from corpus import generate_videos
+from video_text import format_video_block, parse_video_text
+
+# Accent and case variants of the status values the importer accepts
+STATUS_SPELLINGS = (
+    "planejado", "Em Produção", "em producao", "em-producao", "EM EDIÇÃO",
+    "em edicao", "em-edicao", "Concluído", "concluido", "arquivado", ""
+)
+
+def legacy_parse_video_text(content: str) -> List[dict]:
+    """The parser as it was before the single-pass rewrite, kept verbatim for comparison"""
+    videos = []
+    
+    # Split by video entries (assuming each video starts with [TÍTULO])
+    video_blocks = re.split(r'(?=\[TÍTULO\])', content)
+    
+    for block in video_blocks:
+        if not block.strip():
+            continue
+        
+        video_data = {}
+        
+        titulo_match = re.search(r'\[TÍTULO\]\s*(.+?)(?=\n|\[|$)', block, re.IGNORECASE)
+        if titulo_match:
+            video_data['titulo'] = titulo_match.group(1).strip()
+        else:
+            continue
+        
+        descricao_match = re.search(r'\[DESCRIÇÃO\]\s*(.+?)(?=\n\[|$)', block, re.IGNORECASE | re.DOTALL)
+        if descricao_match:
+            video_data['descricao'] = descricao_match.group(1).strip()
+        
+        roteiro_match = re.search(r'\[ROTEIRO\]\s*(.+?)(?=\n\[|$)', block, re.IGNORECASE | re.DOTALL)
+        if roteiro_match:
+            video_data['roteiro'] = roteiro_match.group(1).strip()
+        
+        url_match = re.search(r'\[URL\]\s*(.+?)(?=\n|\[|$)', block, re.IGNORECASE)
+        if url_match:
+            video_data['url'] = url_match.group(1).strip()
+        
+        status_match = re.search(r'\[STATUS\]\s*(.+?)(?=\n|\[|$)', block, re.IGNORECASE)
+        if status_match:
+            status_text = status_match.group(1).strip().lower()
+            status_map = {
+                'planejado': 'planejado',
+                'em produção': 'em-producao',
+                'em producao': 'em-producao',
+                'em-producao': 'em-producao',
+                'em edição': 'em-edicao',
+                'em edicao': 'em-edicao',
+                'em-edicao': 'em-edicao',
+                'concluído': 'concluido',
+                'concluido': 'concluido'
+            }
+            video_data['status'] = status_map.get(status_text, 'planejado')
+        else:
+            video_data['status'] = 'planejado'
+        
+        videos.append(video_data)
+    
+    return videos
+
+def build_corpus(blocks: int) -> str:
+    """Export-format text with `blocks` videos and assorted status spellings"""
+    rng = random.Random(7)
+    parts = []
+    for video in generate_videos(blocks, roteiro_paragraphs=3):
+        video["status"] = rng.choice(STATUS_SPELLINGS)
+        parts.append(format_video_block(video))
+    return "\n".join(parts)
+
+# Fragments the fuzzer stitches together: tags in odd cases, stray brackets,
+# blank values, CRLF and unicode whitespace
+FUZZ_PIECES = (
+    "[TÍTULO]", "[título]", "[Título]", "[TITULO]", "[DESCRIÇÃO]", "[descrição]", "[ROTEIRO]",
+    "[roteiro]", "[URL]", "[url]", "[STATUS]", "[status]", "[", "]", "\n", "\n\n", "\r\n",
+    " ", "\t", "\u00a0", "\u2028", "texto", "ação", "Em Edição", "concluído", "x[y]z", "https://a.b/c"
+)
+
+def fuzz_cases(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(0, 40)))
+
+EDGE_CASES = {
+    "empty": "",
+    "blank lines only": "\n\n  \n",
+    "empty fields": "[TÍTULO] Vídeo\n[DESCRIÇÃO]\n[ROTEIRO] \n[URL]\n[STATUS]\n",
+    "empty title": "[TÍTULO]\n[DESCRIÇÃO] Sem título\n[STATUS] planejado\n",
+    "crlf": "[TÍTULO] Vídeo\r\n[DESCRIÇÃO] Linha 1\r\nLinha 2\r\n[URL] https://a.b/c\r\n[STATUS] em edição\r\n",
+    "missing title": "[DESCRIÇÃO] Sem título\n[STATUS] concluido\n\n[TÍTULO] Segundo\n[STATUS] concluido\n",
+    "unknown status": "[TÍTULO] Vídeo\n[STATUS] arquivado\n",
+    "missing status": "[TÍTULO] Vídeo\n[ROTEIRO] Cena 1\n\nCena 2\n",
+    "lowercase tags": "[título] Vídeo\n[descrição] Texto\n[status] Concluído\n",
+    "multiline fields": "[TÍTULO] A\n[ROTEIRO] Cena [1]\nCena 2\n[STATUS] em producao\n[TÍTULO] B\n",
+}
+
+@pytest.mark.parametrize("content", EDGE_CASES.values(), ids=EDGE_CASES.keys())
+def test_matches_legacy_parser_on_edge_cases(content):
+    assert parse_video_text(content) == legacy_parse_video_text(content)
+
+def test_matches_legacy_parser_on_corpus():
+    corpus = build_corpus(2000)
+    assert parse_video_text(corpus) == legacy_parse_video_text(corpus)
+
+def test_matches_legacy_parser_on_fuzzed_inputs():
+    mismatches = [case for case in fuzz_cases(20_000) if parse_video_text(case) != legacy_parse_video_text(case)]
+    assert not mismatches, f"{len(mismatches)} mismatches, first: {mismatches[0]!r}"